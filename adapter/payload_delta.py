@@ -0,0 +1,145 @@
+"""
+Telemetry payload delta encoding
+
+Send a full keyframe periodically, then only changed paths.
+Each message carries a sequence number so the receiver can rebuild
+the state (see DeltaDecoder) and request a resync on gap.
+
+Message layout:
+    keyframe: {"type": "key", "seq": int, "data": payload}
+    delta: {"type": "delta", "seq": int, "base": int, "set": [[path, value], ...], "del": [path, ...]}
+    path: list of dict keys (str) or list indexes (int).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def diff_payload(prev: Any, curr: Any, path: list, changed: list, removed: list) -> None:
+    """Collect changed & removed paths between two payloads
+
+    Dicts are compared per key, lists of same length per index,
+    anything else (including tuples) is replaced as a whole if not equal.
+    """
+    if prev is curr:
+        return
+    curr_type = type(curr)
+    if curr_type is not type(prev):
+        changed.append([path, curr])
+    elif curr_type is dict:
+        shared = 0
+        for key, value in curr.items():
+            if key in prev:
+                shared += 1
+                diff_payload(prev[key], value, path + [key], changed, removed)
+            else:
+                changed.append([path + [key], value])
+        if shared < len(prev):
+            for key in prev.keys() - curr.keys():
+                removed.append(path + [key])
+    elif curr_type is list and len(prev) == len(curr):
+        for index, (old, new) in enumerate(zip(prev, curr)):
+            diff_payload(old, new, path + [index], changed, removed)
+    elif prev != curr:
+        changed.append([path, curr])
+
+
+class DeltaDecoder:
+    """Payload delta decoder, rebuild state from messages
+
+    Attributes:
+        state: rebuilt payload, None until first keyframe.
+        seq: sequence number of last applied message.
+    """
+
+    __slots__ = (
+        "state",
+        "seq",
+    )
+
+    def __init__(self) -> None:
+        self.state: Any = None
+        self.seq = -1
+
+    def apply(self, message: dict) -> bool:
+        """Apply keyframe or delta message
+
+        Returns:
+            False if message cannot be applied (sequence gap, resync required).
+        """
+        if message.get("type") == "key":
+            self.state = message["data"]
+            self.seq = message["seq"]
+            return True
+        if self.state is None or message.get("base") != self.seq:
+            return False
+        for path, value in message.get("set", ()):
+            if not path:
+                self.state = value
+                continue
+            target = self.state
+            for key in path[:-1]:
+                target = target[key]
+            target[path[-1]] = value
+        for path in message.get("del", ()):
+            target = self.state
+            for key in path[:-1]:
+                target = target[key]
+            del target[path[-1]]
+        self.seq = message["seq"]
+        return True
+
+
+class DeltaEncoder:
+    """Payload delta encoder
+
+    The encoder keeps a reference to the last sent payload,
+    payload must not be mutated after being encoded.
+
+    Attributes:
+        keyframe_interval: send keyframe every N messages.
+        seq: sequence number of last encoded message.
+        keyframes: number of keyframes encoded.
+        deltas: number of deltas encoded.
+    """
+
+    __slots__ = (
+        "keyframe_interval",
+        "seq",
+        "keyframes",
+        "deltas",
+        "_last_payload",
+        "_last_keyframe",
+        "_force_keyframe",
+    )
+
+    def __init__(self, keyframe_interval: int = 100) -> None:
+        self.keyframe_interval = max(int(keyframe_interval), 1)
+        self.seq = 0
+        self.keyframes = 0
+        self.deltas = 0
+        self._last_payload = None
+        self._last_keyframe = 0
+        self._force_keyframe = True
+
+    def request_keyframe(self) -> None:
+        """Force next message to be a keyframe (resync)"""
+        self._force_keyframe = True
+
+    def encode(self, payload: dict) -> dict:
+        """Encode payload as keyframe or delta message"""
+        self.seq += 1
+        prev = self._last_payload
+        self._last_payload = payload
+        if (self._force_keyframe or prev is None
+                or self.seq - self._last_keyframe >= self.keyframe_interval):
+            self._force_keyframe = False
+            self._last_keyframe = self.seq
+            self.keyframes += 1
+            return {"type": "key", "seq": self.seq, "data": payload}
+        changed: list = []
+        removed: list = []
+        diff_payload(prev, payload, [], changed, removed)
+        self.deltas += 1
+        return {"type": "delta", "seq": self.seq, "base": self.seq - 1, "set": changed, "del": removed}
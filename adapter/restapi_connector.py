@@ -29,7 +29,7 @@ import threading
 from itertools import chain
 from typing import Any
 
-from async_request import http_get, set_header_get
+from async_request import HttpConnectionPool, http_get, set_header_get
 from const_common import TYPE_JSON
 from adapter.rf2_restapi import HttpSetup, ResRawOutput, RestAPIData, select_taskset
 logger = logging.getLogger(__name__)
@@ -48,6 +48,7 @@ class RestAPIInfo:
         "_active_interval",
         "_event",
         "_dataset",
+        "_pool",
     )
 
     def __init__(self, parent_api):
@@ -61,12 +62,18 @@ class RestAPIInfo:
         self._event = threading.Event()
 
         self._dataset = RestAPIData()
+        self._pool = HttpConnectionPool()
 
     @property
     def telemetry(self) -> RestAPIData:
         """Rest API telemetry data"""
         return self._dataset
 
+    @property
+    def connection_stats(self) -> dict:
+        """Keep-alive connection pool statistics"""
+        return self._pool.stats()
+
     def __del__(self):
         logger.info("RestAPI: GC: RestAPIInfo")
 
@@ -165,6 +172,8 @@ class RestAPIInfo:
                 await task
             except (asyncio.CancelledError, BaseException):
                 pass
+        # Connections are bound to current event loop
+        await self._pool.close()
 
     async def task_control(self, task_group: tuple[asyncio.Task, ...]):
         """Control task running state"""
@@ -197,7 +206,7 @@ class RestAPIInfo:
         data_available = False
         total_retry = retry = http.retry
         while not self._task_cancel and retry >= 0:
-            resource_output = await get_resource(request_header, http)
+            resource_output = await get_resource(request_header, http, self._pool)
             # Verify & retry
             if not isinstance(resource_output, (dict, list)):  # Correction de type
                 # Affiche l'erreur réelle dans les logs
@@ -223,7 +232,8 @@ class RestAPIInfo:
         interval = min_interval
         last_hash = new_hash = -1
         while not self._task_cancel:  # use task control to cancel & exit loop
-            new_hash = await output_resource(self._dataset, request_header, http, output_set, last_hash)
+            new_hash = await output_resource(
+                self._dataset, request_header, http, output_set, last_hash, self._pool)
             if last_hash != new_hash:
                 last_hash = new_hash
                 interval = min_interval
@@ -244,20 +254,21 @@ def reset_to_default(dataset: RestAPIData, active_task: dict[str, tuple[ResRawOu
         active_task.clear()
 
 
-async def get_resource(request: bytes, http: HttpSetup) -> Any | str:
+async def get_resource(request: bytes, http: HttpSetup, pool: HttpConnectionPool | None = None) -> Any | str:
     """Get resource from REST API"""
     try:
-        async with http_get(request, http.host, http.port, http.timeout) as raw_bytes:
+        async with http_get(request, http.host, http.port, http.timeout, pool) as raw_bytes:
             return json_decoder.decode(raw_bytes.decode())
     except Exception as e:
         # MODIFICATION : On retourne l'erreur exacte pour le debug
         return f"ERROR: {str(e)}"
 
 async def output_resource(
-    dataset: RestAPIData, request: bytes, http: HttpSetup, output_set: tuple[ResRawOutput, ...], last_hash: int) -> int:
+    dataset: RestAPIData, request: bytes, http: HttpSetup, output_set: tuple[ResRawOutput, ...], last_hash: int,
+    pool: HttpConnectionPool | None = None) -> int:
     """Get resource from REST API and output data, skip unnecessary checking"""
     try:
-        async with http_get(request, http.host, http.port, http.timeout) as raw_bytes:
+        async with http_get(request, http.host, http.port, http.timeout, pool) as raw_bytes:
             new_hash = hash(raw_bytes)
             if last_hash != new_hash:
                 resource_output = json_decoder.decode(raw_bytes.decode())
@@ -46,6 +46,17 @@ from pyRfactor2SharedMemory.rF2MMap import (
 
 logger = logging.getLogger(__name__)
 
+# Buffer update interval (seconds), 0 = every update tick
+# Buffers are only copied on version change, interval limits how often it is checked
+UPDATE_INTERVALS = {
+    "tele": 0.0,
+    "scor": 0.2,
+    "ext": 0.0,  # direct access, no copy
+    "rules": 1.0,
+    "pit": 1.0,
+    "weather": 1.0,
+}
+
 
 def copy_struct(struct_data):
     """Allow to copy ctypes struct data with __slots__"""
@@ -57,6 +68,30 @@ def copy_struct(struct_data):
     )
 
 
+def vehicle_id_layout(struct_type: type[ctypes.Structure]) -> tuple[int, int]:
+    """mVehicles offset & slot size of scoring or telemetry struct"""
+    slot_type = dict(struct_type._fields_)["mVehicles"]._type_
+    return struct_type.mVehicles.offset, ctypes.sizeof(slot_type)
+
+
+ID_LAYOUTS = {
+    rF2data.rF2Scoring: vehicle_id_layout(rF2data.rF2Scoring),
+    rF2data.rF2Telemetry: vehicle_id_layout(rF2data.rF2Telemetry),
+}
+
+
+def vehicle_id_key(data: rF2data.rF2Scoring | rF2data.rF2Telemetry, count: int) -> bytes:
+    """Raw mID bytes of first count vehicles, changed if vehicle ID set or order changed
+
+    mID (c_int) is the first field of both scoring & telemetry vehicle slot,
+    read as strided byte columns in one pass without creating ctypes objects.
+    """
+    offset, stride = ID_LAYOUTS[type(data)]
+    with memoryview(data) as raw, raw.cast("B") as view:
+        column = view[offset:offset + stride * count]
+        return b"".join([column[byte::stride].tobytes() for byte in range(4)])
+
+
 def local_scoring_index(scor_veh: Sequence[rF2data.rF2VehicleScoring]) -> int:
     """Find local player scoring index
 
@@ -70,7 +105,10 @@ def local_scoring_index(scor_veh: Sequence[rF2data.rF2VehicleScoring]) -> int:
 
 
 class MMapDataSet:
-    """Create mmap data set"""
+    """Create mmap data set
+
+    Each buffer is updated on its own schedule (see UPDATE_INTERVALS).
+    """
 
     __slots__ = (
         "scor",
@@ -80,6 +118,9 @@ class MMapDataSet:
         "rules",   # AJOUT
         "pit",     # AJOUT
         "weather", # AJOUT
+        "_intervals",
+        "_next_update",
+        "_stats_start",
     )
 
     def __init__(self) -> None:
@@ -91,10 +132,31 @@ class MMapDataSet:
         self.rules = MMapControl(rFactor2Constants.MM_RULES_FILE_NAME, rF2data.rF2Rules)
         self.pit = MMapControl(rFactor2Constants.MM_PITINFO_FILE_NAME, rF2data.rF2PitInfo)
         self.weather = MMapControl(rFactor2Constants.MM_WEATHER_FILE_NAME, rF2data.rF2Weather)
+        self._intervals = UPDATE_INTERVALS.copy()
+        self._next_update = dict.fromkeys(self._intervals, 0.0)
+        self._stats_start = monotonic()
 
     def __del__(self):
         logger.info("sharedmemory: GC: MMapDataSet")
 
+    def set_intervals(self, intervals: dict[str, float]) -> None:
+        """Set buffer update intervals
+
+        Args:
+            intervals: buffer name (scor, tele, ext, rules, pit, weather) - interval (seconds).
+                0 = every update tick, negative = never updated (keep initial copy).
+        """
+        for name, interval in intervals.items():
+            if name not in self._intervals:
+                raise KeyError(f"unknown buffer: {name}")
+            self._intervals[name] = interval
+            self._next_update[name] = 0.0
+
+    @property
+    def intervals(self) -> dict[str, float]:
+        """Buffer update intervals"""
+        return self._intervals.copy()
+
     def create_mmap(self, access_mode: int, rf2_pid: str) -> None:
         """Create mmap instance
 
@@ -123,14 +185,34 @@ class MMapDataSet:
         self.weather.close()
 
     def update_mmap(self) -> None:
-        """Update mmap data"""
-        self.scor.update()
-        self.tele.update()
-        # Mise à jour des nouveaux buffers
-        self.rules.update()
-        self.pit.update()
-        self.weather.update()
-        self.ext.update() # Utile pour mSessionStarted
+        """Update mmap data (buffers due on schedule)"""
+        now = monotonic()
+        next_update = self._next_update
+        for name, interval in self._intervals.items():
+            # ext: utile pour mSessionStarted
+            if interval < 0 or now < next_update[name]:
+                continue
+            next_update[name] = now + interval
+            getattr(self, name).update()
+
+    def stats(self) -> dict:
+        """Read statistics of each mmap buffer, with copy rate since last reset"""
+        elapsed = max(monotonic() - self._stats_start, 1e-6)
+        output = {}
+        for name, interval in self._intervals.items():
+            stats = getattr(self, name).stats()
+            stats["interval"] = interval
+            stats["bytes_per_sec"] = round(stats["copy_bytes"] / elapsed)
+            stats["copy_time_avg_us"] = round(
+                stats["copy_time"] / stats["reads"] * 1e6, 3) if stats["reads"] else 0.0
+            output[name] = stats
+        return output
+
+    def reset_stats(self) -> None:
+        """Reset read statistics of each mmap buffer"""
+        for name in self._intervals:
+            getattr(self, name).reset_stats()
+        self._stats_start = monotonic()
 
 
 class SyncData:
@@ -141,6 +223,11 @@ class SyncData:
         "_update_thread",
         "_event",
         "_tele_indexes",
+        "_data_cond",
+        "_data_version",
+        "_sparse_tele",
+        "_sparse_slots",
+        "_tele_id_key",
         "paused",
         "override_player_index",
         "player_scor_index",
@@ -154,6 +241,11 @@ class SyncData:
         self._update_thread = None
         self._event = threading.Event()
         self._tele_indexes = {_index: _index for _index in range(128)}
+        self._data_cond = threading.Condition()
+        self._data_version = 0
+        self._sparse_tele = None
+        self._sparse_slots = None
+        self._tele_id_key = b""
 
         self.paused = False
         self.override_player_index = False
@@ -167,21 +259,34 @@ class SyncData:
 
     def __sync_player_data(self) -> bool:
         """Sync local player data"""
+        scor_data = self.dataset.scor.data
         if not self.override_player_index:
-            # Update scoring index
-            scor_idx = local_scoring_index(self.dataset.scor.data.mVehicles)
-            if scor_idx == INVALID_INDEX:
-                return False  # index not found, not synced
-            self.player_scor_index = scor_idx
+            # Rescan scoring only if cached player index is no longer valid
+            scor_idx = self.player_scor_index
+            if not (0 <= scor_idx < scor_data.mScoringInfo.mNumVehicles
+                    and scor_data.mVehicles[scor_idx].mIsPlayer):
+                scor_idx = local_scoring_index(scor_data.mVehicles)
+                if scor_idx == INVALID_INDEX:
+                    return False  # index not found, not synced
+                self.player_scor_index = scor_idx
         # Set player data
-        self.player_scor = self.dataset.scor.data.mVehicles[self.player_scor_index]
+        self.player_scor = scor_data.mVehicles[self.player_scor_index]
         self.player_tele = self.dataset.tele.data.mVehicles[self.sync_tele_index(self.player_scor_index)]
         return True  # found index, synced
 
-    @staticmethod
-    def __update_tele_indexes(tele_data: rF2data.rF2Telemetry, tele_indexes: dict) -> None:
-        """Update telemetry player index dictionary for quick reference"""
-        for tele_idx, veh_info in zip(range(tele_data.mNumVehicles), tele_data.mVehicles):
+    def __update_tele_indexes(self) -> None:
+        """Update telemetry player index dictionary for quick reference
+
+        Only rebuilt if number of vehicles or vehicle ID set changed.
+        """
+        tele_data = self.dataset.tele.data
+        count = min(max(tele_data.mNumVehicles, 0), MAX_VEHICLES)
+        id_key = vehicle_id_key(tele_data, count)
+        if id_key == self._tele_id_key:
+            return
+        self._tele_id_key = id_key
+        tele_indexes = self._tele_indexes
+        for tele_idx, veh_info in zip(range(count), tele_data.mVehicles):
             tele_indexes[veh_info.mID] = tele_idx
 
     def sync_tele_index(self, scor_idx: int) -> int:
@@ -189,6 +294,52 @@ class SyncData:
         return self._tele_indexes.get(
             self.dataset.scor.data.mVehicles[scor_idx].mID, INVALID_INDEX)
 
+    def set_sparse_telemetry(self, enabled: bool, indexes: Sequence[int] = ()) -> None:
+        """Copy only player & selected vehicles telemetry (copy access)
+
+        Args:
+            enabled: enable sparse telemetry copy, full copy if False.
+            indexes: scoring indexes of vehicles to copy in addition to player.
+        """
+        self._sparse_tele = tuple(indexes) if enabled else None
+        self._sparse_slots = None
+        if not enabled:
+            self.dataset.tele.set_sparse(None)
+
+    def __update_sparse_slots(self) -> None:
+        """Update selected telemetry slots from player & selected scoring indexes"""
+        slots = {self.sync_tele_index(self.player_scor_index)}
+        slots.update(self.sync_tele_index(index) for index in self._sparse_tele)
+        if slots != self._sparse_slots:
+            self._sparse_slots = slots
+            self.dataset.tele.set_sparse(slots)
+
+    @property
+    def data_version(self) -> int:
+        """Local data version, increased on scoring or telemetry update from game"""
+        return self._data_version
+
+    def wait_data(self, version: int, timeout: float | None = None) -> int:
+        """Wait until data version differs from version (new game data)
+
+        Args:
+            version: last seen data version.
+            timeout: max wait time (seconds), None to wait until new data or stop.
+
+        Returns:
+            Current data version, same as version if timed out or stopped.
+        """
+        with self._data_cond:
+            if self._data_version == version and self._updating:
+                self._data_cond.wait(timeout)
+            return self._data_version
+
+    def __notify_data(self) -> None:
+        """Increase data version and wake up waiting threads"""
+        with self._data_cond:
+            self._data_version += 1
+            self._data_cond.notify_all()
+
     def start(self, access_mode: int, rf2_pid: str) -> None:
         """Update & sync mmap data copy in separate thread"""
         if self._updating:
@@ -197,7 +348,8 @@ class SyncData:
             self._updating = True
             # Initialize mmap data
             self.dataset.create_mmap(access_mode, rf2_pid)
-            self.__update_tele_indexes(self.dataset.tele.data, self._tele_indexes)
+            self._tele_id_key = b""
+            self.__update_tele_indexes()
             if not self.__sync_player_data():
                 self.player_scor = self.dataset.scor.data.mVehicles[INVALID_INDEX]
                 self.player_tele = self.dataset.tele.data.mVehicles[INVALID_INDEX]
@@ -212,6 +364,8 @@ class SyncData:
         if self._updating:
             self._event.set()
             self._updating = False
+            with self._data_cond:  # wake up waiting threads
+                self._data_cond.notify_all()
             if self._update_thread and self._update_thread.is_alive():
                 self._update_thread.join(timeout=1.0)
                 # Make final copy before close
@@ -227,6 +381,7 @@ class SyncData:
         _event_wait = self._event.wait
         freezed_version = 0
         last_version_update = 0
+        last_tele_version = 0
         last_update_time = 0.0
         data_freezed = True
         reset_counter = 0
@@ -234,13 +389,15 @@ class SyncData:
 
         while not _event_wait(update_delay):
             self.dataset.update_mmap()
-            self.__update_tele_indexes(self.dataset.tele.data, self._tele_indexes)
+            self.__update_tele_indexes()
             # Update player data & index
             if not data_freezed:
                 data_synced = self.__sync_player_data()
                 if data_synced:
                     reset_counter = 0
                     self.paused = False
+                    if self._sparse_tele is not None:
+                        self.__update_sparse_slots()
                 elif reset_counter < 6:
                     reset_counter += 1
                     if reset_counter == 5:
@@ -251,9 +408,13 @@ class SyncData:
                         logger.info("sharedmemory: UPDATING: player data paused")
 
             version_update = self.dataset.scor.data.mVersionUpdateEnd
-            if last_version_update != version_update:
-                last_version_update = version_update
-                last_update_time = monotonic()
+            tele_version = self.dataset.tele.data.mVersionUpdateEnd
+            if last_version_update != version_update or last_tele_version != tele_version:
+                if last_version_update != version_update:
+                    last_version_update = version_update
+                    last_update_time = monotonic()
+                last_tele_version = tele_version
+                self.__notify_data()
 
             if data_freezed:
                 if freezed_version != last_version_update:
@@ -332,6 +493,10 @@ class RF2Info:
     def setPlayerIndex(self, index: int = INVALID_INDEX) -> None:
         self._sync.player_scor_index = min(max(index, INVALID_INDEX), MAX_VEHICLES - 1)
 
+    @property
+    def rf2Scor(self) -> rF2data.rF2Scoring:
+        return self._scor.data
+
     @property
     def rf2ScorInfo(self) -> rF2data.rF2ScoringInfo:
         return self._scor.data.mScoringInfo
@@ -371,10 +536,38 @@ class RF2Info:
         """rF2 weather data"""
         return self._weather.data
 
+    @property
+    def dataVersion(self) -> int:
+        """Local data version, increased on new scoring or telemetry data"""
+        return self._sync.data_version
+
+    def waitData(self, version: int, timeout: float | None = None) -> int:
+        """Wait for new scoring or telemetry data (see SyncData.wait_data)"""
+        return self._sync.wait_data(version, timeout)
+
+    def setSparseTelemetry(self, enabled: bool = False, indexes: Sequence[int] = ()) -> None:
+        """Copy only player (& selected scoring indexes) telemetry, see SyncData.set_sparse_telemetry"""
+        self._sync.set_sparse_telemetry(enabled, indexes)
+
+    def setUpdateIntervals(self, intervals: dict[str, float]) -> None:
+        """Set per-buffer update intervals (see MMapDataSet.set_intervals)"""
+        self._sync.dataset.set_intervals(intervals)
+
+    def mmapStats(self) -> dict:
+        """Seqlock read statistics of each mmap buffer (see MMapControl)"""
+        return self._sync.dataset.stats()
+
+    def resetMmapStats(self) -> None:
+        self._sync.dataset.reset_stats()
+
     @property
     def playerIndex(self) -> int:
         return self._sync.player_scor_index
 
+    @property
+    def playerTeleIndex(self) -> int:
+        return self._sync.sync_tele_index(self._sync.player_scor_index)
+
     def isPlayer(self, index: int) -> bool:
         if self._sync.override_player_index:
             return self._sync.player_scor_index == index
@@ -3,12 +3,22 @@ rF2 API data set - Corrected for LMU Internal Plugin Structures
 Optimized for performance and LMU specific data (Battery/Fuel %, DRS)
 """
 from __future__ import annotations
+import logging
+import threading
+from time import monotonic, perf_counter
 import requests
 from validator import bytes_to_str as tostr
 from validator import infnan_to_zero as rmnan
 from adapter import rf2_connector
+from adapter.rf2_extract import FieldExtractor
+from adapter.rf2_snapshot import SNAPSHOT_MIN_VEHICLES, VehicleSnapshot
+from adapter.rf2_text import text_cache
+from adapter.rf2_wheels import BRAKE, CARCASS, INNER, SURFACE, wheel_temperature_block, wheel_temperature_rows
+from pyRfactor2SharedMemory import rF2data
 from process.pitstop import EstimatePitTime
 
+logger = logging.getLogger(__name__)
+
 def safe_int(v):
     if isinstance(v, bytes):
         return int.from_bytes(v, "little")
@@ -20,9 +30,84 @@ class DataAdapter:
         self.shmm = shmm
         self.rest = rest
 
+# Champs télémétrie lus en une passe (payload, enregistrement)
+TELEMETRY_FIELDS = (
+    ("id", ("mID",), "int"),
+    ("lap_number", ("mLapNumber",), "int"),
+    ("gear", ("mGear",), "int"),
+    ("rpm", ("mEngineRPM",), "float"),
+    ("rpm_max", ("mEngineMaxRPM",), "float"),
+    ("temp_oil", ("mEngineOilTemp",), "float"),
+    ("temp_water", ("mEngineWaterTemp",), "float"),
+    ("fuel", ("mFuel",), "float"),
+    ("fuel_capacity", ("mFuelCapacity",), "float"),
+    ("throttle", ("mFilteredThrottle",), "float"),
+    ("brake", ("mFilteredBrake",), "float"),
+    ("clutch", ("mFilteredClutch",), "float"),
+    ("steering", ("mFilteredSteering",), "float"),
+    ("vel_x", ("mLocalVel", "x"), "raw"),
+    ("vel_y", ("mLocalVel", "y"), "raw"),
+    ("vel_z", ("mLocalVel", "z"), "raw"),
+    ("tire_temp_fl", ("mWheels", 0, "mTemperature"), "celsius"),
+    ("tire_temp_fr", ("mWheels", 1, "mTemperature"), "celsius"),
+    ("tire_temp_rl", ("mWheels", 2, "mTemperature"), "celsius"),
+    ("tire_temp_rr", ("mWheels", 3, "mTemperature"), "celsius"),
+    ("tire_pressure", ("mWheels", "*", "mPressure"), "float"),
+    ("tire_wear", ("mWheels", "*", "mWear"), "float"),
+    ("surface_type", ("mWheels", "*", "mSurfaceType"), "int"),
+    ("brake_temp", ("mWheels", "*", "mBrakeTemp"), "celsius"),
+    ("compound_front", ("mFrontTireCompoundName",), "str"),
+    ("compound_rear", ("mRearTireCompoundName",), "str"),
+    ("motor_torque", ("mElectricBoostMotorTorque",), "float"),
+    ("motor_rpm", ("mElectricBoostMotorRPM",), "float"),
+    ("motor_temp", ("mElectricBoostMotorTemperature",), "float"),
+    ("motor_water_temp", ("mElectricBoostWaterTemperature",), "float"),
+    ("motor_state", ("mElectricBoostMotorState",), "int"),
+)
+TELEMETRY_EXTRACTOR = FieldExtractor(rF2data.rF2VehicleTelemetry, TELEMETRY_FIELDS)
+# Champs des échantillons d'analyse (TelemetryRecorder)
+LAP_SAMPLE_FIELDS = (
+    ("gear", ("mGear",), "int"),
+    ("rpm", ("mEngineRPM",), "float"),
+    ("fuel", ("mFuel",), "float"),
+    ("throttle", ("mFilteredThrottle",), "float"),
+    ("brake", ("mFilteredBrake",), "float"),
+    ("steering", ("mFilteredSteering",), "float"),
+    ("unfiltered_throttle", ("mUnfilteredThrottle",), "float"),
+    ("unfiltered_brake", ("mUnfilteredBrake",), "float"),
+    ("unfiltered_clutch", ("mUnfilteredClutch",), "float"),
+    ("drag", ("mDrag",), "float"),
+    ("downforce_front", ("mFrontDownforce",), "float"),
+    ("downforce_rear", ("mRearDownforce",), "float"),
+    ("vel_x", ("mLocalVel", "x"), "raw"),
+    ("vel_y", ("mLocalVel", "y"), "raw"),
+    ("vel_z", ("mLocalVel", "z"), "raw"),
+    ("tire_wear", ("mWheels", "*", "mWear"), "float"),
+    ("suspension_deflection", ("mWheels", "*", "mSuspensionDeflection"), "float"),
+    ("ride_height", ("mWheels", "*", "mRideHeight"), "float"),
+    ("suspension_force", ("mWheels", "*", "mSuspForce"), "float"),
+    ("brake_temp", ("mWheels", "*", "mBrakeTemp"), "celsius"),
+    ("brake_pressure", ("mWheels", "*", "mBrakePressure"), "float"),
+    ("lateral_force", ("mWheels", "*", "mLateralForce"), "float"),
+    ("longitudinal_force", ("mWheels", "*", "mLongitudinalForce"), "float"),
+    ("tire_load", ("mWheels", "*", "mTireLoad"), "float"),
+    ("tire_carcass_temp", ("mWheels", "*", "mTireCarcassTemperature"), "celsius"),
+    ("tire_inner_layer_temp", ("mWheels", "*", "mTireInnerLayerTemperature"), "celsius"),  # 3 par roue
+)
+LAP_SAMPLE_EXTRACTOR = FieldExtractor(rF2data.rF2VehicleTelemetry, LAP_SAMPLE_FIELDS)
+
+
 class TelemetryData(DataAdapter):
     __slots__ = ()
 
+    def fields(self, index: int | None = None) -> dict:
+        """Tous les champs TELEMETRY_FIELDS en une lecture (enregistrement plat)"""
+        return TELEMETRY_EXTRACTOR.extract(self.shmm.rf2TeleVeh(index))
+
+    def lap_sample_fields(self, index: int | None = None) -> dict:
+        """Champs LAP_SAMPLE_FIELDS en une lecture"""
+        return LAP_SAMPLE_EXTRACTOR.extract(self.shmm.rf2TeleVeh(index))
+
     # --- ACCÈS RAPIDES (Lecture directe) ---
     def id(self, index: int | None = None) -> int: return self.shmm.rf2TeleVeh(index).mID
     def time_elapsed(self, index: int | None = None) -> float: return rmnan(self.shmm.rf2TeleVeh(index).mElapsedTime)
@@ -96,19 +181,17 @@ class TelemetryData(DataAdapter):
         }
 
     # --- HYBRIDE / ÉLECTRIQUE (Optimisé) ---
-    def electric_data(self, index: int | None = None) -> dict:
-        veh = self.shmm.rf2TeleVeh(index)
-        scor_veh = self.shmm.rf2ScorVeh(index)
-
+    def battery_charge(self, index: int | None = None) -> float:
         # La charge batterie précise (0-100%) se trouve dans mFuelFraction pour les Hypercars
-        charge_val = 0.0
+        scor_veh = self.shmm.rf2ScorVeh(index)
         if hasattr(scor_veh, 'mFuelFraction'):
-            charge_val = rmnan(scor_veh.mFuelFraction) / 255.0
-        else:
-            charge_val = rmnan(veh.mBatteryChargeFraction)
+            return rmnan(scor_veh.mFuelFraction) / 255.0
+        return rmnan(self.shmm.rf2TeleVeh(index).mBatteryChargeFraction)
 
+    def electric_data(self, index: int | None = None) -> dict:
+        veh = self.shmm.rf2TeleVeh(index)
         return {
-            "charge": charge_val,
+            "charge": self.battery_charge(index),
             "torque": rmnan(veh.mElectricBoostMotorTorque),
             "rpm": rmnan(veh.mElectricBoostMotorRPM),
             "temp_motor": rmnan(veh.mElectricBoostMotorTemperature),
@@ -154,18 +237,16 @@ class TelemetryData(DataAdapter):
     def tire_load(self, index: int | None = None) -> list[float]:
         return [rmnan(w.mTireLoad) for w in self.shmm.rf2TeleVeh(index).mWheels]
 
+    def wheel_temperature(self, index: int | None = None):
+        """Bloc 4x8 des températures roues en °C (voir rf2_wheels), tableau NumPy si disponible"""
+        return wheel_temperature_block(self.shmm.rf2TeleVeh(index).mWheels)
+
     def tire_carcass_temp(self, index: int | None = None) -> list[float]:
-        return [rmnan(w.mTireCarcassTemperature) - 273.15 for w in self.shmm.rf2TeleVeh(index).mWheels]
+        return [row[CARCASS] for row in wheel_temperature_rows(self.shmm.rf2TeleVeh(index).mWheels)]
 
     def tire_inner_layer_temp(self, index: int | None = None) -> list[float]:
         # Moyenne des 3 couches internes
-        wheels = self.shmm.rf2TeleVeh(index).mWheels
-        res = []
-        for w in wheels:
-            temps = [rmnan(t) for t in w.mTireInnerLayerTemperature]
-            avg = sum(temps) / 3.0 if temps else 0.0
-            res.append(avg - 273.15)
-        return res
+        return [sum(row[INNER]) / 3.0 for row in wheel_temperature_rows(self.shmm.rf2TeleVeh(index).mWheels)]
 
     def wheel_details(self, index: int | None = None) -> dict:
         # OPTIMISATION MAJEURE : Lecture unique du tableau mWheels
@@ -186,27 +267,16 @@ class TelemetryData(DataAdapter):
 
     def tire_temp_details(self, index: int | None = None) -> dict:
         """Détail complet des températures (Surface I/M/O + Interne I/M/O + Carcasse)"""
-        wheels = self.shmm.rf2TeleVeh(index).mWheels
-        data = {}
-        pos_map = {0: "fl", 1: "fr", 2: "rl", 3: "rr"}
-        for i, pos in pos_map.items():
-            w = wheels[i]
-            data[pos] = {
-                "surface": [rmnan(t) - 273.15 for t in w.mTemperature],
-                "inner":   [rmnan(t) - 273.15 for t in w.mTireInnerLayerTemperature],
-                "carcass": rmnan(w.mTireCarcassTemperature) - 273.15
-            }
-        return data
+        rows = wheel_temperature_rows(self.shmm.rf2TeleVeh(index).mWheels)
+        return {
+            pos: {"surface": row[SURFACE], "inner": row[INNER], "carcass": row[CARCASS]}
+            for pos, row in zip(("fl", "fr", "rl", "rr"), rows)
+        }
 
     def tire_temps(self, index: int | None = None) -> dict:
         # Optimisation : lecture unique
-        wheels = self.shmm.rf2TeleVeh(index).mWheels
-        return {
-            "fl": [rmnan(t) - 273.15 for t in wheels[0].mTemperature],
-            "fr": [rmnan(t) - 273.15 for t in wheels[1].mTemperature],
-            "rl": [rmnan(t) - 273.15 for t in wheels[2].mTemperature],
-            "rr": [rmnan(t) - 273.15 for t in wheels[3].mTemperature]
-        }
+        fl, fr, rl, rr = wheel_temperature_rows(self.shmm.rf2TeleVeh(index).mWheels)
+        return {"fl": fl[SURFACE], "fr": fr[SURFACE], "rl": rl[SURFACE], "rr": rr[SURFACE]}
 
     def local_velocity(self, index: int | None = None) -> tuple[float, float, float]:
         vel = self.shmm.rf2TeleVeh(index).mLocalVel
@@ -218,13 +288,14 @@ class TelemetryData(DataAdapter):
     def tire_compound_name(self, index: int | None = None) -> dict:
         try:
             veh = self.shmm.rf2TeleVeh(index)
-            front = tostr(veh.mFrontTireCompoundName)
-            rear = tostr(veh.mRearTireCompoundName)
+            front = text_cache[veh.mFrontTireCompoundName]
+            rear = text_cache[veh.mRearTireCompoundName]
+            text_cache.count(2)
             return {"fl": front, "fr": front, "rl": rear, "rr": rear}
         except:
             return {"fl": "---", "fr": "---", "rl": "---", "rr": "---"}
 
-    def brake_temp(self, index: int | None = None) -> list[float]: return [rmnan(w.mBrakeTemp) - 273.15 for w in self.shmm.rf2TeleVeh(index).mWheels]
+    def brake_temp(self, index: int | None = None) -> list[float]: return [row[BRAKE] for row in wheel_temperature_rows(self.shmm.rf2TeleVeh(index).mWheels)]
 
     def brake_wear(self, index: int | None = None) -> tuple[float, float, float, float]:
         if self.rest: return getattr(self.rest.telemetry, 'brakeWear', (0.0, 0.0, 0.0, 0.0))
@@ -238,7 +309,11 @@ class TelemetryData(DataAdapter):
 
 
 class ScoringData(DataAdapter):
-    __slots__ = ()
+    __slots__ = ("_snapshot",)
+    def __init__(self, shmm: rf2_connector.RF2Info, rest=None) -> None:
+        super().__init__(shmm, rest)
+        self._snapshot = VehicleSnapshot()
+
     def flag_state(self) -> dict:
         info = self.shmm.rf2ScorInfo
         return {
@@ -248,8 +323,9 @@ class ScoringData(DataAdapter):
             "start_light": safe_int(info.mStartLight),
             "red_lights_num": safe_int(info.mNumRedLights)
         }
-    def track_name(self) -> str: return tostr(self.shmm.rf2ScorInfo.mTrackName)
+    def track_name(self) -> str: text_cache.count(1); return text_cache[self.shmm.rf2ScorInfo.mTrackName]
     def track_length(self) -> float: return rmnan(self.shmm.rf2ScorInfo.mLapDist)
+    def lap_distance(self, index: int | None = None) -> float: return rmnan(self.shmm.rf2ScorVeh(index).mLapDist)
     def session_type(self) -> int: return safe_int(self.shmm.rf2ScorInfo.mSession)
     def time_info(self) -> dict:
         info = self.shmm.rf2ScorInfo
@@ -266,14 +342,25 @@ class ScoringData(DataAdapter):
             "wind_speed": rmnan((info.mWind.x**2 + info.mWind.y**2 + info.mWind.z**2)**0.5)
         }
     def vehicle_count(self) -> int: return self.shmm.rf2ScorInfo.mNumVehicles
+    def vehicles_snapshot(self) -> VehicleSnapshot:
+        """Bulk read all vehicles into reusable column snapshot (see to_dicts)"""
+        return self._snapshot.update(self.shmm.rf2Scor)
+    def vehicles_scoring(self) -> list[dict]:
+        """All vehicles scoring (get_vehicle_scoring layout), snapshot for large grids only"""
+        count = self.vehicle_count()
+        if count >= SNAPSHOT_MIN_VEHICLES:
+            return self.vehicles_snapshot().to_dicts()
+        return [self.get_vehicle_scoring(index) for index in range(max(count, 0))]
     def get_vehicle_scoring(self, index: int) -> dict:
         veh = self.shmm.rf2ScorVeh(index)
         sector_map = {0: 3, 1: 1, 2: 2}
+        names = text_cache
+        names.count(4)
         return {
             "id": veh.mID,
-            "driver": tostr(veh.mDriverName),
-            "vehicle": tostr(veh.mVehicleName),
-            "class": tostr(veh.mVehicleClass),
+            "driver": names[veh.mDriverName],
+            "vehicle": names[veh.mVehicleName],
+            "class": names[veh.mVehicleClass],
             "position": safe_int(veh.mPlace),
             "is_player": safe_int(veh.mIsPlayer),
             "laps": veh.mTotalLaps,
@@ -281,7 +368,7 @@ class ScoringData(DataAdapter):
             "status": safe_int(veh.mFinishStatus),
             "pit_state": safe_int(veh.mPitState),
             "in_pits": safe_int(veh.mInPits),
-            "pit_group": tostr(veh.mPitGroup),
+            "pit_group": names[veh.mPitGroup],
             "pit_stops": safe_int(veh.mNumPitstops),
             "penalties": safe_int(veh.mNumPenalties),
             "lap_dist": rmnan(veh.mLapDist),
@@ -305,11 +392,11 @@ class RulesData(DataAdapter):
     def yellow_flag(self) -> dict:
         rules = self.shmm.Rf2Rules.mTrackRules
         return {"detected": safe_int(rules.mYellowFlagDetected), "state": safe_int(rules.mYellowFlagState), "laps": safe_int(rules.mYellowFlagLaps)}
-    def message(self) -> str: return tostr(self.shmm.Rf2Rules.mTrackRules.mMessage)
+    def message(self) -> str: text_cache.count(1); return text_cache[self.shmm.Rf2Rules.mTrackRules.mMessage]
     def participant_status(self, index: int) -> dict:
         if index >= 128: return {}
         part = self.shmm.Rf2Rules.mParticipants[index]
-        return {"id": part.mID, "frozen_order": safe_int(part.mFrozenOrder), "yellow_severity": rmnan(part.mYellowSeverity), "relative_laps": rmnan(part.mRelativeLaps), "pits_open": safe_int(part.mPitsOpen), "message": tostr(part.mMessage)}
+        return {"id": part.mID, "frozen_order": safe_int(part.mFrozenOrder), "yellow_severity": rmnan(part.mYellowSeverity), "relative_laps": rmnan(part.mRelativeLaps), "pits_open": safe_int(part.mPitsOpen), "message": text_cache[part.mMessage]}
 
 class ExtendedData(DataAdapter):
     __slots__ = ()
@@ -356,19 +443,129 @@ class WeatherData(DataAdapter):
         }
 
 class PitStrategyData:
-    __slots__ = ("_pit_estimator", "_port")
-    def __init__(self, port=5397):
+    """Pit strategy estimate, refreshed in background thread
+
+    The bridge loop only reads the last good estimate (see pit_estimate),
+    the REST request to RepairAndRefuel is done by the updater thread.
+    """
+
+    __slots__ = (
+        "_pit_estimator",
+        "_port",
+        "_interval",
+        "_timeout",
+        "_updating",
+        "_update_thread",
+        "_event",
+        "_estimate",
+        "_timestamp",
+        "hits",
+        "misses",
+        "fetch_count",
+        "fetch_errors",
+        "latency_last",
+        "latency_max",
+        "latency_total",
+    )
+
+    def __init__(self, port=5397, interval: float = 0.2, timeout: float = 0.5):
         self._pit_estimator = EstimatePitTime()
         self._port = port
-    def pit_estimate(self) -> dict:
+        self._interval = interval
+        self._timeout = timeout
+        self._updating = False
+        self._update_thread = None
+        self._event = threading.Event()
+        self._estimate: dict = {}
+        self._timestamp = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.fetch_count = 0
+        self.fetch_errors = 0
+        self.latency_last = 0.0
+        self.latency_max = 0.0
+        self.latency_total = 0.0
+
+    def start(self) -> None:
+        """Start update thread"""
+        if not self._updating:
+            self._updating = True
+            self._event.clear()
+            self._update_thread = threading.Thread(target=self.__update, daemon=True)
+            self._update_thread.start()
+            logger.info("PitStrategy: UPDATING: thread started")
+
+    def stop(self) -> None:
+        """Stop update thread"""
+        if self._updating:
+            self._event.set()
+            self._updating = False
+            if self._update_thread and self._update_thread.is_alive():
+                self._update_thread.join(timeout=1.0)
+            logger.info("PitStrategy: UPDATING: thread stopped")
+
+    def __update(self) -> None:
+        """Update pit estimate"""
+        _event_wait = self._event.wait
+        while not _event_wait(self._interval):
+            self.refresh()
+
+    def refresh(self) -> bool:
+        """Fetch pit estimate once, keep last good value on failure"""
+        start = perf_counter()
         try:
             url = f"http://localhost:{self._port}/rest/garage/UIScreen/RepairAndRefuel"
-            resp = requests.get(url, timeout=0.1)
-            if resp.status_code == 200:
-                est = self._pit_estimator(resp.json())
-                return {"time_min": est[0], "time_max": est[1], "fuel_to_add": est[2], "laps_to_add": est[3]}
-        except: pass
-        return {}
+            resp = requests.get(url, timeout=self._timeout)
+            if resp.status_code != 200:
+                raise ValueError(resp.status_code)
+            est = self._pit_estimator(resp.json())
+            self._estimate = {"time_min": est[0], "time_max": est[1], "fuel_to_add": est[2], "laps_to_add": est[3]}
+            self._timestamp = monotonic()
+            return True
+        except Exception:
+            self.fetch_errors += 1
+            return False
+        finally:
+            latency = perf_counter() - start
+            self.fetch_count += 1
+            self.latency_last = latency
+            self.latency_total += latency
+            if latency > self.latency_max:
+                self.latency_max = latency
+
+    @property
+    def timestamp(self) -> float:
+        """Monotonic time of last good estimate, 0 if none"""
+        return self._timestamp
+
+    @property
+    def staleness(self) -> float:
+        """Seconds since last good estimate, inf if none"""
+        if not self._timestamp:
+            return float("inf")
+        return monotonic() - self._timestamp
+
+    def pit_estimate(self) -> dict:
+        """Last good pit estimate (cached, non-blocking)"""
+        estimate = self._estimate
+        if estimate:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return estimate
+
+    def stats(self) -> dict:
+        """Cache & fetch statistics"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "staleness": self.staleness,
+            "fetch_count": self.fetch_count,
+            "fetch_errors": self.fetch_errors,
+            "latency_last": self.latency_last,
+            "latency_max": self.latency_max,
+            "latency_avg": self.latency_total / self.fetch_count if self.fetch_count else 0.0,
+        }
 
 class Vehicle(DataAdapter):
     __slots__ = ()
@@ -378,11 +575,11 @@ class Vehicle(DataAdapter):
         return speed_ms * 3.6
     def aero_damage(self, index: int | None = None) -> float: return 0.0
     def get_local_driver_status(self) -> dict:
-        player_idx = 0; found = False
-        for i in range(self.shmm.rf2ScorInfo.mNumVehicles):
-            if self.shmm.rf2ScorVeh(i).mIsPlayer:
-                player_idx = i; found = True; break
-        if not found: return {"is_driving": False, "driver_name": "Unknown"}
+        # Player index cached by SyncData, rescan only if no longer valid
+        player_idx = self.shmm.playerIndex; num_vehicles = self.shmm.rf2ScorInfo.mNumVehicles
+        if not (0 <= player_idx < num_vehicles and self.shmm.rf2ScorVeh(player_idx).mIsPlayer):
+            player_idx = next((i for i in range(num_vehicles) if self.shmm.rf2ScorVeh(i).mIsPlayer), -1)
+            if player_idx < 0: return {"is_driving": False, "driver_name": "Unknown"}
         scor_veh = self.shmm.rf2ScorVeh(player_idx)
         is_driving = (safe_int(scor_veh.mIsPlayer) == 1 and safe_int(scor_veh.mControl) == 0 and safe_int(self.shmm.rf2ScorInfo.mInRealtime) == 1)
-        return {"is_driving": is_driving, "driver_name": tostr(scor_veh.mDriverName), "vehicle_index": player_idx}
\ No newline at end of file
+        return {"is_driving": is_driving, "driver_name": text_cache[scor_veh.mDriverName], "vehicle_index": player_idx}
\ No newline at end of file
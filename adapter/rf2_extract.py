@@ -0,0 +1,184 @@
+"""
+Compiled field extractor
+
+Declarative field spec compiled once into a single struct.Struct format
+at precomputed offsets, so all fields of a ctypes struct (ex. player
+rF2VehicleTelemetry) are read with one unpack_from call, then converted
+in one pass into a flat record.
+
+Field spec: (key, path, kind)
+    key: output key.
+    path: field path from struct, field names or array indexes,
+        "*" for all elements of array (values are flattened into one list).
+        Leaf array fields (ex. mTemperature) output a list.
+    kind: value conversion, see KINDS.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import struct
+from math import isfinite
+from operator import itemgetter
+from typing import Any
+
+from adapter.rf2_text import text_cache
+
+# Value conversion
+KINDS = (
+    "raw",      # as read
+    "float",    # inf/nan to zero
+    "celsius",  # kelvin to celsius, inf/nan as zero kelvin
+    "int",
+    "bool",
+    "str",      # char array to string
+)
+KIND_RAW, KIND_FLOAT, KIND_CELSIUS, KIND_INT, KIND_BOOL, KIND_STR = range(len(KINDS))
+
+# ctypes simple type code to struct format (standard size)
+CTYPES_FORMAT = {
+    "b": "b", "B": "B", "h": "h", "H": "H", "i": "i", "I": "I",
+    "q": "q", "Q": "Q", "f": "f", "d": "d", "?": "?", "c": "c",
+}
+
+
+def _format_code(ctype) -> str:
+    """Struct format code of ctypes simple type"""
+    code = ctype._type_
+    if code in ("l", "L"):  # platform dependent size
+        return ("i" if code == "l" else "I") if ctypes.sizeof(ctype) == 4 else ("q" if code == "l" else "Q")
+    return CTYPES_FORMAT[code]
+
+
+def _resolve(struct_type: type, path: tuple) -> list[tuple[int, type]]:
+    """Resolve field path to list of (offset, leaf ctypes type)"""
+    leaves = [(0, struct_type)]
+    for name in path:
+        resolved = []
+        for offset, ctype in leaves:
+            if isinstance(name, str) and name != "*":
+                field = getattr(ctype, name)
+                resolved.append((offset + field.offset, dict(ctype._fields_)[name]))
+                continue
+            item_type = ctype._type_
+            item_size = ctypes.sizeof(item_type)
+            indexes = range(ctype._length_) if name == "*" else (name,)
+            for index in indexes:
+                if not 0 <= index < ctype._length_:
+                    raise IndexError(f"array index out of range: {path}")
+                resolved.append((offset + index * item_size, item_type))
+        leaves = resolved
+    return leaves
+
+
+class FieldExtractor:
+    """Compiled field extractor for ctypes struct
+
+    Attributes:
+        keys: output keys in spec order.
+        size: struct size required for reading.
+    """
+
+    __slots__ = (
+        "keys",
+        "size",
+        "_packer",
+        "_converts",
+        "_scalar_keys",
+        "_scalar_getter",
+        "_list_fields",
+    )
+
+    def __init__(self, struct_type: type[ctypes.Structure], spec: tuple) -> None:
+        # Collect leaf values: (offset, format, output field index)
+        values = []
+        fields = []
+        for field_index, (key, path, kind) in enumerate(spec):
+            kind_id = KINDS.index(kind)
+            leaves = _resolve(struct_type, tuple(path))
+            is_list = len(leaves) > 1
+            for offset, ctype in leaves:
+                if issubclass(ctype, ctypes.Array) and ctype._type_ is not ctypes.c_char:
+                    code = _format_code(ctype._type_)
+                    item_size = ctypes.sizeof(ctype._type_)
+                    for index in range(ctype._length_):
+                        values.append((offset + index * item_size, code, field_index))
+                    is_list = True
+                elif issubclass(ctype, ctypes.Array):
+                    values.append((offset, f"{ctype._length_}s", field_index))
+                else:
+                    values.append((offset, _format_code(ctype), field_index))
+            fields.append((key, kind_id, is_list or "*" in path))
+        # Build format in offset order, gaps as pad bytes
+        values.sort(key=lambda value: value[0])
+        fmt = ["<"]
+        end = 0
+        positions: list[list[int]] = [[] for _ in spec]
+        for position, (offset, code, field_index) in enumerate(values):
+            if offset < end:
+                raise ValueError(f"overlapping field at offset {offset}")
+            if offset > end:
+                fmt.append(f"{offset - end}x")
+            fmt.append(code)
+            end = offset + struct.calcsize("<" + code)
+            positions[field_index].append(position)
+        self._packer = struct.Struct("".join(fmt))
+        self.keys = tuple(key for key, _, _ in fields)
+        self.size = ctypes.sizeof(struct_type)
+        # Conversion positions grouped by kind, applied over all values in one pass per kind
+        converts = []
+        for kind_id in (KIND_FLOAT, KIND_CELSIUS, KIND_INT, KIND_BOOL, KIND_STR):
+            kind_positions = tuple(
+                position
+                for field_index, (_, field_kind, _) in enumerate(fields) if field_kind == kind_id
+                for position in positions[field_index]
+                # Integer formats are already unpacked as int
+                if kind_id != KIND_INT or values[position][1] in ("c", "f", "d", "?")
+            )
+            if kind_positions:
+                # Getter (first position repeated to always get tuple) for finite check fast path
+                converts.append((kind_id, kind_positions, itemgetter(*kind_positions, kind_positions[0])))
+        self._converts = tuple(converts)
+        # Scalar fields picked with one getter, list fields with one getter each
+        scalars = [(key, positions[index][0]) for index, (key, _, is_list) in enumerate(fields) if not is_list]
+        self._scalar_keys = tuple(key for key, _ in scalars)
+        self._scalar_getter = itemgetter(*(position for _, position in scalars)) if scalars else None
+        if len(scalars) == 1:  # itemgetter returns single value instead of tuple
+            self._scalar_getter = lambda values, _get=self._scalar_getter: (_get(values),)
+        self._list_fields = tuple(
+            (key, itemgetter(*positions[index]) if len(positions[index]) > 1 else
+             lambda values, _pos=positions[index][0]: (values[_pos],))
+            for index, (key, _, is_list) in enumerate(fields) if is_list
+        )
+
+    def extract(self, data: Any) -> dict:
+        """Extract fields from ctypes struct instance (or any buffer)"""
+        values = list(self._packer.unpack_from(data))
+        for kind_id, positions, getter in self._converts:
+            if kind_id == KIND_FLOAT:
+                if isfinite(sum(getter(values))):  # fast path, all values finite
+                    continue
+                for position in positions:
+                    if not isfinite(values[position]):
+                        values[position] = 0
+            elif kind_id == KIND_CELSIUS:
+                for position in positions:
+                    value = values[position]
+                    values[position] = (value if isfinite(value) else 0) - 273.15
+            elif kind_id == KIND_INT:
+                for position in positions:
+                    value = values[position]
+                    values[position] = int.from_bytes(value, "little") if isinstance(value, bytes) else int(value)
+            elif kind_id == KIND_BOOL:
+                for position in positions:
+                    values[position] = bool(values[position])
+            else:
+                # Same raw bytes key as ctypes char array reads (see rf2_text)
+                names = text_cache
+                names.count(len(positions))
+                for position in positions:
+                    values[position] = names[values[position].partition(b"\0")[0]]
+        record = dict(zip(self._scalar_keys, self._scalar_getter(values))) if self._scalar_getter else {}
+        for key, getter in self._list_fields:
+            record[key] = list(getter(values))
+        return record
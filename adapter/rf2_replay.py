@@ -0,0 +1,507 @@
+"""
+rF2 shared memory replay
+
+Record versioned raw snapshots of rF2 mmap buffers into a compressed,
+seekable file, and play them back into shared memory (/dev/shm on Linux),
+so the bridge can be profiled without the game running.
+
+File layout (little endian):
+    header: magic (4s), version (H), number of buffers (H),
+        per buffer: name length (H) + mmap name, struct size (I)
+    frames: timestamp (d), buffer id (B), flags (B), compressed size (I), zlib data
+        keyframe (FLAG_KEY) holds raw buffer, otherwise XOR with previous frame of same buffer
+    index: count (I) + per keyframe group: timestamp (d), file offset (Q)
+    footer: index offset (Q), magic (4s)
+
+All buffers are written as keyframes at the same time (keyframe group),
+seeking restarts decoding from the nearest keyframe group.
+Buffers are read as seqlock (see read_consistent), a keyframe group is only
+written when every buffer read is consistent, otherwise moved to next capture.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import logging
+import os
+import struct
+import threading
+import zlib
+from bisect import bisect_right
+from time import monotonic, sleep
+from typing import BinaryIO, NamedTuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if __name__ == "__main__":  # local import check
+    import sys
+    sys.path.append(".")
+
+from pyRfactor2SharedMemory import rF2data
+from pyRfactor2SharedMemory.rF2MMap import MAX_READ_RETRY, platform_mmap, rFactor2Constants
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LMUR"
+FILE_VERSION = 1
+FLAG_KEY = 1
+
+FILE_HEADER = struct.Struct("<4sHH")
+NAME_LENGTH = struct.Struct("<H")
+STRUCT_SIZE = struct.Struct("<I")
+FRAME_HEADER = struct.Struct("<dBBI")
+INDEX_COUNT = struct.Struct("<I")
+INDEX_ENTRY = struct.Struct("<dQ")
+FOOTER = struct.Struct("<Q4s")
+VERSION_BLOCK = struct.Struct("<II")  # mVersionUpdateBegin, mVersionUpdateEnd
+
+
+class ReplayBuffer(NamedTuple):
+    """Replay buffer setting"""
+
+    name: str
+    data_struct: type[ctypes.Structure]
+
+
+# Buffers with version block, in recording order
+REPLAY_BUFFERS = (
+    ReplayBuffer(rFactor2Constants.MM_SCORING_FILE_NAME, rF2data.rF2Scoring),
+    ReplayBuffer(rFactor2Constants.MM_TELEMETRY_FILE_NAME, rF2data.rF2Telemetry),
+    ReplayBuffer(rFactor2Constants.MM_RULES_FILE_NAME, rF2data.rF2Rules),
+    ReplayBuffer(rFactor2Constants.MM_PITINFO_FILE_NAME, rF2data.rF2PitInfo),
+    ReplayBuffer(rFactor2Constants.MM_WEATHER_FILE_NAME, rF2data.rF2Weather),
+    ReplayBuffer(rFactor2Constants.MM_EXTENDED_FILE_NAME, rF2data.rF2Extended),
+)
+
+
+def write_frame(mmap_buffer, data: bytes) -> None:
+    """Write frame to mmap in game order
+
+    mVersionUpdateBegin first, then data, then mVersionUpdateEnd,
+    so readers see a write in progress the same way as from the game.
+    """
+    mmap_buffer[:4] = data[:4]  # mVersionUpdateBegin
+    mmap_buffer[8:] = data[8:]
+    mmap_buffer[4:8] = data[4:8]  # mVersionUpdateEnd
+
+
+def read_consistent(mmap_buffer) -> bytes | None:
+    """Seqlock read: copy buffer, None if a write was in progress or started during copy
+
+    Copy is consistent if its mVersionUpdateBegin equals mVersionUpdateEnd
+    and mVersionUpdateBegin in mmap has not changed after copy.
+    """
+    for _ in range(MAX_READ_RETRY):
+        data = mmap_buffer[:]
+        version_begin, version_end = VERSION_BLOCK.unpack_from(data, 0)
+        if version_begin == version_end and VERSION_BLOCK.unpack_from(mmap_buffer, 0)[0] == version_end:
+            return data
+    return None
+
+
+def xor_bytes(data: bytes, base: bytes) -> bytes:
+    """XOR two byte strings of same size"""
+    if np is not None:
+        return np.bitwise_xor(np.frombuffer(data, np.uint8), np.frombuffer(base, np.uint8)).tobytes()
+    size = len(data)
+    return (int.from_bytes(data, "little") ^ int.from_bytes(base, "little")).to_bytes(size, "little")
+
+
+class ReplayRecorder:
+    """Record rF2 mmap buffers to replay file
+
+    Only consistent (see read_consistent) and changed (new mVersionUpdateEnd)
+    snapshots are recorded.
+
+    Attributes:
+        frames: number of recorded frames.
+        skipped: number of snapshots skipped (duplicate or mid-write).
+        raw_bytes: total uncompressed bytes of recorded snapshots.
+    """
+
+    __slots__ = (
+        "_filename",
+        "_buffers",
+        "_interval",
+        "_keyframe_interval",
+        "_compress_level",
+        "_file",
+        "_mmaps",
+        "_last_data",
+        "_last_version",
+        "_index",
+        "_start_time",
+        "_last_keyframe",
+        "_updating",
+        "_update_thread",
+        "_event",
+        "frames",
+        "skipped",
+        "raw_bytes",
+    )
+
+    def __init__(
+        self, filename: str, buffers: tuple[ReplayBuffer, ...] = REPLAY_BUFFERS,
+        interval: float = 0.01, keyframe_interval: float = 5.0, compress_level: int = 1,
+    ) -> None:
+        """
+        Args:
+            filename: replay file name.
+            buffers: buffers to record.
+            interval: capture interval (seconds).
+            keyframe_interval: keyframe group interval (seconds), sets seek granularity.
+            compress_level: zlib compression level.
+        """
+        self._filename = filename
+        self._buffers = buffers
+        self._interval = interval
+        self._keyframe_interval = keyframe_interval
+        self._compress_level = compress_level
+        self._file: BinaryIO | None = None
+        self._mmaps: list = []
+        self._last_data: list[bytes | None] = []
+        self._last_version: list[int] = []
+        self._index: list[tuple[float, int]] = []
+        self._start_time = 0.0
+        self._last_keyframe = -keyframe_interval
+        self._updating = False
+        self._update_thread = None
+        self._event = threading.Event()
+        self.frames = 0
+        self.skipped = 0
+        self.raw_bytes = 0
+
+    def open(self, rf2_pid: str = "") -> None:
+        """Open mmap buffers & replay file, write header"""
+        self._mmaps = [
+            platform_mmap(buf.name, ctypes.sizeof(buf.data_struct), rf2_pid) for buf in self._buffers]
+        self._last_data = [None] * len(self._buffers)
+        self._last_version = [-1] * len(self._buffers)
+        self._file = open(self._filename, "wb")
+        self._file.write(FILE_HEADER.pack(MAGIC, FILE_VERSION, len(self._buffers)))
+        for buf in self._buffers:
+            name = buf.name.encode()
+            self._file.write(NAME_LENGTH.pack(len(name)) + name)
+            self._file.write(STRUCT_SIZE.pack(ctypes.sizeof(buf.data_struct)))
+        self._start_time = monotonic()
+        logger.info("replay: RECORDING: %s", self._filename)
+
+    def close(self) -> None:
+        """Write index & footer, close file and mmap buffers"""
+        if self._file is None:
+            return
+        index_offset = self._file.tell()
+        self._file.write(INDEX_COUNT.pack(len(self._index)))
+        for entry in self._index:
+            self._file.write(INDEX_ENTRY.pack(*entry))
+        self._file.write(FOOTER.pack(index_offset, MAGIC))
+        self._file.close()
+        self._file = None
+        for mmap_buffer in self._mmaps:
+            mmap_buffer.close()
+        self._mmaps.clear()
+        logger.info("replay: CLOSED: %s (%s frames)", self._filename, self.frames)
+
+    def start(self, rf2_pid: str = "") -> None:
+        """Record in separate thread"""
+        if not self._updating:
+            self.open(rf2_pid)
+            self._updating = True
+            self._event.clear()
+            self._update_thread = threading.Thread(target=self.__update, daemon=True)
+            self._update_thread.start()
+
+    def stop(self) -> None:
+        """Stop recording thread and close file"""
+        if self._updating:
+            self._event.set()
+            self._updating = False
+            if self._update_thread and self._update_thread.is_alive():
+                self._update_thread.join(timeout=1.0)
+            self.close()
+
+    def __update(self) -> None:
+        """Capture loop"""
+        _event_wait = self._event.wait
+        while not _event_wait(self._interval):
+            self.capture()
+
+    def capture(self) -> int:
+        """Capture all buffers once
+
+        Returns:
+            Number of recorded frames.
+        """
+        timestamp = monotonic() - self._start_time
+        snapshots = [read_consistent(mmap_buffer) for mmap_buffer in self._mmaps]
+        is_key = timestamp - self._last_keyframe >= self._keyframe_interval
+        if is_key and None in snapshots:
+            is_key = False  # torn read, keyframe group moved to next capture
+        if is_key:
+            self._last_keyframe = timestamp
+            self._index.append((timestamp, self._file.tell()))
+        recorded = 0
+        for buffer_id, data in enumerate(snapshots):
+            if data is None:
+                self.skipped += 1
+                continue
+            version_end = VERSION_BLOCK.unpack_from(data, 0)[1]
+            if not is_key and version_end == self._last_version[buffer_id]:
+                self.skipped += 1
+                continue
+            last_data = self._last_data[buffer_id]
+            if is_key or last_data is None:
+                self._write_frame(timestamp, buffer_id, FLAG_KEY, data)
+            else:
+                self._write_frame(timestamp, buffer_id, 0, xor_bytes(data, last_data))
+            self._last_data[buffer_id] = data
+            self._last_version[buffer_id] = version_end
+            self.raw_bytes += len(data)
+            recorded += 1
+        return recorded
+
+    def _write_frame(self, timestamp: float, buffer_id: int, flags: int, data: bytes) -> None:
+        """Write compressed frame"""
+        compressed = zlib.compress(data, self._compress_level)
+        self._file.write(FRAME_HEADER.pack(timestamp, buffer_id, flags, len(compressed)))
+        self._file.write(compressed)
+        self.frames += 1
+
+
+class ReplayReader:
+    """Read & decode replay file frames"""
+
+    __slots__ = (
+        "_file",
+        "_frames_end",
+        "_last_data",
+        "buffers",
+        "index",
+    )
+
+    def __init__(self, filename: str) -> None:
+        self._file = open(filename, "rb")
+        magic, version, buffer_count = FILE_HEADER.unpack(self._file.read(FILE_HEADER.size))
+        if magic != MAGIC or version != FILE_VERSION:
+            raise ValueError(f"unsupported replay file: {filename}")
+        self.buffers: list[tuple[str, int]] = []
+        for _ in range(buffer_count):
+            name_length, = NAME_LENGTH.unpack(self._file.read(NAME_LENGTH.size))
+            name = self._file.read(name_length).decode()
+            size, = STRUCT_SIZE.unpack(self._file.read(STRUCT_SIZE.size))
+            self.buffers.append((name, size))
+        self._last_data: list[bytes | None] = [None] * buffer_count
+        self.index: list[tuple[float, int]] = []
+        self._frames_end = self._load_index()
+
+    def _load_index(self) -> int:
+        """Load keyframe index from footer, rebuild by scanning if missing"""
+        frames_start = self._file.tell()
+        self._file.seek(0, os.SEEK_END)
+        file_end = self._file.tell()
+        if file_end - frames_start >= FOOTER.size:
+            self._file.seek(file_end - FOOTER.size)
+            index_offset, magic = FOOTER.unpack(self._file.read(FOOTER.size))
+            if magic == MAGIC:
+                self._file.seek(index_offset)
+                count, = INDEX_COUNT.unpack(self._file.read(INDEX_COUNT.size))
+                self.index = [
+                    INDEX_ENTRY.unpack(self._file.read(INDEX_ENTRY.size)) for _ in range(count)]
+                self._file.seek(frames_start)
+                return index_offset
+        # Unfinished recording, scan frames
+        logger.info("replay: index missing, scanning frames")
+        self._file.seek(frames_start)
+        offset = frames_start
+        last_key_time = None
+        while True:
+            header = self._file.read(FRAME_HEADER.size)
+            if len(header) < FRAME_HEADER.size:
+                break
+            timestamp, _, flags, size = FRAME_HEADER.unpack(header)
+            if flags & FLAG_KEY and timestamp != last_key_time:
+                self.index.append((timestamp, offset))
+                last_key_time = timestamp
+            self._file.seek(size, os.SEEK_CUR)
+            offset += FRAME_HEADER.size + size
+        self._file.seek(frames_start)
+        return offset
+
+    def close(self) -> None:
+        """Close file"""
+        self._file.close()
+
+    @property
+    def duration(self) -> float:
+        """Timestamp of last keyframe group"""
+        return self.index[-1][0] if self.index else 0.0
+
+    def seek(self, timestamp: float) -> float:
+        """Seek to nearest keyframe group at or before timestamp
+
+        Returns:
+            Timestamp of keyframe group.
+        """
+        if not self.index:
+            return 0.0
+        pos = max(bisect_right(self.index, (timestamp, float("inf"))) - 1, 0)
+        key_time, offset = self.index[pos]
+        self._file.seek(offset)
+        self._last_data = [None] * len(self.buffers)
+        return key_time
+
+    def read_frame(self) -> tuple[float, int, bytes] | None:
+        """Read next frame
+
+        Returns:
+            Timestamp, buffer id, full buffer data. None if end of file.
+        """
+        while self._file.tell() < self._frames_end:
+            timestamp, buffer_id, flags, size = FRAME_HEADER.unpack(self._file.read(FRAME_HEADER.size))
+            data = zlib.decompress(self._file.read(size))
+            if not flags & FLAG_KEY:
+                last_data = self._last_data[buffer_id]
+                if last_data is None:  # started after seek, wait for keyframe
+                    continue
+                data = xor_bytes(data, last_data)
+            self._last_data[buffer_id] = data
+            return timestamp, buffer_id, data
+        return None
+
+
+class ReplayPlayer:
+    """Play replay file into rF2 mmap buffers
+
+    Attributes:
+        frames: number of frames written to mmap.
+    """
+
+    __slots__ = (
+        "_reader",
+        "_speed",
+        "_loop",
+        "_mmaps",
+        "_updating",
+        "_update_thread",
+        "_event",
+        "frames",
+    )
+
+    def __init__(self, filename: str, speed: float = 1.0, loop: bool = False) -> None:
+        """
+        Args:
+            filename: replay file name.
+            speed: playback speed multiplier, 0 = as fast as possible.
+            loop: restart from beginning after last frame.
+        """
+        self._reader = ReplayReader(filename)
+        self._speed = speed
+        self._loop = loop
+        self._mmaps: list = []
+        self._updating = False
+        self._update_thread = None
+        self._event = threading.Event()
+        self.frames = 0
+
+    def open(self, rf2_pid: str = "") -> None:
+        """Open mmap buffers for writing"""
+        self._mmaps = [platform_mmap(name, size, rf2_pid) for name, size in self._reader.buffers]
+
+    def close(self) -> None:
+        """Close mmap buffers & replay file"""
+        for mmap_buffer in self._mmaps:
+            mmap_buffer.close()
+        self._mmaps.clear()
+        self._reader.close()
+
+    def seek(self, timestamp: float) -> float:
+        """Seek to nearest keyframe group at or before timestamp"""
+        return self._reader.seek(timestamp)
+
+    def start(self, rf2_pid: str = "") -> None:
+        """Play in separate thread"""
+        if not self._updating:
+            self.open(rf2_pid)
+            self._updating = True
+            self._event.clear()
+            self._update_thread = threading.Thread(target=self.play, daemon=True)
+            self._update_thread.start()
+
+    def stop(self) -> None:
+        """Stop playing thread, close buffers"""
+        if self._updating:
+            self._event.set()
+            self._updating = False
+            if self._update_thread and self._update_thread.is_alive():
+                self._update_thread.join(timeout=1.0)
+            self.close()
+
+    def play(self) -> None:
+        """Write frames to mmap at recorded timing (blocking)"""
+        _event_is_set = self._event.is_set
+        play_start = monotonic()
+        first_time = None
+        while not _event_is_set():
+            frame = self._reader.read_frame()
+            if frame is None:
+                if not self._loop:
+                    break
+                self._reader.seek(0.0)
+                first_time = None
+                continue
+            timestamp, buffer_id, data = frame
+            if first_time is None:
+                first_time = timestamp
+                play_start = monotonic()
+            if self._speed > 0:
+                delay = (timestamp - first_time) / self._speed - (monotonic() - play_start)
+                if delay > 0:
+                    sleep(delay)
+            write_frame(self._mmaps[buffer_id], data)
+            self.frames += 1
+        logger.info("replay: PLAYED: %s frames", self.frames)
+
+
+def main():
+    """Replay command line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="rF2 shared memory replay")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="record shared memory to file")
+    rec.add_argument("filename")
+    rec.add_argument("--duration", type=float, default=60.0, help="seconds to record")
+    rec.add_argument("--pid", default="", help="rF2 process ID (server data)")
+    ply = sub.add_parser("play", help="play file into shared memory")
+    ply.add_argument("filename")
+    ply.add_argument("--speed", type=float, default=1.0, help="playback speed, 0 = as fast as possible")
+    ply.add_argument("--seek", type=float, default=0.0, help="start time (seconds)")
+    ply.add_argument("--loop", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "record":
+        recorder = ReplayRecorder(args.filename)
+        recorder.start(args.pid)
+        try:
+            sleep(args.duration)
+        except KeyboardInterrupt:
+            pass
+        recorder.stop()
+        print(f"frames: {recorder.frames}, skipped: {recorder.skipped}, raw bytes: {recorder.raw_bytes}")
+    else:
+        player = ReplayPlayer(args.filename, args.speed, args.loop)
+        player.open()
+        player.seek(args.seek)
+        try:
+            player.play()
+        except KeyboardInterrupt:
+            pass
+        player.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Scoring vehicle snapshot
+
+Read all scoring mVehicles in one pass into column arrays (struct of arrays),
+using NumPy structured views over the ctypes buffer if NumPy is available.
+Columns are only turned into dicts at the serialization boundary (to_dicts).
+"""
+
+from __future__ import annotations
+
+import ctypes
+from math import isfinite
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # optional, fall back to pure python columns
+    np = None
+
+from pyRfactor2SharedMemory import rF2data
+from pyRfactor2SharedMemory.rF2MMap import MAX_VEHICLES
+from adapter.rf2_text import text_cache
+
+# Column set
+# 0 - output key, 1 - field path in rF2VehicleScoring, 2 - numpy format, 3 - column type
+# column type: 0 = int, 1 = float (nan/inf to zero), 2 = text (bytes), 3 = bool
+SCORING_COLUMNS = (
+    ("id", ("mID",), "i4", 0),
+    ("driver", ("mDriverName",), "S32", 2),
+    ("vehicle", ("mVehicleName",), "S64", 2),
+    ("class", ("mVehicleClass",), "S32", 2),
+    ("position", ("mPlace",), "u1", 0),
+    ("is_player", ("mIsPlayer",), "u1", 0),
+    ("laps", ("mTotalLaps",), "i2", 0),
+    ("sector", ("mSector",), "i1", 0),
+    ("status", ("mFinishStatus",), "i1", 0),
+    ("pit_state", ("mPitState",), "u1", 0),
+    ("in_pits", ("mInPits",), "u1", 0),
+    ("pit_group", ("mPitGroup",), "S24", 2),
+    ("pit_stops", ("mNumPitstops",), "i2", 0),
+    ("penalties", ("mNumPenalties",), "i2", 0),
+    ("lap_dist", ("mLapDist",), "f8", 1),
+    ("best_lap", ("mBestLapTime",), "f8", 1),
+    ("last_lap", ("mLastLapTime",), "f8", 1),
+    ("best_sector1", ("mBestSector1",), "f8", 1),
+    ("best_sector2", ("mBestSector2",), "f8", 1),
+    ("cur_sector1", ("mCurSector1",), "f8", 1),
+    ("cur_sector2", ("mCurSector2",), "f8", 1),
+    ("gap_leader", ("mTimeBehindLeader",), "f8", 1),
+    ("gap_next", ("mTimeBehindNext",), "f8", 1),
+    ("flag", ("mFlag",), "u1", 0),
+    ("under_yellow", ("mUnderYellow",), "u1", 3),
+    ("x", ("mPos", "x"), "f8", 1),
+    ("z", ("mPos", "z"), "f8", 1),
+)
+# Scoring sector index to sector number: 0=sector3, 1=sector1, 2=sector2
+SECTOR_MAP = (3, 1, 2)
+# Min number of vehicles for snapshot, per vehicle reads are faster below
+# (column setup cost), pure python columns are always slower
+SNAPSHOT_MIN_VEHICLES = 20 if np is not None else MAX_VEHICLES + 1
+
+
+def field_offset(struct: type[ctypes.Structure], path: tuple[str, ...]) -> int:
+    """Byte offset of (nested) field in ctypes structure"""
+    offset = 0
+    for name in path:
+        field = getattr(struct, name)
+        offset += field.offset
+        struct = dict(struct._fields_)[name]
+    return offset
+
+
+def vehicle_dtype():
+    """NumPy structured dtype viewing rF2VehicleScoring by field offsets"""
+    return np.dtype({
+        "names": [key for key, *_ in SCORING_COLUMNS],
+        "formats": [fmt for _, _, fmt, _ in SCORING_COLUMNS],
+        "offsets": [field_offset(rF2data.rF2VehicleScoring, path) for _, path, _, _ in SCORING_COLUMNS],
+        "itemsize": ctypes.sizeof(rF2data.rF2VehicleScoring),
+    })
+
+
+def _getter(path: tuple[str, ...]):
+    """Create field getter for pure python columns"""
+    if len(path) == 1:
+        name = path[0]
+        return lambda veh: getattr(veh, name)
+    name, sub_name = path
+    return lambda veh: getattr(getattr(veh, name), sub_name)
+
+
+class VehicleSnapshot:
+    """Struct-of-arrays snapshot of scoring vehicles
+
+    Columns are preallocated for MAX_VEHICLES and refilled in place on update(),
+    only the first `count` entries of each column are valid.
+
+    Attributes:
+        count: number of valid vehicles.
+        columns: column arrays (NumPy) or lists (fallback), key - output key.
+    """
+
+    __slots__ = (
+        "count",
+        "columns",
+        "_dtype",
+        "_getters",
+        "_floats",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        if np is not None:
+            self._dtype = vehicle_dtype()
+            self._getters = None
+            # Float columns share one 2d block, sanitized in one operation
+            float_keys = [key for key, _, _, col_type in SCORING_COLUMNS if col_type == 1]
+            self._floats = np.zeros((len(float_keys), MAX_VEHICLES), dtype="f8")
+            self.columns: dict[str, Any] = {
+                key: np.zeros(MAX_VEHICLES, dtype=fmt) for key, _, fmt, _ in SCORING_COLUMNS
+            }
+            self.columns.update(zip(float_keys, self._floats))
+        else:
+            self._dtype = None
+            self._floats = None
+            self._getters = tuple((key, _getter(path)) for key, path, _, _ in SCORING_COLUMNS)
+            self.columns = {key: [] for key, *_ in SCORING_COLUMNS}
+
+    def update(self, scoring: rF2data.rF2Scoring) -> VehicleSnapshot:
+        """Read all vehicles from scoring data in one pass"""
+        count = min(max(scoring.mScoringInfo.mNumVehicles, 0), MAX_VEHICLES)
+        self.count = count
+        if np is None:
+            vehicles = scoring.mVehicles[:count]
+            for key, getter in self._getters:
+                self.columns[key] = [getter(veh) for veh in vehicles]
+            for key, _, _, col_type in SCORING_COLUMNS:
+                if col_type == 1:
+                    self.columns[key] = [value if isfinite(value) else 0.0 for value in self.columns[key]]
+                elif col_type == 0:
+                    self.columns[key] = list(map(int, self.columns[key]))
+            self.columns["sector"] = [
+                SECTOR_MAP[value] if 0 <= value <= 2 else 0 for value in self.columns["sector"]]
+            return self
+        # View is not kept to avoid holding buffer export on mmap
+        view = np.frombuffer(scoring.mVehicles, dtype=self._dtype, count=MAX_VEHICLES)
+        columns = self.columns
+        for key, *_ in SCORING_COLUMNS:
+            np.copyto(columns[key][:count], view[key][:count])
+        del view
+        floats = self._floats[:, :count]
+        floats[~np.isfinite(floats)] = 0.0
+        sector = columns["sector"][:count]
+        valid = (sector >= 0) & (sector <= 2)
+        np.copyto(sector, np.take(SECTOR_MAP, np.clip(sector, 0, 2)), where=valid)
+        sector[~valid] = 0
+        return self
+
+    def column(self, key: str) -> list:
+        """Get valid part of column as list"""
+        column = self.columns[key][:self.count]
+        if np is None:
+            return column
+        if column.dtype.kind == "S":  # cut off at first null, same as ctypes char array
+            return [value.partition(b"\0")[0] for value in column.tolist()]
+        return column.tolist()
+
+    def index_of(self, vehicle_id: int) -> int:
+        """Get snapshot index from vehicle ID, -1 if not found"""
+        try:
+            return self.column("id").index(vehicle_id)
+        except ValueError:
+            return -1
+
+    def to_dicts(self) -> list[dict]:
+        """Convert to list of vehicle dicts (same layout as ScoringData.get_vehicle_scoring)"""
+        col = self.column
+        # Names decoded once per raw bytes
+        names = text_cache
+        names.count(4 * self.count)
+        return [
+            {
+                "id": vid,
+                "driver": names[driver],
+                "vehicle": names[vehicle],
+                "class": names[vclass],
+                "position": position,
+                "is_player": is_player,
+                "laps": laps,
+                "sector": sector,
+                "status": status,
+                "pit_state": pit_state,
+                "in_pits": in_pits,
+                "pit_group": names[pit_group],
+                "pit_stops": pit_stops,
+                "penalties": penalties,
+                "lap_dist": lap_dist,
+                "best_lap": best_lap,
+                "last_lap": last_lap,
+                "sectors_best": (best_s1, best_s2),
+                "sectors_cur": (cur_s1, cur_s2),
+                "gap_leader": gap_leader,
+                "gap_next": gap_next,
+                "flag": flag,
+                "under_yellow": bool(under_yellow),
+                "x": pos_x,
+                "z": pos_z,
+            }
+            for (
+                vid, driver, vehicle, vclass, position, is_player, laps, sector, status,
+                pit_state, in_pits, pit_group, pit_stops, penalties, lap_dist, best_lap, last_lap,
+                best_s1, best_s2, cur_s1, cur_s2, gap_leader, gap_next, flag, under_yellow, pos_x, pos_z,
+            ) in zip(*(col(key) for key, *_ in SCORING_COLUMNS))
+        ]
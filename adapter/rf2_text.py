@@ -0,0 +1,96 @@
+"""
+Text decode cache
+
+Shared memory names (driver, vehicle, class, pit group, compound, track,
+rules message) are char arrays decoded on every read, while they rarely
+change during a session. Decoded strings are cached by raw bytes and
+interned, so equal names share one string object.
+
+Cache is a dict subclass (raw bytes: text), a hit is a plain dict lookup
+without python call, only misses are decoded (__missing__).
+Keyed by raw bytes, entries never go stale, cache is only cleared
+when it grows over max_entries.
+"""
+
+from __future__ import annotations
+
+import sys
+from time import perf_counter
+
+from validator import bytes_to_str as tostr
+
+MAX_ENTRIES = 4096
+
+
+class TextCache(dict):
+    """Decoded text by raw bytes
+
+    Usage: cache[raw_bytes] -> text
+
+    Attributes:
+        lookups: number of lookups reported by callers (see count).
+        misses: number of decodes.
+        invalidations: number of cache clears on size limit.
+        max_entries: max number of entries before clear.
+    """
+
+    __slots__ = (
+        "lookups",
+        "misses",
+        "invalidations",
+        "max_entries",
+        "_decode_time",
+    )
+
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.lookups = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._decode_time = 0.0
+
+    def __missing__(self, raw: bytes) -> str:
+        start = perf_counter()
+        text = sys.intern(tostr(raw))
+        self._decode_time += perf_counter() - start
+        self.misses += 1
+        if len(self) >= self.max_entries:
+            self.invalidations += 1
+            self.clear()
+        self[raw] = text
+        return text
+
+    def count(self, lookups: int) -> None:
+        """Report number of lookups (for hit ratio), counted in bulk by callers"""
+        self.lookups += lookups
+
+    def reset_stats(self) -> None:
+        """Reset statistics"""
+        self.lookups = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._decode_time = 0.0
+
+    def stats(self) -> dict:
+        """Cache statistics
+
+        saved_ms: estimated decode time saved by hits, from average miss decode time.
+        """
+        misses = self.misses
+        lookups = max(self.lookups, misses)
+        hits = lookups - misses
+        decode_avg = self._decode_time / misses if misses else 0.0
+        return {
+            "entries": len(self),
+            "lookups": lookups,
+            "misses": misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "decode_avg_us": round(decode_avg * 1e6, 3),
+            "saved_ms": round(hits * decode_avg * 1e3, 3),
+        }
+
+
+# Shared by all data adapters
+text_cache = TextCache()
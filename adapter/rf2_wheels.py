@@ -0,0 +1,102 @@
+"""
+Wheel temperature block
+
+Read all temperatures of the four rF2Wheel in one pass into a 4x8 block
+(celsius, inf/nan as zero kelvin), using a NumPy structured view over the
+ctypes wheel array if NumPy is available, pure python otherwise.
+
+Block row: wheel (fl, fr, rl, rr)
+Block column: see WHEEL_TEMP_COLUMNS
+"""
+
+from __future__ import annotations
+
+import ctypes
+from math import isfinite
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # optional, fall back to pure python
+    np = None
+
+from pyRfactor2SharedMemory import rF2data
+
+KELVIN = 273.15
+# 0 - output key, 1 - rF2Wheel field, 2 - number of values, 3 - first block column
+WHEEL_TEMP_COLUMNS = (
+    ("surface", "mTemperature", 3, 0),  # inner, middle, outer
+    ("inner", "mTireInnerLayerTemperature", 3, 3),  # inner, middle, outer
+    ("carcass", "mTireCarcassTemperature", 1, 6),
+    ("brake", "mBrakeTemp", 1, 7),
+)
+BLOCK_WIDTH = 8
+SURFACE = slice(0, 3)
+INNER = slice(3, 6)
+CARCASS = 6
+BRAKE = 7
+
+
+def wheel_dtype():
+    """NumPy structured dtype viewing rF2Wheel temperatures by field offsets"""
+    return np.dtype({
+        "names": [key for key, *_ in WHEEL_TEMP_COLUMNS],
+        "formats": [("f8", (count,)) if count > 1 else "f8" for _, _, count, _ in WHEEL_TEMP_COLUMNS],
+        "offsets": [getattr(rF2data.rF2Wheel, name).offset for _, name, _, _ in WHEEL_TEMP_COLUMNS],
+        "itemsize": ctypes.sizeof(rF2data.rF2Wheel),
+    })
+
+
+WHEEL_DTYPE = wheel_dtype() if np is not None else None
+
+
+def _kelvin_to_celsius(value: float) -> float:
+    """Kelvin to celsius, inf/nan as zero kelvin"""
+    return (value if isfinite(value) else 0) - KELVIN
+
+
+def block_python(wheels: ctypes.Array) -> list[list[float]]:
+    """Read wheel temperatures into 4 row lists, pure python"""
+    return [
+        [_kelvin_to_celsius(value) for value in wheel.mTemperature]
+        + [_kelvin_to_celsius(value) for value in wheel.mTireInnerLayerTemperature]
+        + [_kelvin_to_celsius(wheel.mTireCarcassTemperature), _kelvin_to_celsius(wheel.mBrakeTemp)]
+        for wheel in wheels
+    ]
+
+
+def block_numpy(wheels: ctypes.Array) -> Any:
+    """Read wheel temperatures into (4, 8) float64 array, whole columns converted at once"""
+    # View is not kept to avoid holding buffer export on mmap
+    view = np.frombuffer(wheels, dtype=WHEEL_DTYPE, count=4)
+    block = np.empty((4, BLOCK_WIDTH), dtype="f8")
+    block[:, SURFACE] = view["surface"]
+    block[:, INNER] = view["inner"]
+    block[:, CARCASS] = view["carcass"]
+    block[:, BRAKE] = view["brake"]
+    del view
+    block[~np.isfinite(block)] = 0.0
+    block -= KELVIN
+    return block
+
+
+def wheel_temperature_block(wheels: ctypes.Array) -> Any:
+    """Read wheel temperatures into 4x8 block
+
+    Args:
+        wheels: rF2Wheel*4 array (rF2VehicleTelemetry.mWheels).
+
+    Returns:
+        NumPy float64 array (4, 8) if NumPy is available, otherwise list of 4 row lists.
+    """
+    if np is None:
+        return block_python(wheels)
+    return block_numpy(wheels)
+
+
+def wheel_temperature_rows(wheels: ctypes.Array) -> list[list[float]]:
+    """Read wheel temperatures into 4 row lists (block layout)"""
+    block = wheel_temperature_block(wheels)
+    if np is None:
+        return block
+    return block.tolist()
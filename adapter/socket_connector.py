@@ -1,17 +1,41 @@
+import json
 import socketio
 import requests  # Pensez à faire : pip install requests
 import time
 
+from adapter.payload_delta import DeltaEncoder
+from adapter.telemetry_codec import TelemetryEncoder
+
+
+class RawJSON(str):
+    """JSON déjà sérialisé, inséré tel quel dans le paquet Socket.IO"""
+
+
+class PacketJSON:
+    """Module json des paquets Socket.IO : les RawJSON ne sont pas ré-encodés"""
+
+    loads = staticmethod(json.loads)
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        # Paquet EVENT : [event, *args]
+        if isinstance(obj, list) and any(isinstance(value, RawJSON) for value in obj):
+            return "[" + ",".join(
+                value if isinstance(value, RawJSON) else json.dumps(value, **kwargs) for value in obj) + "]"
+        return json.dumps(obj, **kwargs)
+
 
 class SocketConnector:
-    def __init__(self, server_url, port=5000, username=None, password=None):
+    def __init__(self, server_url, port=5000, username=None, password=None, delta_mode=False,
+                 keyframe_interval=100, binary_mode=False):
         # Construction de l'URL
         if server_url.startswith("http"):
             self.base_url = f"{server_url}:{port}" if port else server_url
         else:
             self.base_url = f"http://{server_url}:{port}"
 
-        self.sio = socketio.Client(reconnection=True, reconnection_attempts=0, reconnection_delay=1)
+        self.sio = socketio.Client(reconnection=True, reconnection_attempts=0, reconnection_delay=1,
+                                   json=PacketJSON)
         self.is_connected = False
         self.token = None
 
@@ -19,10 +43,19 @@ class SocketConnector:
         self.username = username
         self.password = password
 
+        # Mode delta : keyframe périodique puis uniquement les chemins modifiés
+        self.delta_mode = delta_mode
+        self.encoder = DeltaEncoder(keyframe_interval)
+        # Mode binaire : format packé versionné (prioritaire sur le mode delta)
+        self.binary_mode = binary_mode
+        self.codec = TelemetryEncoder()
+
         @self.sio.event
         def connect():
             print("✅ SocketIO: Connecté au VPS (Authentifié) !")
             self.is_connected = True
+            self.encoder.request_keyframe()
+            self.codec.reset()
 
         @self.sio.event
         def connect_error(data):
@@ -38,6 +71,12 @@ class SocketConnector:
             print(f"⛔ ACCÈS REFUSÉ : {msg}")
             print("👉 Action requise : Allez sur le site Web et rejoignez l'équipe !")
 
+        @self.sio.event
+        def telemetry_resync(data=None):
+            # Le serveur a perdu la séquence : prochain envoi en keyframe
+            self.encoder.request_keyframe()
+            self.codec.reset()
+
         @self.sio.event
         def error(msg):
             print(f"⚠️ Erreur Serveur : {msg}")
@@ -90,15 +129,28 @@ class SocketConnector:
         except Exception as e:
             print(f"⚠️ Erreur de connexion Socket : {e}")
 
-    def send_data(self, data):
+    @property
+    def sends_json(self):
+        """Payload envoyé en JSON brut (ni delta, ni binaire) : accepte le JSON déjà sérialisé"""
+        return not (self.binary_mode or self.delta_mode)
+
+    def send_data(self, data, raw=None):
+        # raw : payload déjà sérialisé en JSON (bytes), envoyé sans ré-encodage en mode JSON
         # Connexion auto si besoin
         if not self.sio.connected:
             self.connect()
             if not self.sio.connected: return
 
         try:
-            self.sio.emit('telemetry_data', data)
+            if self.binary_mode:
+                self.sio.emit('telemetry_binary', self.codec.encode(data))
+            elif self.delta_mode:
+                self.sio.emit('telemetry_delta', self.encoder.encode(data))
+            else:
+                self.sio.emit('telemetry_data', data if raw is None else RawJSON(raw.decode()))
         except Exception as e:
+            self.encoder.request_keyframe()
+            self.codec.reset()
             print(f"Erreur d'envoi : {e}")
 
     def disconnect(self):
@@ -0,0 +1,398 @@
+"""
+Telemetry binary codec
+
+Schema-versioned packed layout for the telemetry_data payload:
+the "telemetry" and "scoring.vehicles" blocks are packed as fixed-width
+float32/int records, strings are interned per session and only sent once,
+the remaining payload is appended as compact JSON.
+
+Packet layout (little endian):
+    header: magic (4s), schema version (B), flags (B), new strings (H), vehicles (H), json length (I)
+    new strings: length (H) + utf-8 bytes, ids continue from current table size
+    telemetry record: TELEMETRY_SCHEMA
+    vehicle records: VEHICLE_SCHEMA x vehicles
+    json: payload without telemetry & scoring.vehicles,
+        telemetry & vehicle keys outside schema under EXTRA_KEY (merged back on decode)
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from operator import itemgetter
+from time import perf_counter
+from typing import Any
+
+MAGIC = b"LMUB"
+SCHEMA_VERSION = 1
+FLAG_RESET_STRINGS = 1
+
+HEADER = struct.Struct("<4sBBHHI")
+STRING_LENGTH = struct.Struct("<H")
+EXTRA_KEY = "_extra"  # json key of values outside schema: {"telemetry": {...}, "vehicles": {index: {...}}}
+
+# Schema: 0 - key path, 1 - field code, 2 - count (list if > 1)
+# field code: f = float32, b/B/h/H/i = int, ? = bool, S = interned string (H)
+TELEMETRY_SCHEMA = (
+    (("gear",), "b", 1),
+    (("rpm",), "f", 1),
+    (("speed",), "f", 1),
+    (("maxRpm",), "f", 1),
+    (("fuel",), "f", 1),
+    (("fuelCapacity",), "f", 1),
+    (("inputs", "thr"), "f", 1),
+    (("inputs", "brk"), "f", 1),
+    (("inputs", "clt"), "f", 1),
+    (("inputs", "str"), "f", 1),
+    (("temps", "oil"), "f", 1),
+    (("temps", "water"), "f", 1),
+    (("tires", "temp", "fl"), "f", 3),
+    (("tires", "temp", "fr"), "f", 3),
+    (("tires", "temp", "rl"), "f", 3),
+    (("tires", "temp", "rr"), "f", 3),
+    (("tires", "press"), "f", 4),
+    (("tires", "wear"), "f", 4),
+    (("tires", "brake_wear"), "f", 4),
+    (("tires", "type"), "B", 4),
+    (("tires", "brake_temp"), "f", 4),
+    (("tires", "compounds", "fl"), "S", 1),
+    (("tires", "compounds", "fr"), "S", 1),
+    (("tires", "compounds", "rl"), "S", 1),
+    (("tires", "compounds", "rr"), "S", 1),
+    (("electric", "charge"), "f", 1),
+    (("electric", "torque"), "f", 1),
+    (("electric", "rpm"), "f", 1),
+    (("electric", "temp_motor"), "f", 1),
+    (("electric", "temp_water"), "f", 1),
+    (("electric", "state"), "B", 1),
+    (("virtual_energy",), "f", 1),
+    (("max_virtual_energy",), "f", 1),
+    (("leaderLaps",), "i", 1),
+    (("leaderAvgLapTime",), "f", 1),
+    (("position",), "H", 1),
+    (("lastLap",), "i", 1),
+)
+VEHICLE_SCHEMA = (
+    (("id",), "i", 1),
+    (("driver",), "S", 1),
+    (("vehicle",), "S", 1),
+    (("class",), "S", 1),
+    (("position",), "B", 1),
+    (("is_player",), "B", 1),
+    (("laps",), "h", 1),
+    (("sector",), "B", 1),
+    (("status",), "b", 1),
+    (("pit_state",), "B", 1),
+    (("in_pits",), "B", 1),
+    (("pit_group",), "S", 1),
+    (("pit_stops",), "h", 1),
+    (("penalties",), "h", 1),
+    (("lap_dist",), "f", 1),
+    (("best_lap",), "f", 1),
+    (("last_lap",), "f", 1),
+    (("sectors_best",), "f", 2),
+    (("sectors_cur",), "f", 2),
+    (("gap_leader",), "f", 1),
+    (("gap_next",), "f", 1),
+    (("flag",), "B", 1),
+    (("under_yellow",), "?", 1),
+    (("x",), "f", 1),
+    (("z",), "f", 1),
+    (("stint_laps",), "h", 1),
+)
+
+
+def schema_tree(schema: tuple) -> dict:
+    """Nested dict of schema paths, leaf as None"""
+    tree: dict = {}
+    for path, _, _ in schema:
+        node = tree
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = None
+    return tree
+
+
+def residual(data: dict, tree: dict) -> dict:
+    """Part of data not covered by schema tree"""
+    extra = {}
+    for key, value in data.items():
+        if key not in tree:
+            extra[key] = value
+            continue
+        node = tree[key]
+        if node is None:
+            continue
+        if isinstance(value, dict):
+            value = residual(value, node)
+            if not value:
+                continue
+        extra[key] = value
+    return extra
+
+
+def merge(target: dict, extra: dict) -> None:
+    """Merge residual back into decoded dict"""
+    for key, value in extra.items():
+        node = target.get(key)
+        if isinstance(value, dict) and isinstance(node, dict):
+            merge(node, value)
+        else:
+            target[key] = value
+
+
+class RecordSchema:
+    """Compiled fixed-width record schema
+
+    Flat schema (single key paths) records are packed in a fast path:
+    values fetched with one itemgetter call, strings interned in place,
+    then packed with the precompiled Struct. Records with missing keys or
+    values of unexpected type (None, float for int) fall back to flatten.
+    """
+
+    __slots__ = (
+        "fields",
+        "packer",
+        "tree",
+        "_keys",
+        "_getter",
+        "_string_index",
+        "_list_index",
+    )
+
+    def __init__(self, schema: tuple) -> None:
+        self.fields = schema
+        self.packer = struct.Struct("<" + "".join(
+            f"{count}{'H' if code == 'S' else code}" for _, code, count in schema))
+        self.tree = schema_tree(schema)
+        if all(len(path) == 1 for path, _, _ in schema):
+            keys = [path[0] for path, _, _ in schema]
+            self._keys = frozenset(keys)
+            self._getter = itemgetter(*keys)
+        else:
+            self._keys = None
+            self._getter = None
+        self._string_index = tuple(index for index, (_, code, _) in enumerate(schema) if code == "S")
+        # Reversed, so expanding a list does not shift following indexes
+        self._list_index = tuple(
+            (index, count) for index, (_, _, count) in reversed(tuple(enumerate(schema))) if count > 1)
+
+    def pack(self, data: dict, intern) -> tuple[bytes, dict]:
+        """Pack record, return record bytes & values outside schema"""
+        if self._getter is not None:
+            try:
+                packed = self._pack_fast(data, intern)
+            except (KeyError, TypeError, ValueError, struct.error):
+                pass
+            else:
+                # All schema keys found, same size means no other key
+                if len(data) == len(self._keys):
+                    return packed, {}
+                return packed, residual(data, self.tree)
+        return self.packer.pack(*self.flatten(data, intern)), residual(data, self.tree)
+
+    def _pack_fast(self, data: dict, intern) -> bytes:
+        values = list(self._getter(data))
+        for index in self._string_index:
+            text = values[index]
+            if type(text) is not str:
+                raise TypeError(text)
+            values[index] = intern(text)
+        for index, count in self._list_index:
+            items = values[index]
+            if len(items) != count:
+                raise ValueError(items)
+            values[index:index + 1] = items
+        return self.packer.pack(*values)
+
+    def flatten(self, data: dict, intern) -> list:
+        """Flatten nested dict into record values"""
+        values = []
+        append = values.append
+        for path, code, count in self.fields:
+            value = data
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if count > 1:
+                items = list(value)[:count] if isinstance(value, (list, tuple)) else []
+                items.extend([0] * (count - len(items)))
+            else:
+                items = (value,)
+            for item in items:
+                if code == "f":
+                    append(float(item or 0))
+                elif code == "S":
+                    append(intern(item if isinstance(item, str) else ""))
+                elif code == "?":
+                    append(bool(item))
+                else:
+                    append(int(item or 0))
+        return values
+
+    def unflatten(self, values: tuple, strings: list) -> dict:
+        """Rebuild nested dict from record values"""
+        output: dict = {}
+        index = 0
+        for path, code, count in self.fields:
+            items = values[index:index + count]
+            index += count
+            if code == "S":
+                items = [strings[item] for item in items]
+            target = output
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = list(items) if count > 1 else items[0]
+        return output
+
+
+TELEMETRY_RECORD = RecordSchema(TELEMETRY_SCHEMA)
+VEHICLE_RECORD = RecordSchema(VEHICLE_SCHEMA)
+
+
+class TelemetryEncoder:
+    """Encode telemetry payload to binary packet
+
+    Attributes:
+        messages: number of encoded packets.
+        bytes_last: size of last packet.
+        bytes_total: total encoded bytes.
+        encode_time_last: encode time of last packet (seconds).
+        encode_time_total: total encode time (seconds).
+    """
+
+    __slots__ = (
+        "_strings",
+        "_new_strings",
+        "_reset",
+        "messages",
+        "bytes_last",
+        "bytes_total",
+        "encode_time_last",
+        "encode_time_total",
+    )
+
+    def __init__(self) -> None:
+        self._strings: dict[str, int] = {}
+        self._new_strings: list[str] = []
+        self._reset = True
+        self.messages = 0
+        self.bytes_last = 0
+        self.bytes_total = 0
+        self.encode_time_last = 0.0
+        self.encode_time_total = 0.0
+
+    def reset(self) -> None:
+        """Reset string table (new session or receiver resync)"""
+        self._strings.clear()
+        self._new_strings.clear()
+        self._reset = True
+
+    def _intern(self, text: str) -> int:
+        """Get string id, add to table if new"""
+        string_id = self._strings.get(text)
+        if string_id is None:
+            string_id = self._strings[text] = len(self._strings)
+            self._new_strings.append(text)
+        return string_id
+
+    def encode(self, payload: dict) -> bytes:
+        """Encode payload"""
+        start = perf_counter()
+        scoring = payload.get("scoring") or {}
+        vehicles = scoring.get("vehicles") or ()
+        intern = self._intern
+        telemetry_bytes, telemetry_extra = TELEMETRY_RECORD.pack(payload.get("telemetry") or {}, intern)
+        vehicle_pack = VEHICLE_RECORD.pack
+        vehicle_chunks = []
+        vehicle_extra = {}
+        for index, veh in enumerate(vehicles):
+            record, extra = vehicle_pack(veh, intern)
+            vehicle_chunks.append(record)
+            if extra:
+                vehicle_extra[str(index)] = extra
+        vehicle_bytes = b"".join(vehicle_chunks)
+        # Remaining payload as json
+        rest = {key: value for key, value in payload.items() if key != "telemetry"}
+        if "scoring" in payload:
+            rest["scoring"] = {key: value for key, value in scoring.items() if key != "vehicles"}
+        if telemetry_extra or vehicle_extra:
+            rest[EXTRA_KEY] = {"telemetry": telemetry_extra, "vehicles": vehicle_extra}
+        json_bytes = json.dumps(rest, separators=(",", ":")).encode()
+        # String table
+        string_bytes = bytearray()
+        for text in self._new_strings:
+            raw = text.encode()
+            string_bytes += STRING_LENGTH.pack(len(raw))
+            string_bytes += raw
+        packet = b"".join((
+            HEADER.pack(
+                MAGIC, SCHEMA_VERSION, FLAG_RESET_STRINGS if self._reset else 0,
+                len(self._new_strings), len(vehicles), len(json_bytes)),
+            string_bytes,
+            telemetry_bytes,
+            vehicle_bytes,
+            json_bytes,
+        ))
+        self._new_strings.clear()
+        self._reset = False
+        # Stats
+        elapsed = perf_counter() - start
+        self.messages += 1
+        self.bytes_last = len(packet)
+        self.bytes_total += self.bytes_last
+        self.encode_time_last = elapsed
+        self.encode_time_total += elapsed
+        return packet
+
+
+class TelemetryDecoder:
+    """Decode binary packet to telemetry payload"""
+
+    __slots__ = (
+        "_strings",
+    )
+
+    def __init__(self) -> None:
+        self._strings: list[str] = []
+
+    def decode(self, packet: bytes) -> dict:
+        """Decode packet
+
+        Raises:
+            ValueError: invalid packet or unsupported schema version.
+        """
+        magic, version, flags, new_strings, vehicle_count, json_length = HEADER.unpack_from(packet, 0)
+        if magic != MAGIC:
+            raise ValueError("invalid packet")
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"unsupported schema version {version}")
+        offset = HEADER.size
+        # String table
+        if flags & FLAG_RESET_STRINGS:
+            self._strings.clear()
+        for _ in range(new_strings):
+            length, = STRING_LENGTH.unpack_from(packet, offset)
+            offset += STRING_LENGTH.size
+            self._strings.append(packet[offset:offset + length].decode())
+            offset += length
+        # Telemetry & vehicles
+        telemetry = TELEMETRY_RECORD.unflatten(
+            TELEMETRY_RECORD.packer.unpack_from(packet, offset), self._strings)
+        offset += TELEMETRY_RECORD.packer.size
+        vehicles = []
+        vehicle_unpack = VEHICLE_RECORD.packer.unpack_from
+        vehicle_size = VEHICLE_RECORD.packer.size
+        for _ in range(vehicle_count):
+            vehicles.append(VEHICLE_RECORD.unflatten(vehicle_unpack(packet, offset), self._strings))
+            offset += vehicle_size
+        # Remaining payload
+        payload: dict[str, Any] = json.loads(packet[offset:offset + json_length])
+        extra = payload.pop(EXTRA_KEY, None)
+        if extra:
+            merge(telemetry, extra.get("telemetry", {}))
+            for index, veh_extra in extra.get("vehicles", {}).items():
+                vehicles[int(index)].update(veh_extra)
+        payload["telemetry"] = telemetry
+        if vehicles or "scoring" in payload:
+            payload.setdefault("scoring", {})["vehicles"] = vehicles
+        return payload
@@ -22,7 +22,7 @@ Asynchronous request
 
 from __future__ import annotations
 
-from asyncio import StreamReader, open_connection, wait_for
+from asyncio import IncompleteReadError, StreamReader, StreamWriter, open_connection, wait_for
 from contextlib import asynccontextmanager
 from time import perf_counter
 from typing import Awaitable
@@ -39,44 +39,165 @@ def set_header_get(uri: str = "/", host: str = "localhost", *headers: str) -> by
     return f"GET {uri} HTTP/1.1\r\nHost: {host}{extra_headers}\r\n\r\n".encode()
 
 
-async def parse_response(reader: StreamReader) -> bytes:
-    """Parse response"""
+async def read_response(reader: StreamReader) -> tuple[bytes, bool]:
+    """Read full response, consume body even if status is not OK
+
+    Returns:
+        Body bytes (empty if status not OK), whether connection can be reused.
+    """
     # Get headers
     header_bytes = await reader.readuntil(b"\r\n\r\n")
-    if b"200" not in header_bytes:  # check http status code
-        return b""
+    header_lower = header_bytes.lower()
+    status_ok = b"200" in header_bytes[:header_bytes.find(b"\r\n")]  # check http status code
+    keep_alive = b"connection: close" not in header_lower
+    # Get chunked data
+    if b"transfer-encoding: chunked" in header_lower:
+        temp_bytes = bytearray()
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            chunk_size = int(size_line.split(b";", 1)[0], 16)
+            if chunk_size == 0:  # end chunk, skip trailers
+                while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                    pass
+                break
+            temp_bytes.extend((await reader.readexactly(chunk_size + 2))[:-2])  # cut off CRLF
+        return (bytes(temp_bytes) if status_ok else b""), keep_alive
     # Get non-chunked data
-    if b"chunked" not in header_bytes:
-        # Get body length
-        body_length = 0
-        pos_beg = header_bytes.find(b"Content-Length")
-        if pos_beg >= 0:
-            try:
-                pos_beg += 15  # offset
-                pos_end = header_bytes.find(b"\r\n", pos_beg)
-                body_length = int(header_bytes[pos_beg:pos_end])
-            except (AttributeError, TypeError, IndexError, ValueError):
-                body_length = 0
-        if body_length <= 0:
-            return b""
-        if body_length <= BUFFER_LIMIT:
-            return await reader.read(body_length)
-        # Exceeded buffer limit
+    pos_beg = header_lower.find(b"content-length:")
+    if pos_beg < 0:  # body delimited by connection close, cannot reuse
+        return b"", False
+    try:
+        pos_beg += 15  # offset
+        pos_end = header_lower.find(b"\r\n", pos_beg)
+        body_length = int(header_lower[pos_beg:pos_end])
+    except (AttributeError, TypeError, IndexError, ValueError):
+        return b"", False
+    if body_length <= 0:
+        return b"", keep_alive
+    if body_length <= BUFFER_LIMIT:
+        body = await reader.readexactly(body_length)
+    else:  # exceeded buffer limit
         temp_bytes = bytearray()
         while body_length > 0:
-            temp_bytes.extend(await reader.read(BUFFER_LIMIT))
+            temp_bytes.extend(await reader.readexactly(min(body_length, BUFFER_LIMIT)))
             body_length -= BUFFER_LIMIT
-        return bytes(temp_bytes)
-    # Get chunked data
-    temp_bytes = bytearray()
-    while (await reader.readuntil()) != b"0\r\n":  # end chunk
-        temp_bytes[-2:] = await reader.readuntil()  # cut off CRLF
-    return bytes(temp_bytes)
+        body = bytes(temp_bytes)
+    return (body if status_ok else b""), keep_alive
+
+
+async def parse_response(reader: StreamReader) -> bytes:
+    """Parse response"""
+    return (await read_response(reader))[0]
+
+
+class HttpConnectionPool:
+    """Per-host HTTP/1.1 keep-alive connection pool
+
+    Connections are bound to the event loop that opened them,
+    call close() before the loop exits.
+
+    Attributes:
+        new_connections: number of opened connections.
+        reused_connections: number of requests served by an idle connection.
+        reconnects: number of retries after server closed an idle connection.
+    """
+
+    __slots__ = (
+        "_idle",
+        "_max_idle",
+        "new_connections",
+        "reused_connections",
+        "reconnects",
+    )
+
+    def __init__(self, max_idle: int = 4) -> None:
+        self._idle: dict[tuple, list[tuple[StreamReader, StreamWriter]]] = {}
+        self._max_idle = max_idle
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.reconnects = 0
+
+    def stats(self) -> dict:
+        """Connection statistics"""
+        return {
+            "new": self.new_connections,
+            "reused": self.reused_connections,
+            "reconnects": self.reconnects,
+            "idle": sum(map(len, self._idle.values())),
+        }
+
+    async def _acquire(self, key: tuple, time_out: float) -> tuple[StreamReader, StreamWriter, bool]:
+        """Get idle connection or open new one"""
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if reader.at_eof() or writer.is_closing():
+                writer.close()
+                continue
+            self.reused_connections += 1
+            return reader, writer, True
+        host, port, ssl = key
+        reader, writer = await wait_for(open_connection(host, port, ssl=ssl or None), time_out)
+        self.new_connections += 1
+        return reader, writer, False
+
+    def _release(self, key: tuple, reader: StreamReader, writer: StreamWriter) -> None:
+        """Return connection to idle list"""
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < self._max_idle and not writer.is_closing():
+            idle.append((reader, writer))
+        else:
+            writer.close()
+
+    async def get(self, request: bytes, host: str, port: int, time_out: float, ssl: bool = False) -> bytes:
+        """Send GET request, reconnect once if idle connection was closed by server"""
+        key = (host, port, ssl)
+        while True:
+            reader, writer, reused = await self._acquire(key, time_out)
+            try:
+                writer.write(request)
+                await writer.drain()
+                body, keep_alive = await wait_for(read_response(reader), time_out)
+            except TimeoutError:
+                writer.close()
+                raise
+            except (ConnectionError, IncompleteReadError, OSError):
+                writer.close()
+                if reused:  # stale keep-alive socket
+                    self.reconnects += 1
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            if keep_alive:
+                self._release(key, reader, writer)
+            else:
+                writer.close()
+            return body
+
+    async def close(self) -> None:
+        """Close all idle connections"""
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except (ConnectionError, OSError):
+                    pass
+        self._idle.clear()
 
 
 @asynccontextmanager
-async def http_get(request: bytes, host: str, port: int, time_out: float):
-    """Async request - HTTP get response"""
+async def http_get(
+    request: bytes, host: str, port: int, time_out: float, pool: HttpConnectionPool | None = None):
+    """Async request - HTTP get response
+
+    Reuse keep-alive connection if pool is set, otherwise open & close a new connection.
+    """
+    if pool is not None:
+        yield await pool.get(request, host, port, time_out)
+        return
     writer = None
     try:
         reader, writer = await wait_for(open_connection(host, port), time_out)
@@ -0,0 +1,3 @@
+"""
+Bridge benchmark
+"""
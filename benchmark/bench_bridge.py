@@ -0,0 +1,211 @@
+"""
+Bridge hot path benchmark
+
+Time adapters, payload construction (total & per section), lap recorder and serialization
+on synthetic shared memory data with 1, 30 and 100 cars.
+
+Usage:
+    python -m benchmark.bench_bridge [--cars 1 30 100] [--json result.json]
+
+Output is JSON (one result per case & car count) for tracking regressions across versions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+from time import perf_counter
+from typing import Callable
+
+from adapter.rf2_data import (
+    ExtendedData,
+    PitInfoData,
+    RulesData,
+    ScoringData,
+    TelemetryData,
+    Vehicle,
+    WeatherData,
+)
+from adapter import rf2_wheels
+from adapter.rf2_text import text_cache
+from adapter.telemetry_codec import TelemetryEncoder
+from benchmark.synthetic import synthetic_info
+from bridge_core import ConsumptionTracker, PayloadBuilder, TelemetryRecorder
+from version import __version__
+
+DEFAULT_CARS = (1, 30, 100)
+SESSION_TYPE = 10  # race
+
+
+class Adapters:
+    """Adapter set on synthetic data"""
+
+    __slots__ = (
+        "info",
+        "telemetry",
+        "scoring",
+        "rules",
+        "extended",
+        "pit_info",
+        "weather",
+        "vehicle",
+    )
+
+    def __init__(self, num_vehicles: int) -> None:
+        info = self.info = synthetic_info(num_vehicles, player_index=num_vehicles - 1)
+        self.telemetry = TelemetryData(info)
+        self.scoring = ScoringData(info)
+        self.rules = RulesData(info)
+        self.extended = ExtendedData(info)
+        self.pit_info = PitInfoData(info)
+        self.weather = WeatherData(info)
+        self.vehicle = Vehicle(info)
+
+
+def telemetry_accessors(adp: Adapters, idx: int) -> dict:
+    """TelemetryData accessors used by payload"""
+    telemetry = adp.telemetry
+    return {
+        "gear": telemetry.gear(idx), "rpm": telemetry.rpm(idx), "maxRpm": telemetry.rpm_max(idx),
+        "fuel": telemetry.fuel_level(idx), "fuelCapacity": telemetry.fuel_capacity(idx),
+        "thr": telemetry.input_throttle(idx), "brk": telemetry.input_brake(idx),
+        "clt": telemetry.input_clutch(idx), "str": telemetry.input_steering(idx),
+        "oil": telemetry.temp_oil(idx), "water": telemetry.temp_water(idx),
+        "temp": telemetry.tire_temps(idx), "press": telemetry.tire_pressure(idx),
+        "wear": telemetry.tire_wear(idx), "type": telemetry.surface_type(idx),
+        "brake_temp": telemetry.brake_temp(idx), "compounds": telemetry.tire_compound_name(idx),
+        "electric": telemetry.electric_data(idx),
+    }
+
+
+def payload_builder(adp: Adapters) -> PayloadBuilder:
+    """Payload builder on adapter set, same sections as bridge"""
+    return PayloadBuilder(
+        adp.telemetry, adp.scoring, adp.rules, adp.extended, adp.pit_info, adp.weather, adp.vehicle,
+        tracker=ConsumptionTracker(lambda _: None), team_id="benchmark", driver_id="benchmark")
+
+
+def measure(func: Callable, target_time: float = 0.2, repeat: int = 5) -> dict:
+    """Measure function call time (microseconds per call)"""
+    # Calibrate number of calls per round
+    number = 1
+    while True:
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = perf_counter() - start
+        if elapsed >= target_time / repeat or number >= 1 << 20:
+            break
+        number *= 2
+    rounds = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((perf_counter() - start) / number * 1e6)
+    return {
+        "calls": number * repeat,
+        "min_us": round(min(rounds), 3),
+        "median_us": round(statistics.median(rounds), 3),
+        "mean_us": round(statistics.fmean(rounds), 3),
+    }
+
+
+def bench_cases(num_vehicles: int) -> dict[str, Callable]:
+    """Benchmark cases for number of vehicles"""
+    adp = Adapters(num_vehicles)
+    idx = 0
+    builder = payload_builder(adp)
+    payload = builder.build(idx, SESSION_TYPE)
+    encoder = TelemetryEncoder()
+    cases = {
+        "telemetry_accessors": lambda: telemetry_accessors(adp, idx),
+        "telemetry_fields": lambda: adp.telemetry.fields(idx),
+        "wheel_temps_python": lambda: rf2_wheels.block_python(adp.info.rf2TeleVeh(idx).mWheels),
+        "local_driver_status": adp.vehicle.get_local_driver_status,
+        "sync_tele_indexes": adp.info._sync._SyncData__update_tele_indexes,
+        "sync_player_data": adp.info._sync._SyncData__sync_player_data,
+        "scoring_get_vehicle_scoring": lambda: [
+            adp.scoring.get_vehicle_scoring(i) for i in range(num_vehicles)],
+        "scoring_vehicles_snapshot": lambda: adp.scoring.vehicles_snapshot().to_dicts(),
+        "scoring_vehicles_scoring": adp.scoring.vehicles_scoring,
+        "build_payload": lambda: builder.build(idx, SESSION_TYPE),
+        "json_encode": lambda: json.dumps(payload),
+        "binary_encode": lambda: encoder.encode(payload),
+    }
+    if rf2_wheels.np is not None:
+        cases["wheel_temps_numpy"] = lambda: rf2_wheels.block_numpy(adp.info.rf2TeleVeh(idx).mWheels)
+    recorder = TelemetryRecorder("http://localhost", "benchmark")
+    recorder.current_lap = adp.telemetry.lap_number(idx)
+    state = {"dist": 0.0}
+
+    def recorder_update():
+        # Advance lap distance so each call records a sample
+        state["dist"] += 3.0
+        adp.scoring.shmm.rf2ScorVeh(idx).mLapDist = state["dist"]
+        recorder.update(recorder.current_lap, idx, adp.telemetry, adp.vehicle, adp.scoring)
+        if len(recorder.buffer) >= recorder.buffer.capacity:
+            recorder.buffer.clear()
+
+    cases["recorder_update"] = recorder_update
+    return cases
+
+
+def section_timing(num_vehicles: int, builds: int = 200) -> dict:
+    """Per-section payload build time (PayloadBuilder stats)"""
+    builder = payload_builder(Adapters(num_vehicles))
+    for _ in range(builds):
+        builder.build(0, SESSION_TYPE)
+    return builder.stats()
+
+
+def run(cars=DEFAULT_CARS, target_time: float = 0.2) -> dict:
+    """Run all benchmark cases"""
+    text_cache.reset_stats()
+    results = []
+    for num_vehicles in cars:
+        for name, func in bench_cases(num_vehicles).items():
+            result = {"case": name, "cars": num_vehicles}
+            result.update(measure(func, target_time))
+            results.append(result)
+    sizes = {}
+    sections = {}
+    for num_vehicles in cars:
+        payload = payload_builder(Adapters(num_vehicles)).build(0, SESSION_TYPE)
+        sizes[str(num_vehicles)] = {
+            "json_bytes": len(json.dumps(payload)),
+            "binary_bytes": len(TelemetryEncoder().encode(payload)),
+        }
+        sections[str(num_vehicles)] = section_timing(num_vehicles)
+    return {
+        "bridge_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "payload_size": sizes,
+        "payload_sections": sections,
+        "text_cache": text_cache.stats(),
+    }
+
+
+def main():
+    """Benchmark command line"""
+    parser = argparse.ArgumentParser(description="Bridge hot path benchmark")
+    parser.add_argument("--cars", type=int, nargs="+", default=DEFAULT_CARS)
+    parser.add_argument("--time", type=float, default=0.2, help="target time per case (seconds)")
+    parser.add_argument("--json", help="write result to file instead of stdout")
+    args = parser.parse_args()
+    output = run(args.cars, args.time)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(output, file, indent=1)
+    else:
+        json.dump(output, sys.stdout, indent=1)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Synthetic rF2 shared memory data
+
+Fill rF2 ctypes structs with deterministic data for a given number of cars,
+and attach them to an RF2Info instance without opening any mmap,
+so adapters are measured through the real accessor code path.
+"""
+
+from __future__ import annotations
+
+from adapter.rf2_connector import RF2Info
+from pyRfactor2SharedMemory import rF2data
+
+CLASSES = (b"Hypercar", b"LMP2", b"LMGT3")
+
+
+def fill_scoring(scoring: rF2data.rF2Scoring, num_vehicles: int, player_index: int = 0) -> None:
+    """Fill scoring data"""
+    info = scoring.mScoringInfo
+    info.mTrackName = b"Circuit de la Sarthe"
+    info.mLapDist = 13626.0
+    info.mSession = 10
+    info.mCurrentET = 3600.0
+    info.mEndET = 86400.0
+    info.mNumVehicles = num_vehicles
+    info.mInRealtime = 1
+    info.mAmbientTemp = 22.0
+    info.mTrackTemp = 31.0
+    for index in range(num_vehicles):
+        veh = scoring.mVehicles[index]
+        veh.mID = 100 + index
+        veh.mDriverName = b"Driver %d" % index
+        veh.mVehicleName = b"Car #%d" % index
+        veh.mVehicleClass = CLASSES[index % len(CLASSES)]
+        veh.mPitGroup = b"Team %d" % index
+        veh.mPlace = index + 1
+        veh.mIsPlayer = index == player_index
+        veh.mControl = 0 if index == player_index else 2
+        veh.mTotalLaps = 50 - index // 10
+        veh.mSector = index % 3
+        veh.mLapDist = 100.0 * index % 13626.0
+        veh.mBestLapTime = 210.0 + index * 0.1
+        veh.mLastLapTime = 211.0 + index * 0.1
+        veh.mBestSector1 = 70.0
+        veh.mBestSector2 = 140.0
+        veh.mTimeBehindLeader = index * 1.5
+        veh.mTimeBehindNext = 1.5 if index else 0.0
+        veh.mNumPitstops = index % 4
+        veh.mPos.x = float(index)
+        veh.mPos.z = float(-index)
+
+
+def fill_telemetry(telemetry: rF2data.rF2Telemetry, num_vehicles: int) -> None:
+    """Fill telemetry data, in reverse order of scoring to exercise ID lookup"""
+    telemetry.mNumVehicles = num_vehicles
+    for tele_index in range(num_vehicles):
+        index = num_vehicles - 1 - tele_index
+        veh = telemetry.mVehicles[tele_index]
+        veh.mID = 100 + index
+        veh.mLapNumber = 50
+        veh.mGear = 5
+        veh.mEngineRPM = 7500.0
+        veh.mEngineMaxRPM = 9000.0
+        veh.mEngineOilTemp = 105.0
+        veh.mEngineWaterTemp = 90.0
+        veh.mFuel = 55.0
+        veh.mFuelCapacity = 90.0
+        veh.mFilteredThrottle = 1.0
+        veh.mUnfilteredThrottle = 1.0
+        veh.mFilteredSteering = -0.1
+        veh.mLocalVel.z = -70.0
+        veh.mFrontTireCompoundName = b"Medium"
+        veh.mRearTireCompoundName = b"Hard"
+        for wheel_index, wheel in enumerate(veh.mWheels):
+            wheel.mTemperature[:] = (353.15, 354.15, 355.15)
+            wheel.mTireInnerLayerTemperature[:] = (363.15, 364.15, 365.15)
+            wheel.mTireCarcassTemperature = 358.15
+            wheel.mBrakeTemp = 673.15 + wheel_index
+            wheel.mPressure = 170.0
+            wheel.mWear = 0.9
+            wheel.mTireLoad = 4000.0
+            wheel.mRideHeight = 0.05
+
+
+def synthetic_info(num_vehicles: int, player_index: int = 0) -> RF2Info:
+    """Create RF2Info with synthetic data for number of vehicles"""
+    info = RF2Info()
+    dataset = info._sync.dataset
+    dataset.scor.data = rF2data.rF2Scoring()
+    dataset.tele.data = rF2data.rF2Telemetry()
+    dataset.ext.data = rF2data.rF2Extended()
+    dataset.ffb.data = rF2data.rF2ForceFeedback()
+    dataset.rules.data = rF2data.rF2Rules()
+    dataset.pit.data = rF2data.rF2PitInfo()
+    dataset.weather.data = rF2data.rF2Weather()
+    fill_scoring(dataset.scor.data, num_vehicles, player_index)
+    fill_telemetry(dataset.tele.data, num_vehicles)
+    # Telemetry index by vehicle ID
+    tele_indexes = info._sync._tele_indexes
+    for tele_index in range(num_vehicles):
+        tele_indexes[dataset.tele.data.mVehicles[tele_index].mID] = tele_index
+    info._sync.player_scor_index = player_index
+    info._sync.player_scor = dataset.scor.data.mVehicles[player_index]
+    info._sync.player_tele = dataset.tele.data.mVehicles[info._sync.sync_tele_index(player_index)]
+    return info
@@ -0,0 +1,272 @@
+"""
+Headless bridge
+
+Run BridgeLogic without GUI (no Tk / customtkinter import), for a spare
+machine or a service. Config is merged from (lowest to highest priority):
+defaults, JSON config file, environment variables, command line arguments.
+
+Log goes to a rotating file (and console unless --quiet),
+status is served as JSON on a local HTTP endpoint (GET /status).
+
+Usage:
+    python bridge_cli.py --config bridge.json
+    LMU_BRIDGE_PASSWORD=... python bridge_cli.py --lineup "My Team" --driver pseudo
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from bridge_logic import BridgeLogic
+from bridge_process import ProcessBridge
+from version import __version__
+
+logger = logging.getLogger("bridge")
+
+ENV_PREFIX = "LMU_BRIDGE_"
+DEFAULT_CONFIG = {
+    "lineup": "",
+    "driver": "",
+    "password": "",
+    "analysis": False,
+    "debug": False,
+    "max_rate": 20.0,  # max payloads per second
+    "log_file": "bridge.log",
+    "log_max_bytes": 1024 * 1024,
+    "log_backups": 3,
+    "status_host": "127.0.0.1",
+    "status_port": 8765,  # 0 = disabled
+    "auth_retry_delay": 10.0,  # 0 = exit on auth failure
+    "multiprocess": False,  # acquisition & sender in separate processes
+    "delta_mode": False,  # send keyframe + changed paths to VPS (telemetry_delta)
+    "binary_mode": False,  # send packed binary payload to VPS (telemetry_binary), over delta_mode
+    "record_file": "",  # local payload recording (JSON lines), empty = disabled
+    "lan_host": "0.0.0.0",
+    "lan_port": 0,  # local pit wall broadcast (websocket/TCP), 0 = disabled
+    "spool_dir": "",  # analysis upload spool, empty = "spool" beside executable (or script)
+    "upload_batch": 1,  # max consecutive laps per analysis upload (JSON array if > 1, needs server support)
+    "upload_gzip": False,  # gzip analysis upload body (needs server support)
+}
+
+
+def parse_value(default, value):
+    """Convert string value (env var) to type of default value"""
+    if isinstance(default, bool):
+        return str(value).strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, int):
+        return int(value)
+    if isinstance(default, float):
+        return float(value)
+    return str(value)
+
+
+def load_config(args: argparse.Namespace) -> dict:
+    """Merge config from defaults, file, environment & arguments"""
+    config = DEFAULT_CONFIG.copy()
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as file:
+            file_config = json.load(file)
+        for key, value in file_config.items():
+            if key in config:
+                config[key] = parse_value(config[key], value)
+            else:
+                logger.warning("unknown config key: %s", key)
+    for key, default in DEFAULT_CONFIG.items():
+        value = os.environ.get(ENV_PREFIX + key.upper())
+        if value is not None:
+            config[key] = parse_value(default, value)
+    for key in DEFAULT_CONFIG:
+        value = getattr(args, key, None)
+        if value is not None:
+            config[key] = value
+    return config
+
+
+def setup_logging(config: dict, quiet: bool = False) -> None:
+    """Rotating file log (and console)"""
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG if config["debug"] else logging.INFO)
+    if config["log_file"]:
+        file_handler = RotatingFileHandler(
+            config["log_file"], maxBytes=config["log_max_bytes"],
+            backupCount=config["log_backups"], encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        root.addHandler(file_handler)
+    if not quiet:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        root.addHandler(console_handler)
+
+
+def log_message(message: str, key: str | None = None) -> None:
+    """BridgeLogic log callback, every message kept in log file (rate limit key unused)"""
+    logger.info(message)
+
+
+class BridgeStatus:
+    """Thread-safe bridge status, updated from BridgeLogic callbacks"""
+
+    __slots__ = (
+        "_lock",
+        "_text",
+        "_since",
+        "_started",
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._text = "STARTING"
+        self._since = time.time()
+        self._started = self._since
+
+    def set_status(self, text: str, color: str | None = None) -> None:
+        """BridgeLogic status callback, log status changes only"""
+        with self._lock:
+            if text == self._text:
+                return
+            self._text = text
+            self._since = time.time()
+        logger.info("status: %s", text)
+
+    def snapshot(self, logic: BridgeLogic | ProcessBridge | None = None) -> dict:
+        """Status as dict"""
+        now = time.time()
+        with self._lock:
+            output = {
+                "version": __version__,
+                "status": self._text,
+                "status_age": round(now - self._since, 1),
+                "uptime": round(now - self._started, 1),
+            }
+        if logic is not None:
+            output.update(logic.stats())
+        return output
+
+
+def start_status_server(host: str, port: int, status: BridgeStatus,
+                        logic: BridgeLogic | ProcessBridge) -> ThreadingHTTPServer:
+    """Serve status JSON on local HTTP endpoint in background thread"""
+
+    class StatusHandler(BaseHTTPRequestHandler):
+        """GET /status"""
+
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("", "/status"):
+                self.send_error(404)
+                return
+            body = json.dumps(status.snapshot(logic)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("status request: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), StatusHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="status_server", daemon=True).start()
+    logger.info("status endpoint: http://%s:%s/status", host, server.server_port)
+    return server
+
+
+def run(config: dict) -> int:
+    """Run bridge until SIGINT/SIGTERM, return exit code"""
+    if not (config["lineup"] and config["driver"] and config["password"]):
+        logger.error("lineup, driver and password are required")
+        return 2
+    stop_event = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_event.set())
+
+    status = BridgeStatus()
+    bridge_class = ProcessBridge if config["multiprocess"] else BridgeLogic
+    logic = bridge_class(log_message, status.set_status)
+    logic.debug_mode = config["debug"]
+    logic.max_rate = max(config["max_rate"], 0.1)
+    logic.record_file = config["record_file"]
+    logic.lan_host = config["lan_host"]
+    logic.lan_port = config["lan_port"]
+    logic.delta_mode = config["delta_mode"]
+    logic.binary_mode = config["binary_mode"]
+    if config["spool_dir"]:
+        logic.spool_dir = config["spool_dir"]
+    logic.upload_batch = max(config["upload_batch"], 1)
+    logic.upload_gzip = config["upload_gzip"]
+    server = None
+    if config["status_port"]:
+        server = start_status_server(config["status_host"], config["status_port"], status, logic)
+
+    try:
+        status.set_status("AUTHENTICATING")
+        while not logic.connect_vps(config["driver"], config["password"]):
+            status.set_status("AUTH FAILED")
+            if config["auth_retry_delay"] <= 0:
+                return 1
+            if stop_event.wait(config["auth_retry_delay"]):
+                return 0
+            status.set_status("AUTHENTICATING")
+        logic.start_loop(config["lineup"], config["driver"], config["password"], config["analysis"])
+        stop_event.wait()
+    finally:
+        logic.stop()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    return 0
+
+
+def main():
+    """Headless bridge command line"""
+    parser = argparse.ArgumentParser(description=f"LMU Bridge {__version__} (headless)")
+    parser.add_argument("--config", help="JSON config file")
+    parser.add_argument("--lineup", help="line up ID (team name)")
+    parser.add_argument("--driver", help="account pseudo")
+    parser.add_argument("--password", help=f"account password (prefer {ENV_PREFIX}PASSWORD)")
+    parser.add_argument("--analysis", action="store_true", default=None, help="record laps for analysis")
+    parser.add_argument("--debug", action="store_true", default=None, help="debug log")
+    parser.add_argument("--max-rate", dest="max_rate", type=float, help="max payloads per second")
+    parser.add_argument("--log-file", dest="log_file", help="log file path, empty to disable")
+    parser.add_argument("--status-host", dest="status_host", help="status endpoint host")
+    parser.add_argument("--status-port", dest="status_port", type=int, help="status endpoint port, 0 to disable")
+    parser.add_argument("--record-file", dest="record_file", help="record payloads to JSON lines file")
+    parser.add_argument("--lan-host", dest="lan_host", help="LAN broadcast host")
+    parser.add_argument("--lan-port", dest="lan_port", type=int, help="LAN broadcast port, 0 to disable")
+    parser.add_argument("--spool-dir", dest="spool_dir", help="analysis upload spool directory")
+    parser.add_argument("--upload-batch", dest="upload_batch", type=int,
+                        help="max consecutive laps per analysis upload")
+    parser.add_argument("--upload-gzip", dest="upload_gzip", action="store_true", default=None,
+                        help="gzip analysis upload body")
+    parser.add_argument("--delta-mode", dest="delta_mode", action="store_true", default=None,
+                        help="send payload deltas to VPS (telemetry_delta)")
+    parser.add_argument("--binary-mode", dest="binary_mode", action="store_true", default=None,
+                        help="send packed binary payload to VPS (telemetry_binary)")
+    parser.add_argument("--multiprocess", action="store_true", default=None,
+                        help="run acquisition & sender in separate processes")
+    parser.add_argument("--quiet", action="store_true", help="no console log")
+    args = parser.parse_args()
+    config = load_config(args)
+    setup_logging(config, args.quiet)
+    logger.info("LMU Bridge %s (headless)", __version__)
+    sys.exit(run(config))
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
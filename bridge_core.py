@@ -0,0 +1,561 @@
+"""
+Bridge core
+
+Headless part of the bridge (no GUI dependency): consumption tracker,
+lap telemetry recorder, per-vehicle stint tracker and payload builder.
+Usable from the GUI, a CLI-only bridge or the benchmark.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from time import perf_counter
+from typing import Callable
+
+from lap_samples import LapSampleStore, capacity_from_length
+from lap_uploader import LapUploader
+
+logger = logging.getLogger(__name__)
+
+
+def session_name(session_type: int) -> str:
+    """Session name from scoring session type"""
+    if 1 <= session_type <= 4:
+        return "PRACTICE"
+    if 5 <= session_type <= 8:
+        return "QUALIFY"
+    if session_type == 9:
+        return "WARMUP"
+    if session_type >= 10:
+        return "RACE"
+    return "TEST"
+
+
+def log_info(message: str, key: str | None = None) -> None:
+    """Default log callback, rate limit key unused"""
+    logger.info(message)
+
+
+# --- LOGIQUE MÉTIER ---
+
+class ConsumptionTracker:
+    def __init__(self, log_func):
+        self.log = log_func;
+        self.reset()
+
+    def reset(self):
+        self.last_lap = -1;
+        self.fuel_start = -1.0;
+        self.ve_start = -1.0
+        self.fuel_last = 0.0;
+        self.fuel_avg = 0.0;
+        self.fuel_samples = 0
+        self.ve_last = 0.0;
+        self.ve_avg = 0.0;
+        self.ve_samples = 0
+
+    def update(self, current_lap, current_fuel, current_ve, in_pits):
+        if self.last_lap == -1 or current_lap < self.last_lap:
+            self.last_lap = current_lap;
+            self.fuel_start = current_fuel;
+            self.ve_start = current_ve
+            return
+        if current_lap > self.last_lap:
+            fuel_delta = self.fuel_start - current_fuel
+            ve_delta = self.ve_start - current_ve
+            if not in_pits and fuel_delta > 0.01:
+                self.fuel_last = fuel_delta;
+                self.fuel_samples += 1
+                self.fuel_avg = self.fuel_avg + (fuel_delta - self.fuel_avg) / self.fuel_samples
+                self.log(f"🏁 Tour {self.last_lap} terminé | Conso: {fuel_delta:.2f}L")
+                if ve_delta > 0.01:
+                    self.ve_last = ve_delta;
+                    self.ve_samples += 1
+                    self.ve_avg = self.ve_avg + (ve_delta - self.ve_avg) / self.ve_samples
+            self.last_lap = current_lap;
+            self.fuel_start = current_fuel;
+            self.ve_start = current_ve
+
+    def get_stats(self):
+        return {"lastLapFuelConsumption": round(self.fuel_last, 2), "averageConsumptionFuel": round(self.fuel_avg, 2),
+                "lastLapVEConsumption": round(self.ve_last, 2), "averageConsumptionVE": round(self.ve_avg, 2)}
+
+
+LAP_TIME_TIMEOUT = 0.5  # secondes d'attente du temps au tour au scoring après la ligne
+
+
+class TelemetryRecorder:
+    def __init__(self, api_url, team_id, uploader=None):
+        self.api_url = api_url;
+        self.team_id = team_id;
+        # Worker d'envoi unique (file, spool disque, reprise), démarré au premier tour envoyé
+        self.uploader = uploader or LapUploader(api_url);
+        self.buffer = LapSampleStore();
+        self.current_lap = -1;
+        # Tour terminé en attente de son temps au scoring (échantillons dans pending_buffer)
+        self.pending_buffer = LapSampleStore();
+        self.pending_lap = -1;
+        self.pending_team_id = team_id;
+        self.pending_deadline = 0.0;
+        self.driver_name = "Unknown";
+        self.track_name = "Unknown";
+        self.last_dist = -1
+
+    def update(self, lap_number, vehicle_idx, telemetry, vehicle, scoring):
+        if self.current_lap != -1 and lap_number > self.current_lap:
+            # Fin de tour : finalisation différée, l'enregistrement continue dans l'autre buffer
+            if self.pending_lap != -1: self.finalize_pending(0)
+            self.buffer, self.pending_buffer = self.pending_buffer, self.buffer
+            self.pending_lap = self.current_lap;
+            self.pending_team_id = self.team_id;
+            self.pending_deadline = time.monotonic() + LAP_TIME_TIMEOUT
+            self.resize_buffer(scoring);
+            self.last_dist = -1
+        elif self.current_lap == -1:
+            self.resize_buffer(scoring)
+        if self.pending_lap != -1: self.check_pending(vehicle_idx, scoring)
+
+        self.current_lap = lap_number
+        dist = 0
+        if hasattr(telemetry, 'lap_distance'): dist = telemetry.lap_distance(vehicle_idx)
+        if (dist == 0 or dist is None) and hasattr(scoring, 'lap_distance'):
+            dist = scoring.lap_distance(vehicle_idx)
+
+        speed = vehicle.speed(vehicle_idx)
+        if speed > 1:
+            if self.last_dist == -1 or abs(dist - self.last_dist) > 2.0:
+                # Une lecture télémétrie par échantillon, ligne dans l'ordre SAMPLE_CHANNELS
+                fields = telemetry.lap_sample_fields(vehicle_idx)
+                inner = fields["tire_inner_layer_temp"]
+                row = [dist, speed, fields["throttle"] * 100, fields["brake"] * 100, fields["gear"],
+                       fields["unfiltered_throttle"] * 100, fields["unfiltered_brake"] * 100,
+                       fields["unfiltered_clutch"] * 100, fields["steering"], fields["fuel"], fields["rpm"],
+                       telemetry.virtual_energy(vehicle_idx), fields["tire_wear"][0],
+                       fields["drag"], fields["downforce_front"], fields["downforce_rear"]]
+                row += fields["suspension_deflection"];
+                row += fields["ride_height"];
+                row += fields["suspension_force"];
+                row += fields["brake_temp"];
+                row += fields["brake_pressure"];
+                row += fields["lateral_force"];
+                row += fields["longitudinal_force"];
+                row += fields["tire_load"];
+                row += fields["tire_carcass_temp"];
+                row += [(inner[i] + inner[i + 1] + inner[i + 2]) / 3.0 for i in (0, 3, 6, 9)]
+                self.buffer.append(row)
+                self.last_dist = dist
+
+    def check_pending(self, vehicle_idx, scoring):
+        # Temps du tour attendu au scoring sur les ticks suivants, sans bloquer la boucle
+        if not hasattr(scoring, 'get_vehicle_scoring'):
+            self.finalize_pending(0)
+            return
+        v_data = scoring.get_vehicle_scoring(vehicle_idx)
+        t_time = v_data.get('last_lap', 0)
+        if v_data.get('laps', -1) >= self.pending_lap and t_time > 0:
+            self.finalize_pending(t_time)
+        elif time.monotonic() >= self.pending_deadline:
+            self.finalize_pending(0)
+
+    def finalize_pending(self, lap_time):
+        samples, self.pending_buffer = self.pending_buffer, LapSampleStore(self.pending_buffer.capacity)
+        self.flush_lap(self.pending_lap, lap_time, samples, self.pending_team_id)
+        self.pending_lap = -1
+
+    def resize_buffer(self, scoring):
+        # Capacité selon la longueur de piste (réallouée seulement si elle change)
+        track_length = scoring.track_length() if hasattr(scoring, 'track_length') else 0
+        self.buffer.resize(capacity_from_length(track_length))
+
+    def flush_lap(self, lap_num, lap_time, samples=None, team_id=None):
+        # Échantillons cédés au worker d'envoi (conversion JSON hors boucle), ne plus les réutiliser
+        if samples is None: samples, self.buffer = self.buffer, LapSampleStore(self.buffer.capacity)
+        if len(samples) < 50: return
+        if samples.dropped: logger.debug("lap %s: %s samples dropped (buffer full)", lap_num, samples.dropped)
+        payload = {"sessionId": team_id or self.team_id, "lapNumber": lap_num, "driver": self.driver_name, "lapTime": lap_time}
+        self.uploader.submit(payload, samples)
+
+
+class StintTracker:
+    """Track pit stops & stint laps of all vehicles from scoring
+
+    The game pit stop counter is not always reliable,
+    pit entries are also counted from in_pits transitions.
+    """
+
+    __slots__ = (
+        "_vehicles",
+    )
+
+    def __init__(self) -> None:
+        self._vehicles: dict[int, list] = {}
+
+    def reset(self) -> None:
+        """Reset all vehicles (new session or game reconnect)"""
+        self._vehicles.clear()
+
+    def update(self, vehicles: list[dict]) -> list[dict]:
+        """Update from vehicle dicts, set stint_laps & pit_stops in place"""
+        trackers = self._vehicles
+        for veh in vehicles:
+            vid = veh.get("id")
+            in_pits = veh.get("in_pits") == 1
+            laps = veh.get("laps", 0)
+            pit_stops = veh.get("pit_stops", 0)
+            # 0 - last pit lap, 1 - was in pits, 2 - pit count
+            tracker = trackers.get(vid)
+            if tracker is None:
+                tracker = trackers[vid] = [laps if laps > 0 else 0, in_pits, pit_stops]
+            if not tracker[1] and in_pits:
+                tracker[2] += 1
+            if tracker[1] and not in_pits:
+                tracker[0] = laps
+            tracker[1] = in_pits
+            if pit_stops > tracker[2]:
+                tracker[2] = pit_stops
+            if tracker[0] > laps:
+                tracker[0] = 0
+            veh["stint_laps"] = max(0, laps - tracker[0])
+            veh["pit_stops"] = tracker[2]
+        return vehicles
+
+
+class PayloadFrame:
+    """Shared state of one payload build, passed to each section
+
+    Attributes:
+        idx: player vehicle index.
+        session_type: scoring session type.
+        session_name: session name (see session_name).
+        payload: output payload.
+        scor_veh: player vehicle scoring dict.
+        vehicles: all vehicle dicts.
+        time_info: session time info.
+        position: player class position.
+        leader_laps: overall leader laps.
+        leader_avg: overall leader average lap time.
+    """
+
+    __slots__ = (
+        "idx",
+        "session_type",
+        "session_name",
+        "payload",
+        "scor_veh",
+        "vehicles",
+        "time_info",
+        "position",
+        "leader_laps",
+        "leader_avg",
+    )
+
+    def __init__(self, idx: int, session_type: int) -> None:
+        self.idx = idx
+        self.session_type = session_type
+        self.session_name = session_name(session_type)
+        self.payload: dict = {}
+        self.scor_veh: dict = {}
+        self.vehicles: list[dict] = []
+        self.time_info: dict = {}
+        self.position = 0
+        self.leader_laps = 0
+        self.leader_avg = 0.0
+
+
+class PayloadBuilder:
+    """Build telemetry payload from data adapters
+
+    Payload is built by sections in order, each section is a callable
+    that takes PayloadFrame and fills frame.payload (or shared frame state
+    for later sections). Sections can be added, replaced or removed.
+    Time spent in each section is recorded if profile is enabled.
+
+    Args:
+        telemetry, scoring, rules, extended, pit_info, weather, vehicle: rf2_data adapters.
+        pit_strategy: PitStrategyData, optional.
+        tracker: ConsumptionTracker, optional.
+        team_id: team ID.
+        driver_id: active driver ID (bridge user).
+        profile: record per-section timing.
+        log: log function for debug messages (message, rate limit key=None).
+    """
+
+    __slots__ = (
+        "telemetry",
+        "scoring",
+        "rules",
+        "extended",
+        "pit_info",
+        "weather",
+        "vehicle",
+        "pit_strategy",
+        "tracker",
+        "stints",
+        "team_id",
+        "driver_id",
+        "debug",
+        "profile",
+        "log",
+        "_sections",
+        "_timing",
+        "_builds",
+    )
+
+    def __init__(
+        self,
+        telemetry,
+        scoring,
+        rules,
+        extended,
+        pit_info,
+        weather,
+        vehicle,
+        pit_strategy=None,
+        tracker: ConsumptionTracker | None = None,
+        team_id: str = "",
+        driver_id: str = "",
+        profile: bool = True,
+        log: Callable[..., None] = log_info,
+    ) -> None:
+        self.telemetry = telemetry
+        self.scoring = scoring
+        self.rules = rules
+        self.extended = extended
+        self.pit_info = pit_info
+        self.weather = weather
+        self.vehicle = vehicle
+        self.pit_strategy = pit_strategy
+        self.tracker = tracker
+        self.stints = StintTracker()
+        self.team_id = team_id
+        self.driver_id = driver_id
+        self.debug = False
+        self.profile = profile
+        self.log = log
+        self._sections: list[tuple[str, Callable[[PayloadFrame], None]]] = [
+            ("player", self._section_player),
+            ("standings", self._section_standings),
+            ("header", self._section_header),
+            ("forecast", self._section_forecast),
+            ("telemetry", self._section_telemetry),
+            ("scoring", self._section_scoring),
+            ("rules", self._section_rules),
+            ("pit", self._section_pit),
+            ("weather", self._section_weather),
+            ("extended", self._section_extended),
+        ]
+        # name: [calls, total time, last time, max time]
+        self._timing: dict[str, list] = {}
+        self._builds = 0
+
+    @property
+    def sections(self) -> tuple[str, ...]:
+        """Section names in build order"""
+        return tuple(name for name, _ in self._sections)
+
+    def set_section(self, name: str, func: Callable[[PayloadFrame], None], before: str | None = None) -> None:
+        """Add or replace section
+
+        Args:
+            name: section name, replaced in place if exists.
+            func: section function, takes PayloadFrame.
+            before: insert new section before this section, append if None.
+        """
+        names = self.sections
+        if name in names:
+            self._sections[names.index(name)] = (name, func)
+        elif before in names:
+            self._sections.insert(names.index(before), (name, func))
+        else:
+            self._sections.append((name, func))
+
+    def remove_section(self, name: str) -> None:
+        """Remove section"""
+        self._sections = [section for section in self._sections if section[0] != name]
+        self._timing.pop(name, None)
+
+    def build(self, idx: int, session_type: int = 0) -> dict:
+        """Build payload for player vehicle index"""
+        frame = PayloadFrame(idx, session_type)
+        if not self.profile:
+            for _, func in self._sections:
+                func(frame)
+            return frame.payload
+        timing = self._timing
+        for name, func in self._sections:
+            start = perf_counter()
+            func(frame)
+            elapsed = perf_counter() - start
+            record = timing.get(name)
+            if record is None:
+                timing[name] = [1, elapsed, elapsed, elapsed]
+                continue
+            record[0] += 1
+            record[1] += elapsed
+            record[2] = elapsed
+            if elapsed > record[3]:
+                record[3] = elapsed
+        self._builds += 1
+        return frame.payload
+
+    def stats(self) -> dict:
+        """Per-section timing stats (microseconds)"""
+        sections = {}
+        for name, (calls, total, last, peak) in self._timing.items():
+            sections[name] = {
+                "calls": calls,
+                "avg_us": round(total / calls * 1e6, 3),
+                "last_us": round(last * 1e6, 3),
+                "max_us": round(peak * 1e6, 3),
+            }
+        return {
+            "builds": self._builds,
+            "total_avg_us": round(sum(item["avg_us"] for item in sections.values()), 3),
+            "sections": sections,
+        }
+
+    def reset_stats(self) -> None:
+        """Reset timing stats"""
+        self._timing.clear()
+        self._builds = 0
+
+    # Sections
+    def _section_player(self, frame: PayloadFrame) -> None:
+        """Player scoring & consumption"""
+        idx = frame.idx
+        frame.scor_veh = self.scoring.get_vehicle_scoring(idx)
+        if self.tracker is not None:
+            telemetry = self.telemetry
+            self.tracker.update(
+                telemetry.lap_number(idx), telemetry.fuel_level(idx),
+                telemetry.virtual_energy(idx), frame.scor_veh.get("in_pits", 0) == 1)
+
+    def _section_standings(self, frame: PayloadFrame) -> None:
+        """All vehicles, leader & class position"""
+        try:
+            frame.vehicles = self.stints.update(self.scoring.vehicles_scoring())
+        except Exception as error:
+            logger.debug("vehicles scoring failed: %s", error)
+            frame.vehicles = []
+        vehicles = frame.vehicles
+        scor_veh = frame.scor_veh
+        leader = next((veh for veh in vehicles if veh["position"] == 1), None)
+        frame.leader_laps = leader_laps = leader["laps"] if leader else 0
+        time_info = frame.time_info = self.scoring.time_info()
+        time_info["session"] = frame.session_name
+        elapsed = time_info.get("current", 0)
+        frame.leader_avg = elapsed / leader_laps if leader_laps > 0 and elapsed > 0 else 0
+        position = scor_veh.get("position", 0)
+        player_class = scor_veh.get("class", "")
+        player_id = scor_veh.get("id")
+        class_vehicles = sorted(
+            (veh for veh in vehicles if veh.get("class") == player_class),
+            key=lambda veh: veh.get("position", 999))
+        for index, veh in enumerate(class_vehicles, 1):
+            if veh["id"] == player_id:
+                position = index
+                break
+        frame.position = scor_veh["classPosition"] = position
+
+    def _section_header(self, frame: PayloadFrame) -> None:
+        """Team, driver, consumption & remaining time"""
+        payload = frame.payload
+        payload["teamId"] = self.team_id
+        payload["driverName"] = frame.scor_veh.get("driver", "")
+        payload["activeDriverId"] = self.driver_id
+        if self.tracker is not None:
+            payload.update(self.tracker.get_stats())
+        time_info = frame.time_info
+        payload["sessionTimeRemainingSeconds"] = max(0, time_info.get("end", 0) - time_info.get("current", 0))
+
+    def _section_forecast(self, frame: PayloadFrame) -> None:
+        """Weather forecast of current session type"""
+        forecast_data = []
+        try:
+            if hasattr(self.weather, "forecast"):
+                raw_forecast = self.weather.forecast()
+                if frame.session_type < 5:
+                    key = "practice"
+                elif frame.session_type < 9:
+                    key = "qualify"
+                else:
+                    key = "race"
+                if self.debug and not raw_forecast:
+                    self.log("⚠️ Météo vide. Vérifiez l'API REST.", "weather_empty")
+                for node in raw_forecast.get(key, []):
+                    forecast_data.append({
+                        "rain": float(node.get("rain_chance", 0.0)) / 100.0,
+                        "cloud": min(max(float(node.get("sky", 0)), 0) / 4.0, 1.0),
+                        "temp": float(node.get("temp", 0.0)),
+                    })
+        except Exception as error:
+            if self.debug:
+                self.log(f"Erreur Météo: {error}", "weather_error")
+        frame.payload["weatherForecast"] = forecast_data
+
+    def _section_telemetry(self, frame: PayloadFrame) -> None:
+        """Player telemetry, telemetry fields read in one pass"""
+        idx = frame.idx
+        telemetry = self.telemetry
+        fields = telemetry.fields(idx)
+        front = fields["compound_front"]
+        rear = fields["compound_rear"]
+        frame.payload["telemetry"] = {
+            "gear": fields["gear"], "rpm": fields["rpm"],
+            "speed": (fields["vel_x"] ** 2 + fields["vel_y"] ** 2 + fields["vel_z"] ** 2) ** 0.5 * 3.6,
+            "maxRpm": fields["rpm_max"],
+            "fuel": fields["fuel"], "fuelCapacity": fields["fuel_capacity"],
+            "inputs": {"thr": fields["throttle"], "brk": fields["brake"],
+                       "clt": fields["clutch"], "str": fields["steering"]},
+            "temps": {"oil": fields["temp_oil"], "water": fields["temp_water"]},
+            "tires": {"temp": {"fl": fields["tire_temp_fl"], "fr": fields["tire_temp_fr"],
+                               "rl": fields["tire_temp_rl"], "rr": fields["tire_temp_rr"]},
+                      "press": fields["tire_pressure"],
+                      "wear": fields["tire_wear"], "brake_wear": telemetry.brake_wear(idx),
+                      "type": fields["surface_type"], "brake_temp": fields["brake_temp"],
+                      "compounds": {"fl": front, "fr": front, "rl": rear, "rr": rear}},
+            "electric": {"charge": telemetry.battery_charge(idx), "torque": fields["motor_torque"],
+                         "rpm": fields["motor_rpm"], "temp_motor": fields["motor_temp"],
+                         "temp_water": fields["motor_water_temp"], "state": fields["motor_state"]},
+            "virtual_energy": telemetry.virtual_energy(idx),
+            "max_virtual_energy": 100.0,
+            "leaderLaps": frame.leader_laps, "leaderAvgLapTime": frame.leader_avg,
+            "position": frame.position,
+            "lastLap": fields["id"],
+        }
+
+    def _section_scoring(self, frame: PayloadFrame) -> None:
+        """Session scoring"""
+        scoring = self.scoring
+        frame.payload["scoring"] = {
+            "track": scoring.track_name(), "time": frame.time_info, "flags": scoring.flag_state(),
+            "weather": scoring.weather_env(), "vehicles": frame.vehicles,
+            "vehicle_data": frame.scor_veh, "length": scoring.track_length(),
+        }
+
+    def _section_rules(self, frame: PayloadFrame) -> None:
+        """Safety car, yellow flag & player status"""
+        rules = self.rules
+        frame.payload["rules"] = {
+            "sc": rules.sc_info(), "yellow": rules.yellow_flag(),
+            "my_status": rules.participant_status(frame.idx),
+        }
+
+    def _section_pit(self, frame: PayloadFrame) -> None:
+        """Pit menu & strategy estimate"""
+        frame.payload["pit"] = {
+            "menu": self.pit_info.menu_status(),
+            "strategy": self.pit_strategy.pit_estimate() if self.pit_strategy is not None else {},
+        }
+
+    def _section_weather(self, frame: PayloadFrame) -> None:
+        """Weather details"""
+        frame.payload["weather_det"] = self.weather.info()
+
+    def _section_extended(self, frame: PayloadFrame) -> None:
+        """Physics options & pit limit"""
+        extended = self.extended
+        frame.payload["extended"] = {
+            "physics": extended.physics_options(), "pit_limit": extended.pit_limit(),
+        }
@@ -0,0 +1,335 @@
+"""
+Bridge logic
+
+Game connection & payload send loop, without GUI dependency
+(used by the GUI in bridge.py and by the headless bridge_cli.py).
+Status callback receives a text and a display color from COLORS.
+"""
+
+import os
+import sys
+import threading
+import time
+
+from adapter.rf2_connector import RF2Info
+from adapter.restapi_connector import RestAPIInfo
+from adapter.rf2_text import text_cache
+from adapter.rf2_data import (
+    TelemetryData, ScoringData, RulesData, ExtendedData,
+    PitInfoData, WeatherData, PitStrategyData, Vehicle
+)
+from adapter.socket_connector import SocketConnector
+from frame_sinks import FramePublisher, SocketSink, FileSink
+from lan_server import LanServer
+from bridge_core import ConsumptionTracker, TelemetryRecorder, PayloadBuilder, session_name
+from lap_uploader import LapUploader
+
+COLORS = {
+    "bg": "#0B0F19",
+    "card": "#151B2B",
+    "accent": "#6366F1",
+    "accent_hover": "#4F46E5",
+    "success": "#10B981",
+    "danger": "#EF4444",
+    "warning": "#F59E0B",
+    "debug": "#A855F7",
+    "text": "#F8FAFC",
+    "text_dim": "#64748B"
+}
+
+VPS_URL = "https://api.racetelemetrybyfbt.com"
+
+
+def app_dir():
+    # Exe onefile : __file__ pointe dans le dossier temporaire d'extraction, supprimé à la fermeture
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+SPOOL_DIR = os.path.join(app_dir(), "spool")  # tours d'analyse en attente d'envoi (conservés au redémarrage)
+
+
+def normalize_id(name):
+    import re
+    safe = re.sub(r'[^a-zA-Z0-9]+', '-', name).strip('-').lower()
+    return safe
+
+
+class MockParentAPI:
+    def __init__(self):
+        self.identifier = "LMU"
+        self.isActive = True
+
+
+# --- LOGIQUE MÉTIER ---
+
+class BridgeLogic:
+    def __init__(self, log_callback, status_callback):
+        self.log = log_callback;
+        self.set_status = status_callback
+        self.running = False;
+        self.debug_mode = False;
+        self.connector = None;
+        self.rf2_info = None;
+        self.rest_info = None;
+        self.pit_strategy = None;
+        self.builder = None;
+        self.thread = None;
+        self.line_up_name = "";
+        self.team_id = "";
+        self.driver_pseudo = "";
+        self.password = ""
+        self.tracker = ConsumptionTracker(self.log);
+        self.session_id = 0;
+        self.recorder = None;
+        self.analysis_enabled = False
+        self.spool_dir = SPOOL_DIR
+        self.uploader = None  # créé au premier démarrage (réglages appliqués)
+        self.max_rate = 20.0  # Hz, payload max par seconde
+        self.publisher = FramePublisher()  # payload sérialisé une fois, envoyé à chaque sink
+        self.record_file = ""  # enregistrement local des payloads (JSON lines), vide = désactivé
+        self.lan_host = "0.0.0.0"
+        self.lan_port = 0  # diffusion locale (pit wall, websocket/TCP), 0 = désactivé
+        self.delta_mode = False  # envoi VPS en delta (keyframe périodique + chemins modifiés)
+        self.binary_mode = False  # envoi VPS au format binaire packé (prioritaire sur le delta)
+        self.upload_batch = 1  # tours consécutifs max par requête d'analyse (tableau JSON si > 1)
+        self.upload_gzip = False  # corps des requêtes d'analyse compressé (Content-Encoding: gzip)
+
+    def set_debug(self, enabled):
+        self.debug_mode = enabled
+        if self.builder: self.builder.debug = enabled
+        self.log(f"🔧 Mode Debug : {'ACTIVÉ' if enabled else 'DÉSACTIVÉ'}")
+
+    def connect_vps(self, username, password):
+        if self.connector: self.connector.disconnect()
+        try:
+            self.connector = SocketConnector(VPS_URL, port=None, username=username, password=password,
+                                             delta_mode=self.delta_mode, binary_mode=self.binary_mode)
+            self.connector.connect()
+            time.sleep(2)
+            if self.connector.is_connected:
+                return True
+            else:
+                self.log("❌ Échec Authentification (Check Logs)")
+                return False
+        except Exception as e:
+            self.log(f"❌ Erreur VPS: {e}")
+            return False
+
+    def start_loop(self, line_up_name, driver_pseudo, password, analysis_enabled):
+        self.session_id += 1;
+        current_session_id = self.session_id
+        self.line_up_name = line_up_name;
+        self.team_id = normalize_id(line_up_name);
+        self.driver_pseudo = driver_pseudo
+        self.password = password
+        self.analysis_enabled = analysis_enabled;
+        self.running = True;
+        self.tracker.reset()
+
+        self.log(f"📊 Analyse : {'ON' if analysis_enabled else 'OFF'}")
+        if self.uploader is None:
+            self.uploader = LapUploader(VPS_URL, spool_dir=self.spool_dir, max_batch=self.upload_batch,
+                                        compress=self.upload_gzip)
+        self.uploader.start()  # envoie les tours restés dans le spool sans attendre le prochain tour
+        if self.connector:  # sinks retirés par stop(), ré-ajoutés à chaque démarrage
+            self.publisher.add(SocketSink(self.connector))
+        if self.record_file:
+            self.publisher.add(FileSink(self.record_file))
+            self.log(f"💾 Enregistrement local : {self.record_file}")
+        if self.lan_port:
+            try:
+                lan_server = LanServer(self.lan_host, self.lan_port)
+                self.publisher.add(lan_server)
+                self.log(f"📡 Diffusion LAN : port {lan_server.port}")
+            except OSError as e:
+                self.log(f"❌ Diffusion LAN impossible : {e}")
+        self.thread = threading.Thread(target=self._run, args=(current_session_id,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False;
+        self.session_id += 1
+        try:
+            if self.rf2_info: self.rf2_info.stop()
+            if self.rest_info: self.rest_info.stop()
+            if self.pit_strategy: self.pit_strategy.stop()
+            self.publisher.stop()
+            if self.connector: self.connector.disconnect()
+            if self.uploader: self.uploader.stop()  # tours non envoyés conservés dans le spool
+        except:
+            pass
+        self.rf2_info = None;
+        self.rest_info = None;
+        self.pit_strategy = None;
+        self.thread = None
+        self.set_status("OFFLINE", COLORS["text_dim"])
+        self.log("⏹️ Bridge arrêté.")
+
+    def stats(self):
+        output = {"running": self.running}
+        rf2_info = self.rf2_info
+        output["game_connected"] = rf2_info is not None
+        if rf2_info is not None:
+            output["mmap"] = rf2_info.mmapStats()
+            output["text_cache"] = text_cache.stats()
+        connector = self.connector
+        output["server_connected"] = bool(connector and connector.is_connected)
+        if self.builder is not None:
+            output["payload"] = self.builder.stats()
+        if self.uploader is not None:
+            output["lap_uploads"] = self.uploader.stats()
+        output["sinks"] = self.publisher.stats()
+        return output
+
+    def _run(self, my_session_id):
+        self.log("🚀 En attente du jeu...");
+        self.set_status("WAITING GAME...", COLORS["warning"])
+        pit_strategy = self.pit_strategy = PitStrategyData(port=6397)
+        mock_parent = MockParentAPI();
+        self.rest_info = RestAPIInfo(mock_parent)
+
+        # CONFIGURATION RESTAPI COMPLÈTE
+        self.rest_info.setConnection({
+            "url_host": "localhost",
+            "url_port_lmu": 6397,
+            "connection_timeout": 1.0,
+            "connection_retry": 3,
+            "connection_retry_delay": 2,
+            "restapi_update_interval": 50,  # Intervalle requis
+            "enable_restapi_access": True,
+            "enable_weather_info": True,
+            "enable_session_info": True,
+            "enable_garage_setup_info": True,
+            "enable_vehicle_info": True,
+            "enable_energy_remaining": True
+        })
+
+        telemetry = scoring = vehicle_helper = builder = None
+        last_game_check = 0;
+        last_update_time = 0.0;
+        data_version = 0
+        last_session_type = -1
+        current_history_id = f"{self.team_id}_WAITING";
+        self.recorder = TelemetryRecorder(VPS_URL, current_history_id, self.uploader)
+
+        while self.running:
+            if self.session_id != my_session_id: break
+            current_time = time.time()
+
+            if self.rf2_info is None:
+                if not self.running: break
+                if current_time - last_game_check > 5.0:
+                    try:
+                        self.rf2_info = RF2Info();
+                        self.rf2_info.setSparseTelemetry(True)  # seule la télémétrie du joueur est lue
+                        self.rf2_info.start();
+                        self.rest_info.start()
+                        pit_strategy.start()
+                        self.log("🎮 Jeu connecté !");
+                        self.set_status("CONNECTED", COLORS["success"])
+
+                        # INSTANCIATION DES MODULES
+                        telemetry = TelemetryData(self.rf2_info, self.rest_info);
+                        scoring = ScoringData(self.rf2_info)
+                        rules = RulesData(self.rf2_info);
+                        extended = ExtendedData(self.rf2_info);
+                        pit_info = PitInfoData(self.rf2_info);
+
+                        # === CORRECTION MÉTÉO ICI ===
+                        # On passe bien self.rest_info pour que weather.forecast() fonctionne
+                        weather = WeatherData(self.rf2_info, self.rest_info);
+                        # ============================
+
+                        vehicle_helper = Vehicle(self.rf2_info);
+                        self.tracker.reset();
+                        data_version = 0
+                        builder = self.builder = PayloadBuilder(
+                            telemetry, scoring, rules, extended, pit_info, weather, vehicle_helper,
+                            pit_strategy=pit_strategy, tracker=self.tracker,
+                            team_id=self.team_id, driver_id=self.driver_pseudo, log=self.log)
+                        builder.debug = self.debug_mode
+                    except:
+                        self.rf2_info = None
+                    last_game_check = current_time
+                time.sleep(0.1);
+                continue
+
+            try:
+                if not self.running: break
+                # ATTENTE DE NOUVELLES DONNÉES (version mmap), limitée à max_rate
+                remaining = last_update_time + 1.0 / self.max_rate - time.monotonic()
+                if remaining > 0: time.sleep(remaining)
+                new_version = self.rf2_info.waitData(data_version, 0.5)
+                if new_version == data_version: continue
+                data_version = new_version
+
+                status = vehicle_helper.get_local_driver_status()
+                current_sess_name = "TEST";
+                current_sess_type = 0
+
+                if self.rf2_info and scoring:
+                    try:
+                        current_sess_type = scoring.session_type()
+                        current_sess_name = session_name(current_sess_type)
+
+                        if current_sess_type != last_session_type:
+                            current_history_id = f"{self.team_id}_{current_sess_name}_{int(time.time())}"
+                            self.log(f"🏁 Session : {current_sess_name}")
+                            if self.recorder: self.recorder.team_id = current_history_id
+                            builder.stints.reset()
+                            if self.analysis_enabled:
+                                # Envoi asynchrone, dans la même file que les tours (début de session avant ses tours)
+                                self.uploader.submit_event("/api/sessions/start",
+                                                           {"sessionId": current_history_id,
+                                                            "driver": status.get('driver_name', self.driver_pseudo),
+                                                            "circuit": scoring.track_name() if scoring else "Unknown"})
+                            last_session_type = current_sess_type
+                    except:
+                        pass
+
+                if self.rf2_info and scoring:
+                    self.recorder.driver_name = status.get('driver_name', 'Unknown')
+                    self.recorder.track_name = scoring.track_name() if scoring else "Unknown"
+
+                if status['is_driving']:
+                    idx = status['vehicle_index'];
+                    game_driver = status['driver_name']
+                    curr_lap = telemetry.lap_number(idx)
+                    try:
+                        if self.analysis_enabled: self.recorder.update(curr_lap, idx, telemetry, vehicle_helper,
+                                                                       scoring)
+                    except Exception as e:
+                        self.log(f"ERREUR RECORDER: {e}", "recorder_error")
+
+                    payload = builder.build(idx, current_sess_type)
+                    my_pos = payload["telemetry"]["position"]
+                    temps = payload["telemetry"]["temps"];
+                    oil_t = temps["oil"];
+                    water_t = temps["water"]
+
+                    if self.running and self.session_id == my_session_id:
+                        self.publisher.publish(payload)
+                        last_update_time = time.monotonic()
+                        self.set_status(f"LIVE | POS: P{my_pos} | DRIVER: {game_driver}", COLORS["accent"])
+                        if self.debug_mode and (oil_t == 0 or water_t == 0):
+                            # On loggue une fois toutes les 5 secondes pour ne pas spammer
+                            if int(time.time()) % 5 == 0:
+                                self.log(f"🔍 DEBUG TEMP: Huile={oil_t}, Eau={water_t}, RPM={telemetry.rpm(idx)}", "debug_temp")
+                else:
+                    self.set_status("EN ATTENTE (PIT / SPECTATE)", COLORS["text_dim"]);
+                    time.sleep(0.5)
+
+            except Exception as e:
+                if self.running and self.session_id == my_session_id:
+                    self.log(f"⚠️ Erreur: {e}", "loop_error");
+                    time.sleep(1.0)
+                    try:
+                        if self.rf2_info: self.rf2_info.stop()
+                    except:
+                        pass
+                    self.rf2_info = None;
+                    self.set_status("RECONNECTING...", COLORS["warning"])
+                else:
+                    break
@@ -0,0 +1,298 @@
+"""
+Process bridge
+
+Optional multi-process topology, same interface as BridgeLogic
+(connect_vps, start_loop, stop, set_debug, stats):
+
+    acquisition process: BridgeLogic loop (RF2Info, adapters, payload builder,
+        lap recorder & uploader), payloads published as JSON frames to a FrameRing (RingSink).
+    sender process: SocketConnector, sends latest ring frame to the VPS.
+    main process (GUI / CLI): log & status events from both processes.
+
+Each process has its own GIL, payload builds no longer stall the Tk loop.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+
+from bridge_logic import BridgeLogic, COLORS, SPOOL_DIR, VPS_URL
+from frame_ring import FrameRing
+from pyRfactor2SharedMemory.rF2MMap import MAX_VEHICLES
+from frame_sinks import DROP_OLDEST, Frame, FrameSink
+
+logger = logging.getLogger(__name__)
+
+STATS_INTERVAL = 2.0  # seconds between child stats events
+AUTH_TIMEOUT = 20.0
+JOIN_TIMEOUT = 5.0
+
+# Ring slot sized for worst case JSON frame: all vehicles with names
+# (driver 32, vehicle 64, class 32, pit group 24 bytes) at max length
+# and every character escaped by json (\uXXXX, 6 bytes)
+VEHICLE_NAME_BYTES = 32 + 64 + 32 + 24
+VEHICLE_FRAME_BYTES = VEHICLE_NAME_BYTES * 6 + 512  # names, keys & numbers
+FRAME_BASE_BYTES = 32 * 1024  # telemetry, weather, forecast, rules...
+MAX_FRAME_SIZE = FRAME_BASE_BYTES + MAX_VEHICLES * VEHICLE_FRAME_BYTES
+RING_SLOT_SIZE = -(-MAX_FRAME_SIZE // 65536) * 65536  # 64KB multiple
+
+
+class RingSink(FrameSink):
+    """Publish JSON frames to frame ring
+
+    Args:
+        log: log callback, frame rejected for size is reported once.
+    """
+
+    needs_data = True
+
+    def __init__(self, ring: FrameRing, name: str = "ring", max_queue: int = 4, drop: str = DROP_OLDEST,
+                 log=logger.warning) -> None:
+        super().__init__(name, max_queue, drop)
+        self.ring = ring
+        self.log = log
+
+    def deliver(self, frame: Frame) -> None:
+        if not self.ring.write(frame.data) and self.ring.oversize == 1:
+            self.log(f"❌ Payload trop gros pour l'envoi ({len(frame.data)} > {self.ring.slot_size} octets), "
+                     "frames ignorées")
+
+    def stats(self) -> dict:
+        output = super().stats()
+        output["written"] = self.ring.written
+        output["oversize"] = self.ring.oversize
+        return output
+
+
+class EventForwarder:
+    """Forward BridgeLogic log & status callbacks to main process event queue"""
+
+    __slots__ = (
+        "events",
+        "_last_status",
+    )
+
+    def __init__(self, events) -> None:
+        self.events = events
+        self._last_status = None
+
+    def log(self, msg: str, key: str | None = None) -> None:
+        """Log callback"""
+        self.events.put(("log", msg, key))
+
+    def set_status(self, text: str, color: str) -> None:
+        """Status callback, forward changes only (called on every loop)"""
+        status = (text, color)
+        if status != self._last_status:
+            self._last_status = status
+            self.events.put(("status", text, color))
+
+
+def acquisition_main(ring_name: str, events, control, stop, options: dict) -> None:
+    """Acquisition process: run BridgeLogic loop, payloads to frame ring"""
+    ring = FrameRing(name=ring_name)
+    forwarder = EventForwarder(events)
+    logic = BridgeLogic(forwarder.log, forwarder.set_status)
+    logic.publisher.add(RingSink(ring, log=logic.log))
+    logic.debug_mode = options["debug"]
+    logic.max_rate = options["max_rate"]
+    logic.record_file = options["record_file"]
+    logic.lan_host = options["lan_host"]
+    logic.lan_port = options["lan_port"]
+    logic.spool_dir = options["spool_dir"]
+    logic.upload_batch = options["upload_batch"]
+    logic.upload_gzip = options["upload_gzip"]
+    logic.start_loop(options["line_up_name"], options["driver_pseudo"], options["password"],
+                     options["analysis_enabled"])
+    try:
+        next_stats = 0.0
+        while not stop.is_set():
+            try:
+                name, *args = control.get(timeout=0.2)
+                if name == "debug":
+                    logic.set_debug(*args)
+            except queue.Empty:
+                pass
+            if time.monotonic() >= next_stats:
+                events.put(("stats", "acquisition", logic.stats()))
+                next_stats = time.monotonic() + STATS_INTERVAL
+    finally:
+        logic.stop()
+        ring.close()
+
+
+def sender_main(ring_name: str, events, stop, options: dict) -> None:
+    """Sender process: authenticate, then send latest ring frame to VPS"""
+    from adapter.socket_connector import SocketConnector
+
+    connector = SocketConnector(options["url"], port=None, username=options["username"],
+                                password=options["password"], delta_mode=options["delta_mode"],
+                                binary_mode=options["binary_mode"])
+    connector.connect()
+    time.sleep(2)
+    events.put(("auth", connector.is_connected))
+    if not connector.is_connected:
+        connector.disconnect()
+        return
+    ring = FrameRing(name=ring_name)
+    reader = ring.reader()
+    try:
+        next_stats = 0.0
+        while not stop.is_set():
+            # Latest frame only, stale frames are not worth sending
+            frame = reader.wait(0.2, latest=True)
+            if frame is not None:
+                if connector.sends_json:  # frame JSON sent as is, no decode
+                    connector.send_data(None, frame)
+                else:
+                    connector.send_data(json.loads(frame))
+            if time.monotonic() >= next_stats:
+                events.put(("stats", "sender", {
+                    "server_connected": connector.is_connected,
+                    "ring_reader": reader.stats(),
+                }))
+                next_stats = time.monotonic() + STATS_INTERVAL
+    finally:
+        connector.disconnect()
+        ring.close()
+
+
+class ProcessBridge:
+    """Run bridge in acquisition & sender processes, BridgeLogic interface"""
+
+    def __init__(self, log_callback, status_callback):
+        self.log = log_callback
+        self.set_status = status_callback
+        self.running = False
+        self.debug_mode = False
+        self.max_rate = 20.0  # Hz, payload max par seconde
+        self.record_file = ""
+        self.lan_host = "0.0.0.0"
+        self.lan_port = 0
+        self.delta_mode = False
+        self.binary_mode = False
+        self.spool_dir = SPOOL_DIR
+        self.upload_batch = 1
+        self.upload_gzip = False
+        self.ring = None
+        self._context = multiprocessing.get_context("spawn")
+        self._events = self._context.Queue()
+        self._control = self._context.Queue()
+        self._stop = None
+        self._acquisition = None
+        self._sender = None
+        self._auth = queue.Queue()
+        self._stats = {}
+        self._pump = threading.Thread(target=self._pump_events, name="bridge_events", daemon=True)
+        self._pump.start()
+
+    def _pump_events(self):
+        """Dispatch child process events to callbacks"""
+        while True:
+            event = self._events.get()
+            kind = event[0]
+            try:
+                if kind == "log":
+                    self.log(event[1], event[2])
+                elif kind == "status":
+                    self.set_status(event[1], event[2])
+                elif kind == "stats":
+                    self._stats[event[1]] = event[2]
+                elif kind == "auth":
+                    self._auth.put(event[1])
+            except Exception:
+                logger.exception("bridge event: %s", kind)
+
+    def set_debug(self, enabled):
+        self.debug_mode = enabled
+        if self._acquisition is not None and self._acquisition.is_alive():
+            self._control.put(("debug", enabled))
+        else:
+            self.log(f"🔧 Mode Debug : {'ACTIVÉ' if enabled else 'DÉSACTIVÉ'}")
+
+    def connect_vps(self, username, password):
+        self._stop_processes()
+        self.ring = FrameRing(slot_size=RING_SLOT_SIZE)
+        self._stop = self._context.Event()
+        while not self._auth.empty():
+            self._auth.get_nowait()
+        self._sender = self._context.Process(
+            target=sender_main, name="bridge_sender", daemon=True,
+            args=(self.ring.name, self._events, self._stop,
+                  {"url": VPS_URL, "username": username, "password": password,
+                   "delta_mode": self.delta_mode, "binary_mode": self.binary_mode}))
+        self._sender.start()
+        try:
+            if self._auth.get(timeout=AUTH_TIMEOUT):
+                return True
+        except queue.Empty:
+            pass
+        self.log("❌ Échec Authentification (Check Logs)")
+        self._stop_processes()
+        return False
+
+    def start_loop(self, line_up_name, driver_pseudo, password, analysis_enabled):
+        if self.ring is None:
+            self.log("❌ Connexion VPS requise")
+            return
+        self.running = True
+        self._acquisition = self._context.Process(
+            target=acquisition_main, name="bridge_acquisition", daemon=True,
+            args=(self.ring.name, self._events, self._control, self._stop, {
+                "line_up_name": line_up_name,
+                "driver_pseudo": driver_pseudo,
+                "password": password,
+                "analysis_enabled": analysis_enabled,
+                "debug": self.debug_mode,
+                "max_rate": self.max_rate,
+                "record_file": self.record_file,
+                "lan_host": self.lan_host,
+                "lan_port": self.lan_port,
+                "spool_dir": self.spool_dir,
+                "upload_batch": self.upload_batch,
+                "upload_gzip": self.upload_gzip,
+            }))
+        self._acquisition.start()
+
+    def _stop_processes(self):
+        if self._stop is not None:
+            self._stop.set()
+        for process in (self._acquisition, self._sender):
+            if process is None:
+                continue
+            process.join(JOIN_TIMEOUT)
+            if process.is_alive():
+                logger.warning("%s did not stop, terminated", process.name)
+                process.terminate()
+                process.join(JOIN_TIMEOUT)
+        self._acquisition = self._sender = self._stop = None
+        self._stats.clear()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def stop(self):
+        acquisition_started = self._acquisition is not None
+        self.running = False
+        self._stop_processes()
+        if not acquisition_started:  # sinon état & log envoyés par BridgeLogic.stop
+            self.set_status("OFFLINE", COLORS["text_dim"])
+            self.log("⏹️ Bridge arrêté.")
+
+    def stats(self):
+        output = {}
+        for name in ("acquisition", "sender"):
+            output.update(self._stats.get(name, {}))
+        output["running"] = self.running
+        output["processes"] = {
+            "acquisition": bool(self._acquisition and self._acquisition.is_alive()),
+            "sender": bool(self._sender and self._sender.is_alive()),
+        }
+        if self.ring is not None:
+            output["ring"] = self.ring.stats()
+        return output
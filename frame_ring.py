@@ -0,0 +1,242 @@
+"""
+Frame ring
+
+Single producer, multiple consumer ring of byte frames in a
+multiprocessing.shared_memory block, to pass payload frames between
+processes (acquisition -> network sender / GUI) without pickling or pipes.
+
+Layout (little endian):
+    header: magic (4s), version (H), reserved (H), slots (I), slot size (I), write sequence (Q)
+    slot x slots: sequence (Q), frame length (I), padding (I), frame bytes (slot size)
+
+Writer marks a slot as being written (sequence 0) before copying a frame,
+then stores its sequence. Readers copy the frame and check the slot
+sequence before & after copy, a frame overwritten during copy is discarded.
+Readers never block the writer, a slow reader loses old frames (counted).
+"""
+
+from __future__ import annotations
+
+import struct
+from multiprocessing import shared_memory
+from time import monotonic, sleep
+
+MAGIC = b"LMUR"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIQ")
+HEADER_SIZE = 64
+WRITE_SEQ = struct.Struct("<Q")
+WRITE_SEQ_OFFSET = HEADER.size - WRITE_SEQ.size
+SLOT_HEADER = struct.Struct("<QII")
+SLOT_HEADER_SIZE = 16
+DEFAULT_SLOTS = 16
+DEFAULT_SLOT_SIZE = 64 * 1024
+POLL_INTERVAL = 0.002
+
+
+def attach_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach existing shared memory block, owner process unlinks it
+
+    Before python 3.13, attached block is registered to the resource tracker
+    shared with the owner (spawned child process), owner unlink unregisters it.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class FrameRing:
+    """Shared memory frame ring
+
+    Create in owner process with FrameRing(), attach in other processes
+    with FrameRing(name=ring.name). Only one process may write.
+
+    Attributes:
+        name: shared memory name, pass to other processes to attach.
+        slots: number of frame slots.
+        slot_size: max frame size in bytes.
+        written: number of frames written by this instance.
+        oversize: number of frames rejected by this instance (larger than slot size).
+    """
+
+    __slots__ = (
+        "_shm",
+        "_buf",
+        "_owner",
+        "name",
+        "slots",
+        "slot_size",
+        "written",
+        "oversize",
+    )
+
+    def __init__(self, name: str | None = None, slots: int = DEFAULT_SLOTS,
+                 slot_size: int = DEFAULT_SLOT_SIZE) -> None:
+        self._owner = name is None
+        if self._owner:
+            self.slots = max(int(slots), 2)
+            self.slot_size = max(int(slot_size), 8)
+            size = HEADER_SIZE + self.slots * (SLOT_HEADER_SIZE + self.slot_size)
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._buf = self._shm.buf
+            self._buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+            HEADER.pack_into(self._buf, 0, MAGIC, VERSION, 0, self.slots, self.slot_size, 0)
+        else:
+            self._shm = attach_memory(name)
+            self._buf = self._shm.buf
+            magic, version, _, self.slots, self.slot_size, _ = HEADER.unpack_from(self._buf, 0)
+            if magic != MAGIC or version != VERSION:
+                self.close()
+                raise ValueError(f"invalid frame ring: {name}")
+        self.name = self._shm.name
+        self.written = 0
+        self.oversize = 0
+
+    def _slot_offset(self, seq: int) -> int:
+        return HEADER_SIZE + (seq - 1) % self.slots * (SLOT_HEADER_SIZE + self.slot_size)
+
+    def head(self) -> int:
+        """Sequence of last written frame, 0 if none"""
+        return WRITE_SEQ.unpack_from(self._buf, WRITE_SEQ_OFFSET)[0]
+
+    def write(self, frame: bytes) -> bool:
+        """Write frame, False if larger than slot size"""
+        size = len(frame)
+        if size > self.slot_size:
+            self.oversize += 1
+            return False
+        buf = self._buf
+        seq = self.head() + 1
+        offset = self._slot_offset(seq)
+        SLOT_HEADER.pack_into(buf, offset, 0, 0, 0)
+        start = offset + SLOT_HEADER_SIZE
+        buf[start:start + size] = frame
+        SLOT_HEADER.pack_into(buf, offset, seq, size, 0)
+        WRITE_SEQ.pack_into(buf, WRITE_SEQ_OFFSET, seq)
+        self.written += 1
+        return True
+
+    def read(self, seq: int) -> bytes | None:
+        """Read frame by sequence, None if not written yet or overwritten"""
+        if seq < 1:
+            return None
+        buf = self._buf
+        offset = self._slot_offset(seq)
+        slot_seq, size, _ = SLOT_HEADER.unpack_from(buf, offset)
+        if slot_seq != seq:
+            return None
+        start = offset + SLOT_HEADER_SIZE
+        frame = bytes(buf[start:start + size])
+        if SLOT_HEADER.unpack_from(buf, offset)[0] != seq:
+            return None
+        return frame
+
+    def reader(self) -> FrameReader:
+        """Create reader starting after current head"""
+        return FrameReader(self)
+
+    def stats(self) -> dict:
+        """Ring statistics"""
+        return {
+            "name": self.name,
+            "slots": self.slots,
+            "slot_size": self.slot_size,
+            "head": self.head(),
+            "written": self.written,
+            "oversize": self.oversize,
+        }
+
+    def close(self) -> None:
+        """Detach from shared memory, owner also frees it"""
+        if self._buf is None:
+            return
+        self._buf.release()
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class FrameReader:
+    """Frame ring reader (one per consumer)
+
+    Attributes:
+        last_seq: sequence of last read frame.
+        received: number of frames read.
+        lost: number of frames overwritten before read (read_next).
+        skipped: number of frames skipped to read latest frame (read_latest).
+    """
+
+    __slots__ = (
+        "_ring",
+        "last_seq",
+        "received",
+        "lost",
+        "skipped",
+    )
+
+    def __init__(self, ring: FrameRing) -> None:
+        self._ring = ring
+        self.last_seq = ring.head()
+        self.received = 0
+        self.lost = 0
+        self.skipped = 0
+
+    def read_next(self) -> bytes | None:
+        """Read next frame in order, None if no new frame"""
+        ring = self._ring
+        while True:
+            head = ring.head()
+            if head <= self.last_seq:
+                return None
+            seq = self.last_seq + 1
+            oldest = head - ring.slots + 2  # keep one slot margin for the writer
+            if seq < oldest:
+                self.lost += oldest - seq
+                seq = oldest
+            frame = ring.read(seq)
+            if frame is None:  # overwritten during read, skip ahead
+                self.lost += 1
+                self.last_seq = seq
+                continue
+            self.last_seq = seq
+            self.received += 1
+            return frame
+
+    def read_latest(self) -> bytes | None:
+        """Read latest frame (skip older unread frames), None if no new frame"""
+        ring = self._ring
+        while True:
+            head = ring.head()
+            if head <= self.last_seq:
+                return None
+            frame = ring.read(head)
+            if frame is None:  # overwritten during read, retry with new head
+                continue
+            self.skipped += head - self.last_seq - 1
+            self.last_seq = head
+            self.received += 1
+            return frame
+
+    def wait(self, timeout: float, latest: bool = False) -> bytes | None:
+        """Wait for new frame (polling), None on timeout"""
+        read = self.read_latest if latest else self.read_next
+        deadline = monotonic() + timeout
+        while True:
+            frame = read()
+            if frame is not None or monotonic() >= deadline:
+                return frame
+            sleep(POLL_INTERVAL)
+
+    def stats(self) -> dict:
+        """Reader statistics"""
+        return {
+            "last_seq": self.last_seq,
+            "received": self.received,
+            "lost": self.lost,
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,311 @@
+"""
+Frame sinks
+
+Fan-out of one payload stream to several sinks (VPS socket, local file,
+frame ring, LAN server). The publisher serializes each payload once
+(compact JSON, only if a sink needs bytes) and offers the frame to every
+sink. Each sink has its own bounded queue, drop policy and worker thread,
+a slow or blocked sink never stalls acquisition or the other sinks.
+
+Drop policy (queue full):
+    "oldest": drop oldest queued frame (live feed, keep latest data).
+    "newest": drop offered frame (keep queued sequence contiguous).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from time import perf_counter, time
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "oldest"
+DROP_NEWEST = "newest"
+
+
+class Frame:
+    """Published payload
+
+    Attributes:
+        seq: publish sequence number.
+        timestamp: publish time (epoch seconds).
+        payload: payload dict, shared by all sinks (read only).
+        data: compact JSON bytes, None if no sink needs bytes.
+    """
+
+    __slots__ = (
+        "seq",
+        "timestamp",
+        "payload",
+        "data",
+    )
+
+    def __init__(self, seq: int, timestamp: float, payload: dict, data: bytes | None) -> None:
+        self.seq = seq
+        self.timestamp = timestamp
+        self.payload = payload
+        self.data = data
+
+
+def serialize(payload: dict) -> bytes:
+    """Payload to compact JSON bytes"""
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+class FrameSink:
+    """Sink base class, deliver frames from bounded queue in own thread
+
+    Subclass and implement deliver(frame), optionally close().
+
+    Args:
+        name: sink name (unique per publisher).
+        max_queue: max queued frames.
+        drop: drop policy if queue is full, "oldest" or "newest".
+    """
+
+    needs_data = False  # frame.data (JSON bytes) required
+    drain_on_stop = False  # deliver queued frames before stop
+
+    def __init__(self, name: str, max_queue: int = 8, drop: str = DROP_OLDEST) -> None:
+        if drop not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"invalid drop policy: {drop}")
+        self.name = name
+        self.drop = drop
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue: deque[Frame] = deque(maxlen=max(int(max_queue), 1))
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Sink worker is running"""
+        return self._running
+
+    def start(self) -> None:
+        """Start worker thread"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"sink_{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop worker thread, queued frames are discarded unless drain_on_stop"""
+        with self._cond:
+            self._running = False
+            if not self.drain_on_stop:
+                self._queue.clear()
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def offer(self, frame: Frame) -> bool:
+        """Queue frame without blocking, False if a frame was dropped"""
+        with self._cond:
+            queue = self._queue
+            accepted = True
+            if len(queue) == queue.maxlen:
+                self.dropped += 1
+                accepted = False
+                if self.drop == DROP_NEWEST:
+                    return False
+            queue.append(frame)  # full deque drops oldest
+            self._cond.notify()
+        return accepted
+
+    def _run(self) -> None:
+        queue = self._queue
+        while True:
+            with self._cond:
+                while self._running and not queue:
+                    self._cond.wait()
+                if not (self._running or self.drain_on_stop and queue):
+                    break
+                frame = queue.popleft()
+            try:
+                self.deliver(frame)
+                self.delivered += 1
+            except Exception:
+                self.errors += 1
+                logger.exception("sink %s: delivery failed", self.name)
+        try:
+            self.close()
+        except Exception:
+            logger.exception("sink %s: close failed", self.name)
+
+    def deliver(self, frame: Frame) -> None:
+        """Deliver frame (worker thread)"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release resources (worker thread, on stop)"""
+
+    def stats(self) -> dict:
+        """Sink statistics"""
+        return {
+            "running": self._running,
+            "queued": len(self._queue),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+
+class SocketSink(FrameSink):
+    """Send payload to VPS with SocketConnector (reconnect blocks this sink only)
+
+    In plain JSON mode the frame JSON bytes are sent as is (no second
+    serialization by socketio). Delta & binary modes encode from the payload dict.
+    """
+
+    def __init__(self, connector, name: str = "vps", max_queue: int = 4, drop: str = DROP_OLDEST) -> None:
+        super().__init__(name, max_queue, drop)
+        self.connector = connector
+        self.needs_data = connector.sends_json
+
+    def deliver(self, frame: Frame) -> None:
+        if frame.data is not None and self.connector.sends_json:
+            self.connector.send_data(frame.payload, frame.data)
+        else:
+            self.connector.send_data(frame.payload)
+
+    def stats(self) -> dict:
+        output = super().stats()
+        output["connected"] = bool(self.connector.is_connected)
+        return output
+
+
+class FileSink(FrameSink):
+    """Record frames to local JSON lines file (one payload per line)
+
+    Args:
+        path: output file, appended.
+        flush_interval: seconds between file flushes.
+    """
+
+    needs_data = True
+    drain_on_stop = True
+
+    def __init__(self, path: str, name: str = "file", max_queue: int = 256, drop: str = DROP_NEWEST,
+                 flush_interval: float = 1.0) -> None:
+        super().__init__(name, max_queue, drop)
+        self.path = path
+        self.flush_interval = flush_interval
+        self.bytes_written = 0
+        self._file = None
+        self._last_flush = 0.0
+
+    def deliver(self, frame: Frame) -> None:
+        if self._file is None:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._file = open(self.path, "ab")
+        self._file.write(frame.data)
+        self._file.write(b"\n")
+        self.bytes_written += len(frame.data) + 1
+        if frame.timestamp - self._last_flush >= self.flush_interval:
+            self._file.flush()
+            self._last_flush = frame.timestamp
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> dict:
+        output = super().stats()
+        output["path"] = self.path
+        output["bytes"] = self.bytes_written
+        return output
+
+
+class FramePublisher:
+    """Serialize payload once, offer frame to all sinks"""
+
+    __slots__ = (
+        "_sinks",
+        "_lock",
+        "_needs_data",
+        "published",
+        "serialized",
+        "_serialize_time",
+    )
+
+    def __init__(self) -> None:
+        self._sinks: dict[str, FrameSink] = {}
+        self._lock = threading.Lock()
+        self._needs_data = False
+        self.published = 0
+        self.serialized = 0
+        self._serialize_time = 0.0
+
+    def add(self, sink: FrameSink) -> None:
+        """Start & add sink, replace (stop) existing sink with same name"""
+        self.remove(sink.name)
+        sink.start()
+        with self._lock:
+            sinks = dict(self._sinks)
+            sinks[sink.name] = sink
+            self._set_sinks(sinks)
+
+    def remove(self, name: str) -> None:
+        """Remove & stop sink"""
+        with self._lock:
+            sinks = dict(self._sinks)
+            sink = sinks.pop(name, None)
+            self._set_sinks(sinks)
+        if sink is not None:
+            sink.stop()
+
+    def get(self, name: str) -> FrameSink | None:
+        """Get sink by name"""
+        return self._sinks.get(name)
+
+    def _set_sinks(self, sinks: dict[str, FrameSink]) -> None:
+        # Replaced (not mutated), publish iterates without lock
+        self._sinks = sinks
+        self._needs_data = any(sink.needs_data for sink in sinks.values())
+
+    def publish(self, payload: dict) -> int:
+        """Offer payload to all sinks, return number of sinks"""
+        sinks = self._sinks
+        if not sinks:
+            return 0
+        data = None
+        if self._needs_data:
+            start = perf_counter()
+            data = serialize(payload)
+            self._serialize_time += perf_counter() - start
+            self.serialized += 1
+        self.published += 1
+        frame = Frame(self.published, time(), payload, data)
+        for sink in sinks.values():
+            sink.offer(frame)
+        return len(sinks)
+
+    def stop(self) -> None:
+        """Stop & remove all sinks"""
+        with self._lock:
+            sinks = self._sinks
+            self._set_sinks({})
+        for sink in sinks.values():
+            sink.stop()
+
+    def stats(self) -> dict:
+        """Publisher & sink statistics"""
+        serialized = self.serialized
+        return {
+            "published": self.published,
+            "serialized": serialized,
+            "serialize_avg_us": round(self._serialize_time / serialized * 1e6, 3) if serialized else 0.0,
+            "sinks": {name: sink.stats() for name, sink in self._sinks.items()},
+        }
@@ -0,0 +1,374 @@
+"""
+LAN server
+
+Embedded asyncio server rebroadcasting published payload frames to local
+subscribers (pit wall), without VPS round trip. One port serves both
+websocket clients and plain TCP clients (JSON lines).
+
+Websocket: ws://host:port/?topics=telemetry,standings&rate=5
+TCP: send a subscribe line first, ex. {"topics": ["standings"], "rate": 1}
+
+Both can change subscription later by sending the same JSON message.
+Each message is a JSON object: {"topic": name, "seq": frame sequence,
+"ts": publish time, "data": topic data}. Topic data is serialized once
+per frame and shared by all subscribers, clients are rate-capped
+(latest frame wins) and skipped while their socket buffer is full.
+
+Server runs on its own event loop thread, fed by FramePublisher
+(LanServer is a FrameSink), acquisition never waits on a client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import json
+import logging
+import struct
+import threading
+from base64 import b64encode
+from hashlib import sha1
+from time import monotonic
+from urllib.parse import parse_qs, urlsplit
+
+from frame_sinks import DROP_OLDEST, Frame, FrameSink, serialize
+
+logger = logging.getLogger(__name__)
+
+# Topic: payload keys, "all" = whole payload
+TOPICS = {
+    "all": None,
+    "telemetry": ("teamId", "driverName", "telemetry"),
+    "standings": ("scoring",),
+    "session": ("sessionTimeRemainingSeconds", "rules", "pit", "weather_det", "weatherForecast", "extended"),
+}
+DEFAULT_TOPICS = ("all",)
+DEFAULT_RATE = 10.0  # messages per second per client
+MAX_RATE = 50.0
+MAX_CLIENTS = 64
+WRITE_BUFFER_LIMIT = 256 * 1024  # bytes pending per client before frames are skipped
+MAX_CONTROL_SIZE = 4096  # max client message size
+HANDSHAKE_TIMEOUT = 5.0
+STATS_TIMEOUT = 1.0  # max wait for client list from event loop
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+WS_TEXT = 0x1
+WS_CLOSE = 0x8
+WS_PING = 0x9
+WS_PONG = 0xA
+
+
+def ws_accept_key(key: bytes) -> str:
+    """Websocket handshake accept key"""
+    return b64encode(sha1(key.strip() + WS_GUID).digest()).decode()
+
+
+def ws_frame(data: bytes, opcode: int = WS_TEXT) -> bytes:
+    """Server websocket frame (final, unmasked)"""
+    size = len(data)
+    if size < 126:
+        header = struct.pack("!BB", 0x80 | opcode, size)
+    elif size < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, size)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, size)
+    return header + data
+
+
+async def ws_read(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    """Read client websocket frame, return opcode & unmasked data"""
+    head = await reader.readexactly(2)
+    opcode = head[0] & 0x0F
+    size = head[1] & 0x7F
+    if size == 126:
+        size = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif size == 127:
+        size = struct.unpack("!Q", await reader.readexactly(8))[0]
+    if size > MAX_CONTROL_SIZE:
+        raise ValueError(f"client message too large: {size}")
+    mask = await reader.readexactly(4) if head[1] & 0x80 else b"\x00\x00\x00\x00"
+    data = await reader.readexactly(size)
+    return opcode, bytes(byte ^ mask[index % 4] for index, byte in enumerate(data))
+
+
+def topic_message(topic: str, frame: Frame) -> bytes:
+    """Topic message bytes for frame"""
+    keys = TOPICS[topic]
+    if keys is None:
+        data = frame.data
+    else:
+        payload = frame.payload
+        data = serialize({key: payload[key] for key in keys if key in payload})
+    return b'{"topic":"%s","seq":%d,"ts":%.3f,"data":%s}' % (topic.encode(), frame.seq, frame.timestamp, data)
+
+
+class LanClient:
+    """Connected subscriber"""
+
+    __slots__ = (
+        "writer",
+        "peer",
+        "websocket",
+        "topics",
+        "min_interval",
+        "last_sent",
+        "sent",
+        "skipped",
+    )
+
+    def __init__(self, writer: asyncio.StreamWriter, websocket: bool) -> None:
+        self.writer = writer
+        self.peer = writer.get_extra_info("peername")
+        self.websocket = websocket
+        self.topics = DEFAULT_TOPICS
+        self.min_interval = 1.0 / DEFAULT_RATE
+        self.last_sent = 0.0
+        self.sent = 0
+        self.skipped = 0
+
+    def subscribe(self, topics=None, rate=None) -> None:
+        """Set topic filter & rate cap, unknown topics are ignored"""
+        if topics is not None:
+            if isinstance(topics, str):
+                topics = topics.split(",")
+            topics = tuple(topic for topic in dict.fromkeys(topics) if topic in TOPICS)
+            self.topics = topics or DEFAULT_TOPICS
+        if rate is not None:
+            rate = min(max(float(rate), 0.1), MAX_RATE)
+            self.min_interval = 1.0 / rate
+
+    def send(self, message: bytes) -> bool:
+        """Queue message on socket, False if socket buffer is full"""
+        transport = self.writer.transport
+        if transport.is_closing() or transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+            self.skipped += 1
+            return False
+        self.writer.write(ws_frame(message) if self.websocket else message + b"\n")
+        self.sent += 1
+        return True
+
+    def info(self) -> dict:
+        """Client info"""
+        return {
+            "peer": f"{self.peer[0]}:{self.peer[1]}" if self.peer else "",
+            "protocol": "websocket" if self.websocket else "tcp",
+            "topics": list(self.topics),
+            "rate": round(1.0 / self.min_interval, 2),
+            "sent": self.sent,
+            "skipped": self.skipped,
+        }
+
+
+class LanServer(FrameSink):
+    """Local broadcast server, FrameSink of FramePublisher
+
+    Args:
+        host: listen address, "0.0.0.0" for all interfaces.
+        port: listen port, 0 for any free port (see port after start).
+        max_clients: max connected clients, further connections are refused.
+    """
+
+    needs_data = True
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 8766, max_clients: int = MAX_CLIENTS,
+                 name: str = "lan") -> None:
+        super().__init__(name, max_queue=1, drop=DROP_OLDEST)
+        self.host = host
+        self.port = port
+        self.max_clients = max_clients
+        self.refused = 0
+        self._clients: set[LanClient] = set()
+        self._connections: set[asyncio.StreamWriter] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.base_events.Server | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._latest: Frame | None = None
+        self._scheduled = False
+
+    def start(self) -> None:
+        """Start event loop thread & listen, then sink worker"""
+        if self.running:
+            return
+        ready = threading.Event()
+        errors = []
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._run_loop, args=(ready, errors), name=f"sink_{self.name}_loop", daemon=True)
+        self._loop_thread.start()
+        ready.wait()
+        if errors:
+            self._loop_thread.join()
+            self._loop = self._loop_thread = None
+            raise errors[0]
+        logger.info("lan server: listening on %s:%s", self.host, self.port)
+        super().start()
+
+    def _run_loop(self, ready: threading.Event, errors: list) -> None:
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        try:
+            self._server = loop.run_until_complete(
+                asyncio.start_server(self._handle_client, self.host, self.port, limit=MAX_CONTROL_SIZE * 2))
+            self.port = self._server.sockets[0].getsockname()[1]
+        except OSError as error:
+            errors.append(error)
+            ready.set()
+            loop.close()
+            return
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(self._shutdown())
+            loop.close()
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        for writer in tuple(self._connections):
+            writer.close()  # client handlers end on connection lost
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=2.0)
+            for task in pending:
+                task.cancel()
+        await self._server.wait_closed()
+
+    def close(self) -> None:
+        """Stop event loop (sink worker thread, on stop)"""
+        loop = self._loop
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop_thread.join(5.0)
+        self._loop = self._loop_thread = self._server = None
+        self._clients.clear()
+        self._connections.clear()
+        logger.info("lan server: stopped")
+
+    def deliver(self, frame: Frame) -> None:
+        # Hand over latest frame to event loop, one broadcast pending at most
+        self._latest = frame
+        if not self._scheduled and self._clients:
+            self._scheduled = True
+            self._loop.call_soon_threadsafe(self._broadcast)
+
+    def _broadcast(self) -> None:
+        """Send latest frame to due clients (event loop thread)"""
+        self._scheduled = False
+        frame = self._latest
+        if frame is None:
+            return
+        now = monotonic()
+        messages: dict[str, bytes] = {}
+        for client in self._clients:
+            if now - client.last_sent < client.min_interval:
+                continue
+            client.last_sent = now
+            for topic in client.topics:
+                message = messages.get(topic)
+                if message is None:
+                    message = messages[topic] = topic_message(topic, frame)
+                client.send(message)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if len(self._connections) >= self.max_clients:
+            self.refused += 1
+            writer.close()
+            return
+        self._connections.add(writer)
+        client = None
+        try:
+            first_line = await asyncio.wait_for(reader.readline(), HANDSHAKE_TIMEOUT)
+            if first_line.startswith(b"GET "):
+                client = await self._accept_websocket(first_line, reader, writer)
+                if client is None:
+                    return
+                self._clients.add(client)
+                await self._read_websocket(client, reader)
+            else:
+                client = LanClient(writer, websocket=False)
+                self._apply_control(client, first_line)
+                self._clients.add(client)
+                logger.info("lan client connected: %s (tcp)", client.info()["peer"])
+                async for line in reader:
+                    self._apply_control(client, line)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError) as error:
+            logger.debug("lan client %s: %s", writer.get_extra_info("peername"), error)
+        finally:
+            if client is not None:
+                self._clients.discard(client)
+                logger.info("lan client disconnected: %s", client.info()["peer"])
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _accept_websocket(self, request_line: bytes, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> LanClient | None:
+        """Websocket handshake, subscription from query string"""
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), HANDSHAKE_TIMEOUT)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        key = headers.get("sec-websocket-key")
+        if headers.get("upgrade", "").lower() != "websocket" or not key:
+            writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            return None
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {ws_accept_key(key.encode())}\r\n\r\n").encode())
+        client = LanClient(writer, websocket=True)
+        query = parse_qs(urlsplit(request_line.split()[1].decode("latin-1")).query)
+        client.subscribe(
+            query["topics"][0] if "topics" in query else None,
+            query["rate"][0] if "rate" in query else None)
+        logger.info("lan client connected: %s (websocket)", client.info()["peer"])
+        return client
+
+    async def _read_websocket(self, client: LanClient, reader: asyncio.StreamReader) -> None:
+        """Client messages until close"""
+        while True:
+            opcode, data = await ws_read(reader)
+            if opcode == WS_CLOSE:
+                client.writer.write(ws_frame(data[:2], WS_CLOSE))
+                return
+            if opcode == WS_PING:
+                client.writer.write(ws_frame(data, WS_PONG))
+            elif opcode == WS_TEXT:
+                self._apply_control(client, data)
+
+    @staticmethod
+    def _apply_control(client: LanClient, message: bytes) -> None:
+        """Apply subscribe message: {"topics": [...], "rate": n}"""
+        message = message.strip()
+        if not message:
+            return
+        try:
+            control = json.loads(message)
+            client.subscribe(control.get("topics"), control.get("rate"))
+        except (ValueError, TypeError, AttributeError):
+            logger.debug("lan client %s: invalid message", client.peer)
+
+    def stats(self) -> dict:
+        output = super().stats()
+        output["port"] = self.port
+        output["refused"] = self.refused
+        output["clients"] = self._client_stats()
+        return output
+
+    def _client_stats(self) -> list[dict]:
+        """Client info list, read on event loop thread (clients are added & removed there)"""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return []
+        try:
+            return asyncio.run_coroutine_threadsafe(self._client_infos(), loop).result(STATS_TIMEOUT)
+        except (concurrent.futures.TimeoutError, RuntimeError):  # loop stopping
+            return []
+
+    async def _client_infos(self) -> list[dict]:
+        return [client.info() for client in self._clients]
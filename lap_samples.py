@@ -0,0 +1,134 @@
+"""
+Lap sample store
+
+Preallocated, bounded storage of lap telemetry samples for analysis.
+Samples are stored as float32 rows in one flat array (no per sample dict),
+each channel is read back as a strided column, and converted to the
+sample dict list (upload JSON shape) only on lap flush.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Sequence
+
+# Channel set
+# 0 - sample key, 1 - number of values (1 = scalar, 4 = wheels fl/fr/rl/rr), 2 - round digits
+SAMPLE_CHANNELS = (
+    ("d", 1, 1),  # lap distance (m)
+    ("s", 1, 1),  # speed (km/h)
+    ("t", 1, 0),  # throttle (%)
+    ("b", 1, 0),  # brake (%)
+    ("g", 1, None),  # gear (int)
+    ("ut", 1, 0),  # unfiltered throttle (%)
+    ("ub", 1, 0),  # unfiltered brake (%)
+    ("uc", 1, 0),  # unfiltered clutch (%)
+    ("w", 1, 2),  # steering
+    ("f", 1, 2),  # fuel (l)
+    ("r", 1, 0),  # rpm
+    ("ve", 1, 1),  # virtual energy (%)
+    ("tw", 1, 1),  # front left tire wear
+    ("drag", 1, 1),
+    ("df_f", 1, 1),
+    ("df_r", 1, 1),
+    ("susp_def", 4, 4),
+    ("rh", 4, 4),
+    ("susp_f", 4, 0),
+    ("brk_tmp", 4, 1),
+    ("brk_prs", 4, 3),
+    ("lat_f", 4, 0),
+    ("long_f", 4, 0),
+    ("t_load", 4, 0),
+    ("t_temp_c", 4, 1),
+    ("t_temp_i", 4, 1),
+)
+ROW_SIZE = sum(width for _, width, _ in SAMPLE_CHANNELS)
+MIN_SAMPLE_DISTANCE = 2.0  # meters between samples
+MIN_CAPACITY = 1024
+CAPACITY_MARGIN = 1.5  # lap can be longer than track length (pit lane, off track)
+
+
+def capacity_from_length(track_length: float) -> int:
+    """Number of samples for track length"""
+    if track_length > 0:
+        return max(int(track_length / MIN_SAMPLE_DISTANCE * CAPACITY_MARGIN), MIN_CAPACITY)
+    return MIN_CAPACITY
+
+
+class LapSampleStore:
+    """Bounded row store of lap samples
+
+    Attributes:
+        count: number of stored samples.
+        capacity: max number of samples, further samples are dropped.
+        dropped: number of samples dropped since last clear.
+    """
+
+    __slots__ = (
+        "count",
+        "capacity",
+        "dropped",
+        "_data",
+    )
+
+    def __init__(self, capacity: int = MIN_CAPACITY) -> None:
+        self.count = 0
+        self.dropped = 0
+        self.capacity = 0
+        self._data = array("f")
+        self.resize(capacity)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def resize(self, capacity: int) -> None:
+        """Set capacity & clear samples, buffer is reallocated only if capacity changed"""
+        capacity = max(int(capacity), 1)
+        if capacity != self.capacity:
+            self.capacity = capacity
+            self._data = array("f", bytes(capacity * ROW_SIZE * self._data.itemsize))
+        self.clear()
+
+    def clear(self) -> None:
+        """Clear samples, keep buffer"""
+        self.count = 0
+        self.dropped = 0
+
+    def append(self, row: Sequence[float]) -> bool:
+        """Append sample row (ROW_SIZE values in SAMPLE_CHANNELS order), False if full"""
+        count = self.count
+        if count >= self.capacity:
+            self.dropped += 1
+            return False
+        start = count * ROW_SIZE
+        self._data[start:start + ROW_SIZE] = array("f", row)
+        self.count = count + 1
+        return True
+
+    def nbytes(self) -> int:
+        """Buffer size in bytes"""
+        return len(self._data) * self._data.itemsize
+
+    def column(self, key: str) -> list:
+        """Get rounded channel values, list of 4 wheel lists per sample for wheel channel"""
+        offset = 0
+        for name, width, digits in SAMPLE_CHANNELS:
+            if name == key:
+                break
+            offset += width
+        else:
+            raise KeyError(key)
+        end = self.count * ROW_SIZE
+        data = self._data
+        if width == 1:
+            values = data[offset:end:ROW_SIZE]
+            if digits is None:
+                return list(map(int, values))
+            return [round(value, digits) for value in values]
+        wheels = [data[offset + wheel:end:ROW_SIZE] for wheel in range(width)]
+        return [[round(value, digits) for value in values] for values in zip(*wheels)]
+
+    def to_dicts(self) -> list[dict]:
+        """Convert samples to list of sample dicts"""
+        keys = [key for key, *_ in SAMPLE_CHANNELS]
+        return [dict(zip(keys, values)) for values in zip(*map(self.column, keys))]
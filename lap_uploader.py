@@ -0,0 +1,424 @@
+"""
+Lap upload worker
+
+One background worker for analysis uploads to the server REST API:
+laps (/api/telemetry/lap) and session events (ex. /api/sessions/start),
+replacing one thread and one connection per request:
+
+- bounded in-memory FIFO queue, laps are converted to JSON in the worker.
+- append-only disk spool while server is unreachable (survives restart),
+  spooled items are sent first, read position is kept in an offset file.
+- retry with exponential backoff.
+- all pending items sent per wake-up over one pooled requests.Session,
+  optionally several laps per request (JSON array) and gzip body,
+  both need server support and are disabled by default.
+
+Laps and events share the queue & spool, so they are sent in submit order
+(ex. session start always before laps of that session).
+Spool line: endpoint path, tab, JSON body.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+from time import monotonic, perf_counter
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+SPOOL_FILE = "lap_spool.jsonl"
+OFFSET_FILE = "lap_spool.offset"
+_STOP = object()
+
+
+class LapUploader:
+    """Lap upload worker
+
+    Args:
+        base_url: server base URL.
+        lap_path: lap upload endpoint path.
+        spool_dir: spool directory, created on first spool write.
+        max_queue: max number of items waiting in memory, further items are dropped.
+        max_batch: max number of consecutive laps per request, more than 1 sends JSON array of laps.
+        compress: gzip request body (Content-Encoding: gzip).
+        timeout: request timeout (seconds).
+        backoff_min: first retry delay (seconds), doubled on each failure.
+        backoff_max: max retry delay (seconds).
+        max_spool_bytes: max spool size, further items are dropped.
+        session: shared requests session, new pooled session if None.
+    """
+
+    __slots__ = (
+        "_base_url",
+        "_lap_path",
+        "_spool_dir",
+        "_max_batch",
+        "_compress",
+        "_timeout",
+        "_backoff_min",
+        "_backoff_max",
+        "_max_spool_bytes",
+        "_session",
+        "_queue",
+        "_thread",
+        "_stopping",
+        "_backoff",
+        "_retry_at",
+        "uploaded",
+        "events",
+        "uploaded_bytes",
+        "requests",
+        "errors",
+        "rejected",
+        "dropped",
+        "spooled",
+        "latency_last",
+        "latency_max",
+        "latency_total",
+    )
+
+    def __init__(
+        self,
+        base_url: str,
+        lap_path: str = "/api/telemetry/lap",
+        spool_dir: str = "spool",
+        max_queue: int = 16,
+        max_batch: int = 1,
+        compress: bool = False,
+        timeout: float = 5.0,
+        backoff_min: float = 1.0,
+        backoff_max: float = 60.0,
+        max_spool_bytes: int = 256 * 1024 * 1024,
+        session: requests.Session | None = None,
+    ) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._lap_path = lap_path
+        self._spool_dir = spool_dir
+        self._max_batch = max(int(max_batch), 1)
+        self._compress = compress
+        self._timeout = timeout
+        self._backoff_min = backoff_min
+        self._backoff_max = backoff_max
+        self._max_spool_bytes = max_spool_bytes
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self._session = session
+        self._queue: queue.Queue = queue.Queue(max(int(max_queue), 1))
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()  # stop requested, checked between requests
+        self._backoff = 0.0
+        self._retry_at = 0.0  # monotonic time of next retry, 0 = server reachable
+        self.uploaded = 0
+        self.events = 0
+        self.uploaded_bytes = 0
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.spooled = 0
+        self.latency_last = 0.0
+        self.latency_max = 0.0
+        self.latency_total = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether worker thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start upload worker, spool left by a previous run is sent at once
+
+        Not started while a stopped worker is still finishing a request
+        (one worker per spool), next submit starts it.
+        """
+        if self.running:
+            if self._stopping.is_set():
+                logger.warning("LapUploader: previous worker still stopping, not started")
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self.__run, name="lap_uploader", daemon=True)
+        self._thread.start()
+        logger.info("LapUploader: worker started")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop upload worker, items still in memory are written to spool"""
+        if self.running:
+            self._stopping.set()
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            if self._thread.is_alive():  # kept until exit, see start
+                logger.warning("LapUploader: worker still sending, stops after current request")
+                return
+            logger.info("LapUploader: worker stopped")
+        self._thread = None
+
+    def submit(self, payload: dict, samples: Any = None) -> bool:
+        """Queue lap for upload, start worker if not running
+
+        Args:
+            payload: lap payload.
+            samples: optional sample store (to_dicts) set as payload "samples"
+                by the worker, not to be reused by caller.
+
+        Returns:
+            False if queue is full and lap is dropped.
+        """
+        return self.__put((self._lap_path, payload, samples))
+
+    def submit_event(self, path: str, payload: dict) -> bool:
+        """Queue event for upload (sent after items submitted before it)
+
+        Args:
+            path: endpoint path, ex. /api/sessions/start.
+            payload: event payload.
+
+        Returns:
+            False if queue is full and event is dropped.
+        """
+        return self.__put((path, payload, None))
+
+    def __put(self, item: tuple) -> bool:
+        """Queue item, start worker if not running"""
+        if not self.running:
+            self.start()
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("LapUploader: queue full, %s dropped", item[0])
+            return False
+
+    def stats(self) -> dict:
+        """Upload statistics"""
+        retry_in = self._retry_at - monotonic() if self._retry_at else 0.0
+        return {
+            "queue": self._queue.qsize(),
+            "spool_bytes": self.spool_pending_bytes(),
+            "spooled": self.spooled,
+            "uploaded": self.uploaded,
+            "events": self.events,
+            "uploaded_bytes": self.uploaded_bytes,
+            "requests": self.requests,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "retry_in": round(max(retry_in, 0.0), 1),
+            "latency_last_ms": round(self.latency_last * 1000, 1),
+            "latency_max_ms": round(self.latency_max * 1000, 1),
+            "latency_avg_ms": round(self.latency_total / self.requests * 1000, 1) if self.requests else 0.0,
+        }
+
+    # Spool
+    def __spool_path(self, name: str) -> str:
+        return os.path.join(self._spool_dir, name)
+
+    def __read_offset(self) -> int:
+        try:
+            with open(self.__spool_path(OFFSET_FILE), "r", encoding="utf-8") as file:
+                return int(file.read() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def __write_offset(self, offset: int) -> None:
+        temp_path = self.__spool_path(OFFSET_FILE + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(str(offset))
+        os.replace(temp_path, self.__spool_path(OFFSET_FILE))
+
+    def spool_pending_bytes(self) -> int:
+        """Size of spooled laps not sent yet"""
+        try:
+            size = os.path.getsize(self.__spool_path(SPOOL_FILE))
+        except OSError:
+            return 0
+        return max(size - self.__read_offset(), 0)
+
+    def __spool_append(self, items: list[tuple[str, bytes]]) -> None:
+        """Append items to spool"""
+        if not items:
+            return
+        try:
+            os.makedirs(self._spool_dir, exist_ok=True)
+            path = self.__spool_path(SPOOL_FILE)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(path, "ab") as file:
+                for endpoint, body in items:
+                    line = endpoint.encode() + b"\t" + body + b"\n"
+                    if size + len(line) > self._max_spool_bytes:
+                        self.dropped += 1
+                        continue
+                    file.write(line)
+                    size += len(line)
+                    self.spooled += 1
+                file.flush()
+                os.fsync(file.fileno())
+        except OSError as error:
+            self.dropped += len(items)
+            logger.error("LapUploader: spool write failed: %s", error)
+
+    def __upload_spool(self) -> bool:
+        """Send spooled items in order, True if spool is empty"""
+        path = self.__spool_path(SPOOL_FILE)
+        if not os.path.exists(path):
+            return True
+        offset = self.__read_offset()
+        with open(path, "rb") as file:
+            file.seek(offset)
+            while True:
+                if self._stopping.is_set():  # remaining items stay in spool
+                    return False
+                chunk = []
+                size = 0
+                for _ in range(self._max_batch):
+                    line = file.readline()
+                    if not line.endswith(b"\n"):  # end of file or partial line (interrupted write)
+                        break
+                    endpoint, tab, body = line[:-1].partition(b"\t")
+                    if not tab:  # lap line without endpoint (older spool)
+                        endpoint, body = self._lap_path.encode(), endpoint
+                    chunk.append((endpoint.decode(), body))
+                    size += len(line)
+                if not chunk:
+                    break
+                # Offset saved after whole chunk is sent (at least once delivery)
+                if not self.__upload(chunk, spool=False):
+                    return False
+                offset += size
+                self.__write_offset(offset)
+        os.remove(path)
+        os.remove(self.__spool_path(OFFSET_FILE))
+        logger.info("LapUploader: spool sent")
+        return True
+
+    # Upload
+    def __post(self, endpoint: str, bodies: list[bytes]) -> bool:
+        """Send items to endpoint in one request, True if sent or rejected by server"""
+        if len(bodies) > 1:
+            body = b"[" + b",".join(bodies) + b"]"
+        else:
+            body = bodies[0]
+        headers = {"Content-Type": "application/json"}
+        if self._compress:
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        start = perf_counter()
+        try:
+            response = self._session.post(
+                self._base_url + endpoint, data=body, headers=headers, timeout=self._timeout)
+            status = response.status_code
+        except requests.RequestException as error:
+            logger.debug("LapUploader: upload failed: %s", error)
+            status = 0
+        finally:
+            latency = perf_counter() - start
+            self.requests += 1
+            self.latency_last = latency
+            self.latency_total += latency
+            if latency > self.latency_max:
+                self.latency_max = latency
+        if 200 <= status < 300:
+            if endpoint == self._lap_path:
+                self.uploaded += len(bodies)
+            else:
+                self.events += len(bodies)
+            self.uploaded_bytes += len(body)
+            return True
+        if 400 <= status < 500 and status not in (408, 429):
+            # Refused payload, retrying would block following items
+            self.rejected += len(bodies)
+            logger.warning("LapUploader: %s %s rejected, status %s", len(bodies), endpoint, status)
+            return True
+        self.errors += 1
+        return False
+
+    def __upload(self, items: list[tuple[str, bytes]], spool: bool = True) -> bool:
+        """Send items in order, consecutive laps batched, spool remaining items on failure"""
+        index = 0
+        while index < len(items):
+            if self._stopping.is_set():
+                if spool:
+                    self.__spool_append(items[index:])
+                return False
+            endpoint = items[index][0]
+            end = index + 1
+            if endpoint == self._lap_path:
+                limit = min(index + self._max_batch, len(items))
+                while end < limit and items[end][0] == endpoint:
+                    end += 1
+            if not self.__post(endpoint, [body for _, body in items[index:end]]):
+                if spool:
+                    self.__spool_append(items[index:])
+                return False
+            index = end
+        return True
+
+    def __encode(self, item: tuple) -> tuple[str, bytes] | None:
+        """Item to (endpoint, JSON body)"""
+        endpoint, payload, samples = item
+        try:
+            if samples is not None:
+                payload["samples"] = samples.to_dicts()
+            return endpoint, json.dumps(payload, separators=(",", ":")).encode()
+        except (TypeError, ValueError) as error:
+            self.dropped += 1
+            logger.error("LapUploader: %s not serializable: %s", endpoint, error)
+            return None
+
+    def __run(self) -> None:
+        """Upload worker"""
+        _queue = self._queue
+        stopping = False
+        if self.spool_pending_bytes():  # left by previous run, send without waiting for new item
+            self._retry_at = monotonic()
+        while not stopping:
+            timeout = max(self._retry_at - monotonic(), 0.0) if self._retry_at else None
+            try:
+                items = [_queue.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            # Take all waiting items
+            while True:
+                try:
+                    items.append(_queue.get_nowait())
+                except queue.Empty:
+                    break
+            encoded = []
+            for item in items:
+                if item is _STOP:
+                    stopping = True
+                    continue
+                item = self.__encode(item)
+                if item is not None:
+                    encoded.append(item)
+            # Keep order: new items go behind spooled items while offline
+            offline = self._retry_at and monotonic() < self._retry_at
+            if stopping or offline or self.spool_pending_bytes():
+                self.__spool_append(encoded)
+                encoded = []
+            if stopping or offline:
+                continue
+            try:
+                sent = self.__upload_spool() and self.__upload(encoded)
+            except OSError as error:
+                logger.error("LapUploader: spool read failed: %s", error)
+                sent = False
+            if self._stopping.is_set():  # not a server failure, _STOP is next in queue
+                continue
+            if sent:
+                self._backoff = 0.0
+                self._retry_at = 0.0
+            else:
+                self._backoff = min(max(self._backoff * 2, self._backoff_min), self._backoff_max)
+                self._retry_at = monotonic() + self._backoff
+                logger.info("LapUploader: server unreachable, retry in %.0fs", self._backoff)
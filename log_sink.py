@@ -0,0 +1,120 @@
+"""
+Log sink
+
+Thread-safe bounded buffer between log producers (bridge loop, workers)
+and a UI log widget. Messages are coalesced in a ring buffer and drained
+by the UI at a fixed rate. Messages pushed with a key (repeating errors,
+debug values) are rate-limited by key, messages without key are never
+suppressed (ex. state changes, even if repeated).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from time import monotonic
+
+
+class LogSink:
+    """Ring-buffered, rate-limited log sink
+
+    Args:
+        max_lines: max number of pending lines, oldest lines are dropped.
+        repeat_interval: min seconds between messages with same key,
+            suppressed repeats are counted and reported on next message
+            with same key, or on drain once the interval has elapsed.
+
+    Attributes:
+        received: number of pushed messages.
+        suppressed: number of messages suppressed by rate limit.
+        dropped: number of lines dropped from full buffer.
+    """
+
+    __slots__ = (
+        "_lines",
+        "_lock",
+        "_last_seen",
+        "_repeats",
+        "_pending_drop",
+        "repeat_interval",
+        "received",
+        "suppressed",
+        "dropped",
+    )
+
+    def __init__(self, max_lines: int = 500, repeat_interval: float = 5.0) -> None:
+        self._lines: deque[str] = deque(maxlen=max(int(max_lines), 1))
+        self._lock = threading.Lock()
+        self._last_seen: dict[str, float] = {}
+        self._repeats: dict[str, tuple[int, str]] = {}  # suppressed count, last message
+        self._pending_drop = 0
+        self.repeat_interval = repeat_interval
+        self.received = 0
+        self.suppressed = 0
+        self.dropped = 0
+
+    def push(self, message: str, key: str | None = None) -> bool:
+        """Add message, False if suppressed by rate limit
+
+        Args:
+            message: log message.
+            key: rate limit key (ex. "loop_error"), same key for repeating
+                messages even if their text differs, None = never suppressed.
+        """
+        with self._lock:
+            self.received += 1
+            if key is not None:
+                now = monotonic()
+                last_seen = self._last_seen.get(key)
+                if last_seen is not None and now - last_seen < self.repeat_interval:
+                    self._repeats[key] = (self._repeats.get(key, (0, message))[0] + 1, message)
+                    self.suppressed += 1
+                    return False
+                self._last_seen[key] = now
+                repeats = self._repeats.pop(key, None)
+                if repeats:
+                    message = f"{message} (+{repeats[0]} similar)"
+                if len(self._last_seen) > 4 * self._lines.maxlen:  # forget old keys
+                    self._expire(now)
+            self._append(message)
+        return True
+
+    def _append(self, message: str) -> None:
+        lines = self._lines
+        if len(lines) == lines.maxlen:
+            self._pending_drop += 1
+            self.dropped += 1
+        lines.append(message)
+
+    def _expire(self, now: float) -> None:
+        """Forget keys out of rate limit window, report their suppressed repeats"""
+        expired = now - self.repeat_interval
+        for key in [key for key, last_seen in self._last_seen.items() if last_seen <= expired]:
+            del self._last_seen[key]
+            repeats = self._repeats.pop(key, None)
+            if repeats:  # last suppressed message, with count of the others
+                count, message = repeats
+                self._append(f"{message} (+{count - 1} similar)" if count > 1 else message)
+
+    def drain(self) -> list[str]:
+        """Take all pending lines (oldest first), with notice of dropped lines"""
+        with self._lock:
+            if self._last_seen:
+                self._expire(monotonic())
+            if not self._lines:
+                return []
+            lines = list(self._lines)
+            self._lines.clear()
+            if self._pending_drop:
+                lines.insert(0, f"... {self._pending_drop} lines skipped")
+                self._pending_drop = 0
+        return lines
+
+    def stats(self) -> dict:
+        """Sink statistics"""
+        return {
+            "received": self.received,
+            "suppressed": self.suppressed,
+            "dropped": self.dropped,
+            "pending": len(self._lines),
+        }
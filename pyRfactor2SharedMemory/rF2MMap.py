@@ -13,6 +13,9 @@ import ctypes
 import logging
 import mmap
 import platform
+import struct
+from time import monotonic, perf_counter
+from typing import Iterable
 
 try:
     from . import rF2data
@@ -24,6 +27,8 @@ except ImportError:  # standalone, not package
 PLATFORM = platform.system()
 MAX_VEHICLES = rFactor2Constants.MAX_MAPPED_VEHICLES
 INVALID_INDEX = -1
+MAX_READ_RETRY = 3
+VERSION_BLOCK = struct.Struct("<II")  # mVersionUpdateBegin, mVersionUpdateEnd
 
 
 def get_root_logger_name():
@@ -58,16 +63,52 @@ def linux_mmap(name: str, size: int) -> mmap.mmap:
 
 
 class MMapControl:
-    """Memory map control"""
+    """Memory map control
+
+    Copy access reads mmap as seqlock: copy only a complete write
+    (mVersionUpdateBegin == mVersionUpdateEnd) to a shadow buffer, re-check
+    mVersionUpdateBegin after copy, and retry if game started writing during copy.
+    Accessible data is only replaced by consistent copies.
+
+    Direct access cannot be protected, only writes in progress seen on update are counted.
+
+    Sparse copy (copy access, see set_sparse) copies only header & selected
+    mVehicles slots, with a periodic full copy to refresh other slots.
+
+    Attributes:
+        reads: consistent snapshots copied (copy access), or new versions seen (direct access).
+        retries: read attempts retried (write in progress or torn copy).
+        torn: copies discarded because game wrote during copy.
+        failed: updates skipped after MAX_READ_RETRY attempts (previous snapshot kept).
+        busy: updates that found a write in progress.
+        copy_bytes: bytes copied from mmap (copy access).
+        copy_time: time spent copying from mmap (seconds, copy access).
+        full_reads: full buffer copies (all copies if not sparse).
+    """
 
     __slots__ = (
         "_mmap_name",
         "_mmap_buffer",
         "_struct",
         "_buffer",
+        "_shadow",
         "_version",
+        "_last_version",
+        "_access_mode",
+        "_sparse",
+        "_sparse_keys",
+        "_full_interval",
+        "_next_full",
         "update",
         "data",
+        "reads",
+        "retries",
+        "torn",
+        "failed",
+        "busy",
+        "copy_bytes",
+        "copy_time",
+        "full_reads",
     )
 
     def __init__(self, mmap_name: str, data_struct: ctypes.Structure) -> None:
@@ -81,9 +122,17 @@ class MMapControl:
         self._mmap_buffer = None
         self._struct = data_struct
         self._buffer = bytearray()
+        self._shadow = bytearray()
         self._version = None
+        self._last_version = 0
+        self._access_mode = 0
+        self._sparse = None
+        self._sparse_keys = ()
+        self._full_interval = 1.0
+        self._next_full = 0.0
         self.update = None
         self.data = None
+        self.reset_stats()
 
     def __del__(self):
         logger.info("sharedmemory: GC: MMap %s", self._mmap_name)
@@ -101,13 +150,16 @@ class MMapControl:
             pid=rf2_pid
         )
 
+        self._version = rF2data.rF2MappedBufferVersionBlock.from_buffer(self._mmap_buffer)
+        self._access_mode = access_mode
         if access_mode:
             self.data = self._struct.from_buffer(self._mmap_buffer)
             self.update = self.__buffer_share
         else:
             self._buffer[:] = self._mmap_buffer
+            self._shadow[:] = self._buffer
+            self.__read_consistent()  # replace initial copy if torn
             self.data = self._struct.from_buffer(self._buffer)
-            self._version = rF2data.rF2MappedBufferVersionBlock.from_buffer(self._mmap_buffer)
             self.update = self.__buffer_copy
 
         mode = "Direct" if access_mode else "Copy"
@@ -127,14 +179,135 @@ class MMapControl:
             logger.error("sharedmemory: buffer error while closing %s", self._mmap_name)
         self.update = None  # unassign update method (for proper garbage collection)
 
+    def reset_stats(self) -> None:
+        """Reset read statistics"""
+        self.reads = 0
+        self.retries = 0
+        self.torn = 0
+        self.failed = 0
+        self.busy = 0
+        self.copy_bytes = 0
+        self.copy_time = 0.0
+        self.full_reads = 0
+
+    def stats(self) -> dict:
+        """Read statistics"""
+        return {
+            "mode": "direct" if self._access_mode else "copy",
+            "reads": self.reads,
+            "retries": self.retries,
+            "torn": self.torn,
+            "failed": self.failed,
+            "busy": self.busy,
+            "copy_bytes": self.copy_bytes,
+            "copy_time": self.copy_time,
+            "full_reads": self.full_reads,
+            "sparse": self._sparse is not None,
+        }
+
+    def set_sparse(self, indexes: Iterable[int] | None, full_interval: float = 1.0) -> None:
+        """Set sparse copy of mVehicles slots (copy access only)
+
+        Header (all fields before mVehicles) & selected slots are copied on each update.
+        All slots are copied every full_interval, or when number of vehicles
+        or ID (first field) of a selected slot changed. Other slots may be
+        up to full_interval old.
+
+        Args:
+            indexes: mVehicles slot indexes to copy, None to copy full buffer.
+            full_interval: full copy interval (seconds).
+        """
+        if indexes is None:
+            self._sparse = None
+            self._sparse_keys = ()
+            return
+        vehicles = self._struct.mVehicles
+        slot_type = dict(self._struct._fields_)["mVehicles"]._type_
+        slot_size = ctypes.sizeof(slot_type)
+        key_size = ctypes.sizeof(slot_type._fields_[0][1])
+        num_field = self._struct.mNumVehicles
+        slots = sorted(set(index for index in indexes if 0 <= index < MAX_VEHICLES))
+        ranges = [(0, vehicles.offset)]
+        keys = [(num_field.offset, num_field.offset + num_field.size)]
+        for index in slots:
+            start = vehicles.offset + index * slot_size
+            ranges.append((start, start + slot_size))
+            keys.append((start, start + key_size))
+        self._sparse = tuple(ranges)
+        self._sparse_keys = tuple(keys)
+        self._full_interval = full_interval
+        self._next_full = 0.0
+
     def __buffer_share(self) -> None:
         """Share buffer access, may result data desync"""
+        version = self._version
+        version_end = version.mVersionUpdateEnd
+        if version.mVersionUpdateBegin != version_end:
+            self.busy += 1
+        elif version_end != self._last_version:
+            self._last_version = version_end
+            self.reads += 1
+
+    def __read_consistent(self, ranges: tuple | None = None) -> bool:
+        """Seqlock read mmap to accessible buffer, keep previous data if failed
+
+        Args:
+            ranges: (start, end) byte ranges to copy, None to copy full buffer.
+        """
+        version = self._version
+        shadow = self._shadow
+        for attempt in range(MAX_READ_RETRY):
+            if attempt:
+                self.retries += 1
+            version_end = version.mVersionUpdateEnd
+            if version.mVersionUpdateBegin != version_end:
+                if not attempt:
+                    self.busy += 1
+                continue  # write in progress
+            if ranges is None:
+                shadow[:] = self._mmap_buffer
+                self.copy_bytes += len(shadow)
+            else:
+                with memoryview(self._mmap_buffer) as source, memoryview(shadow) as target:
+                    for start, end in ranges:
+                        target[start:end] = source[start:end]
+                        self.copy_bytes += end - start
+            # Consistent if copy matches checked version and no write started during copy
+            if (shadow[:8] == VERSION_BLOCK.pack(version_end, version_end)
+                    and version.mVersionUpdateBegin == version_end):
+                if ranges is None:
+                    self._buffer[:] = shadow
+                    self.full_reads += 1
+                else:
+                    with memoryview(shadow) as source, memoryview(self._buffer) as target:
+                        for start, end in ranges:
+                            target[start:end] = source[start:end]
+                return True
+            self.torn += 1
+        return False
 
     def __buffer_copy(self) -> None:
         """Copy buffer access, helps avoid data desync"""
         # Copy if data version changed
-        if self.data.mVersionUpdateEnd != self._version.mVersionUpdateEnd == self._version.mVersionUpdateBegin:
-            self._buffer[:] = self._mmap_buffer
+        if self.data.mVersionUpdateEnd == self._version.mVersionUpdateEnd:
+            return
+        start = perf_counter()
+        ranges = self._sparse
+        if ranges is not None:
+            # Full copy on schedule, or if vehicles changed
+            mmap_buffer = self._mmap_buffer
+            buffer = self._buffer
+            now = monotonic()
+            if now >= self._next_full or any(
+                    mmap_buffer[key_start:key_end] != buffer[key_start:key_end]
+                    for key_start, key_end in self._sparse_keys):
+                ranges = None
+                self._next_full = now + self._full_interval
+        if self.__read_consistent(ranges):
+            self.reads += 1
+        else:
+            self.failed += 1
+        self.copy_time += perf_counter() - start
 
 
 def test_api():
@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+
+import frame_ring
+from frame_ring import FrameRing
+
+
+def frame(seq):
+    return b"frame %d" % seq
+
+
+class TestFrameRing(unittest.TestCase):
+    def ring(self, **kwargs):
+        """Owner ring & ring attached by name (as in another process)"""
+        owner = FrameRing(**kwargs)
+        self.addCleanup(owner.close)
+        attached = FrameRing(name=owner.name)
+        self.addCleanup(attached.close)
+        return owner, attached
+
+    def write(self, ring, first, last):
+        for seq in range(first, last + 1):
+            self.assertTrue(ring.write(frame(seq)))
+
+    def test_read_next_in_order(self):
+        owner, attached = self.ring(slots=4, slot_size=32)
+        self.assertEqual((attached.slots, attached.slot_size), (4, 32))
+        reader = attached.reader()
+        self.write(owner, 1, 3)
+        self.assertEqual([reader.read_next() for _ in range(4)], [frame(1), frame(2), frame(3), None])
+        self.write(owner, 4, 9)  # wraps around, frames 4 to 6 lost (one slot margin for writer)
+        self.assertEqual([reader.read_next() for _ in range(4)], [frame(7), frame(8), frame(9), None])
+        self.assertEqual((reader.received, reader.lost, reader.skipped), (6, 3, 0))
+
+    def test_read_latest_skips_frames(self):
+        owner, attached = self.ring(slots=4, slot_size=32)
+        reader = attached.reader()
+        self.write(owner, 1, 5)
+        self.assertEqual(reader.read_latest(), frame(5))
+        self.assertIsNone(reader.read_latest())
+        self.write(owner, 6, 7)
+        self.assertEqual(reader.wait(0.1, latest=True), frame(7))
+        self.assertEqual((reader.received, reader.skipped, reader.lost), (2, 5, 0))
+
+    def test_oversize_rejected(self):
+        owner, attached = self.ring(slots=4, slot_size=8)
+        reader = attached.reader()
+        self.assertFalse(owner.write(b"x" * 9))
+        self.assertTrue(owner.write(b"x" * 8))
+        self.assertEqual((owner.written, owner.oversize, owner.head()), (1, 1, 1))
+        self.assertEqual(reader.read_next(), b"x" * 8)
+
+    def test_slot_overwritten_during_read(self):
+        owner, attached = self.ring(slots=4, slot_size=32)
+        reader = attached.reader()
+        self.write(owner, 1, 1)
+        copies = []
+
+        def copy(data):
+            if not copies:  # writer wraps around to the slot being copied
+                self.write(owner, 2, 5)
+            copies.append(data)
+            return bytes(data)
+
+        with mock.patch.object(frame_ring, "bytes", copy, create=True):
+            received = reader.read_next()
+        self.assertEqual(received, frame(3))  # frame 1 discarded, frame 2 overwritten
+        self.assertEqual((reader.received, reader.lost), (1, 2))
+
+    def test_owner_close_unlinks(self):
+        owner = FrameRing(slots=2, slot_size=8)
+        name = owner.name
+        attached = FrameRing(name=name)
+        attached.close()
+        attached.close()
+        FrameRing(name=name).close()  # still attachable after reader close
+        owner.close()
+        with self.assertRaises(FileNotFoundError):
+            FrameRing(name=name)
+
+
+if __name__ == "__main__":
+    unittest.main()
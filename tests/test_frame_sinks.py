@@ -0,0 +1,62 @@
+import json
+import threading
+import unittest
+
+from frame_sinks import FramePublisher, SocketSink, serialize
+
+try:
+    from adapter.socket_connector import PacketJSON, RawJSON
+except ImportError:  # python-socketio not installed
+    PacketJSON = RawJSON = None
+
+
+class RecordingConnector:
+    """SocketConnector stand-in, records send_data calls"""
+
+    is_connected = True
+
+    def __init__(self, sends_json):
+        self.sends_json = sends_json
+        self.sent = []
+        self.event = threading.Event()
+
+    def send_data(self, data, raw=None):
+        self.sent.append((data, raw))
+        self.event.set()
+
+
+class TestSocketSink(unittest.TestCase):
+    def publish(self, connector):
+        publisher = FramePublisher()
+        publisher.add(SocketSink(connector))
+        payload = {"telemetry": {"rpm": 7500.5, "gear": 4}, "driverName": "Pilote é"}
+        publisher.publish(payload)
+        self.assertTrue(connector.event.wait(2.0))
+        publisher.stop()
+        return payload, publisher
+
+    def test_json_mode_sends_frame_data(self):
+        connector = RecordingConnector(sends_json=True)
+        payload, publisher = self.publish(connector)
+        self.assertEqual(publisher.serialized, 1)
+        self.assertEqual(connector.sent, [(payload, serialize(payload))])
+
+    def test_delta_mode_sends_payload(self):
+        connector = RecordingConnector(sends_json=False)
+        payload, publisher = self.publish(connector)
+        self.assertEqual(publisher.serialized, 0)
+        self.assertEqual(connector.sent, [(payload, None)])
+
+
+@unittest.skipIf(PacketJSON is None, "python-socketio not installed")
+class TestPacketJSON(unittest.TestCase):
+    def test_raw_json_embedded(self):
+        payload = {"a": [1, 2.5, "é"], "b": None}
+        raw = RawJSON(serialize(payload).decode())
+        packet = PacketJSON.dumps(["telemetry_data", raw], separators=(",", ":"))
+        self.assertEqual(packet, json.dumps(["telemetry_data", payload], separators=(",", ":")))
+        self.assertEqual(PacketJSON.loads(packet), ["telemetry_data", payload])
+
+
+if __name__ == "__main__":
+    unittest.main()
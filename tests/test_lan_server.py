@@ -0,0 +1,154 @@
+import json
+import socket
+import struct
+import unittest
+from time import monotonic, sleep
+
+from frame_sinks import FramePublisher
+from lan_server import WS_TEXT, LanServer, ws_accept_key
+
+PAYLOAD = {
+    "teamId": "team",
+    "driverName": "Pilote é",
+    "telemetry": {"rpm": 7500},
+    "scoring": {"vehicles": [{"id": 1, "position": 1}, {"id": 2, "position": 2}]},
+    "rules": {},
+}
+WS_KEY = "dGhlIHNhbXBsZSBub25jZQ=="  # RFC 6455 example key
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = monotonic() + timeout
+    while not predicate():
+        if monotonic() > deadline:
+            return False
+        sleep(0.01)
+    return True
+
+
+def recv_exact(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return data
+
+
+def ws_recv(sock):
+    """Read server websocket frame, return opcode & data"""
+    head = recv_exact(sock, 2)
+    size = head[1] & 0x7F
+    if size == 126:
+        size = struct.unpack("!H", recv_exact(sock, 2))[0]
+    elif size == 127:
+        size = struct.unpack("!Q", recv_exact(sock, 8))[0]
+    return head[0] & 0x0F, recv_exact(sock, size)
+
+
+def read_lines(sock, timeout):
+    """JSON lines received until timeout or connection closed"""
+    sock.settimeout(timeout)
+    data = b""
+    try:
+        while chunk := sock.recv(65536):
+            data += chunk
+    except socket.timeout:
+        pass
+    return [json.loads(line) for line in data.splitlines()]
+
+
+class TestLanServer(unittest.TestCase):
+    def server(self, **kwargs):
+        publisher = FramePublisher()
+        self.addCleanup(publisher.stop)
+        server = LanServer(host="127.0.0.1", port=0, **kwargs)
+        publisher.add(server)
+        return publisher, server
+
+    def connect(self, server):
+        sock = socket.create_connection(("127.0.0.1", server.port), timeout=2.0)
+        self.addCleanup(sock.close)
+        return sock
+
+    def connect_tcp(self, server, subscribe):
+        sock = self.connect(server)
+        sock.sendall(json.dumps(subscribe).encode() + b"\n")
+        return sock
+
+    def wait_clients(self, server, count):
+        self.assertTrue(wait_until(lambda: len(server.stats()["clients"]) == count))
+
+    def test_websocket_topics(self):
+        publisher, server = self.server()
+        sock = self.connect(server)
+        sock.sendall((
+            "GET /?topics=standings,unknown&rate=50 HTTP/1.1\r\n"
+            "Host: localhost\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {WS_KEY}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n").encode())
+        response = b""
+        while not response.endswith(b"\r\n\r\n"):
+            response += recv_exact(sock, 1)
+        self.assertTrue(response.startswith(b"HTTP/1.1 101 "))
+        self.assertIn(b"Sec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=\r\n", response)
+        self.assertEqual(ws_accept_key(WS_KEY.encode()), "s3pPLMBiTxaQ9kYGzzhZRbK+xOo=")
+        self.wait_clients(server, 1)
+        self.assertEqual(server.stats()["clients"][0]["topics"], ["standings"])
+        publisher.publish(PAYLOAD)
+        opcode, data = ws_recv(sock)
+        self.assertEqual(opcode, WS_TEXT)
+        message = json.loads(data)
+        self.assertEqual((message["topic"], message["seq"]), ("standings", 1))
+        self.assertEqual(message["data"], {"scoring": PAYLOAD["scoring"]})
+
+    def test_tcp_subscribe(self):
+        publisher, server = self.server()
+        sock = self.connect_tcp(server, {"topics": ["standings"], "rate": 50})
+        self.wait_clients(server, 1)
+        publisher.publish(PAYLOAD)
+        messages = read_lines(sock, 0.3)
+        self.assertEqual([message["topic"] for message in messages], ["standings"])
+        self.assertEqual(messages[0]["data"], {"scoring": PAYLOAD["scoring"]})
+
+    def test_rate_cap(self):
+        publisher, server = self.server()
+        slow = self.connect_tcp(server, {"topics": ["telemetry"], "rate": 5})
+        fast = self.connect_tcp(server, {"topics": ["telemetry"], "rate": 50})
+        self.wait_clients(server, 2)
+        start = monotonic()
+        while monotonic() - start < 0.5:  # ~100 frames per second
+            publisher.publish(PAYLOAD)
+            sleep(0.01)
+        slow_count = len(read_lines(slow, 0.2))
+        fast_count = len(read_lines(fast, 0.2))
+        self.assertGreaterEqual(slow_count, 2)
+        self.assertLessEqual(slow_count, 4)  # 0.5s at 5/s, plus first message
+        self.assertGreater(fast_count, 2 * slow_count)
+
+    def test_max_clients_refused(self):
+        publisher, server = self.server(max_clients=1)
+        self.connect_tcp(server, {"topics": ["standings"]})
+        self.wait_clients(server, 1)
+        refused = self.connect(server)
+        self.assertEqual(refused.recv(1), b"")  # closed by server
+        self.assertEqual(server.stats()["refused"], 1)
+        self.assertEqual(len(server.stats()["clients"]), 1)
+
+    def test_stop_closes_clients(self):
+        publisher, server = self.server()
+        clients = [self.connect_tcp(server, {"topics": ["standings"]}) for _ in range(2)]
+        self.wait_clients(server, 2)
+        server.stop()
+        self.assertFalse(server.running)
+        for sock in clients:
+            self.assertEqual(sock.recv(1), b"")
+        with self.assertRaises(OSError):
+            self.connect(server)
+
+
+if __name__ == "__main__":
+    unittest.main()
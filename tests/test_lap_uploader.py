@@ -0,0 +1,204 @@
+import gzip
+import json
+import os
+import tempfile
+import threading
+import unittest
+from time import monotonic, sleep
+
+import requests
+
+from lap_uploader import OFFSET_FILE, SPOOL_FILE, LapUploader
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class RecordingSession:
+    """requests.Session stand-in, records requests, answers from status list (default 200)
+
+    Status can be an exception instance (raised). Requests wait on gate if set.
+    """
+
+    def __init__(self, statuses=(), gate=None):
+        self.requests = []
+        self.times = []
+        self.statuses = list(statuses)
+        self.gate = gate
+        self._cond = threading.Condition()
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        with self._cond:
+            self.requests.append((url, headers, data))
+            self.times.append(monotonic())
+            self._cond.notify_all()
+        if self.gate is not None:
+            self.gate.wait(5.0)
+        status = self.statuses.pop(0) if self.statuses else 200
+        if isinstance(status, Exception):
+            raise status
+        return Response(status)
+
+    def wait_for(self, count, timeout=2.0):
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self.requests) >= count, timeout)
+
+    def bodies(self):
+        output = []
+        for url, headers, data in self.requests:
+            if headers.get("Content-Encoding") == "gzip":
+                data = gzip.decompress(data)
+            output.append((url.rsplit("/api/", 1)[1], json.loads(data)))
+        return output
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = monotonic() + timeout
+    while not predicate():
+        if monotonic() > deadline:
+            return False
+        sleep(0.01)
+    return True
+
+
+def lap_lines(count):
+    return b"".join(b'/api/telemetry/lap\t{"lap":%d}\n' % lap for lap in range(1, count + 1))
+
+
+class TestLapUploader(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.spool_dir = temp_dir.name
+
+    def uploader(self, session, **kwargs):
+        uploader = LapUploader("http://server", spool_dir=self.spool_dir, session=session, **kwargs)
+        self.addCleanup(uploader.stop)
+        return uploader
+
+    def write_spool(self, data):
+        with open(os.path.join(self.spool_dir, SPOOL_FILE), "wb") as file:
+            file.write(data)
+
+    def test_spool_sent_on_start(self):
+        self.write_spool(b'/api/sessions/start\t{"sessionId":"s1"}\n' + lap_lines(1))
+        session = RecordingSession()
+        uploader = self.uploader(session)
+        uploader.start()
+        self.assertTrue(session.wait_for(2))
+        uploader.stop()
+        self.assertEqual(session.bodies(), [("sessions/start", {"sessionId": "s1"}), ("telemetry/lap", {"lap": 1})])
+        self.assertEqual(uploader.spool_pending_bytes(), 0)
+        self.assertEqual((uploader.uploaded, uploader.events), (1, 1))
+
+    def test_stop_between_spool_chunks(self):
+        self.write_spool(lap_lines(5))
+        gate = threading.Event()
+        session = RecordingSession(gate=gate)
+        uploader = self.uploader(session)
+        uploader.start()
+        self.assertTrue(session.wait_for(1))
+        uploader.stop(timeout=0.1)  # worker blocked in request
+        self.assertTrue(uploader.running)
+        uploader.start()  # refused while previous worker is alive
+        workers = [thread for thread in threading.enumerate() if thread.name == "lap_uploader"]
+        self.assertEqual(len(workers), 1)
+        gate.set()
+        uploader.stop()
+        self.assertFalse(uploader.running)
+        self.assertEqual(len(session.requests), 1)  # stopped after first chunk
+        uploader.start()
+        self.assertTrue(session.wait_for(5))
+        uploader.stop()
+        self.assertEqual([body["lap"] for _, body in session.bodies()], [1, 2, 3, 4, 5])
+        self.assertEqual(uploader.spool_pending_bytes(), 0)
+
+    def test_event_order_kept_while_offline(self):
+        session = RecordingSession([requests.ConnectionError("offline")])
+        uploader = self.uploader(session, backoff_min=0.2)
+        uploader.submit({"lap": 1})
+        self.assertTrue(wait_until(uploader.spool_pending_bytes))
+        uploader.submit_event("/api/sessions/start", {"sessionId": "s2"})
+        uploader.submit({"lap": 2})
+        self.assertTrue(session.wait_for(4))
+        uploader.stop()
+        self.assertEqual(session.bodies()[1:], [
+            ("telemetry/lap", {"lap": 1}), ("sessions/start", {"sessionId": "s2"}), ("telemetry/lap", {"lap": 2})])
+        self.assertEqual(uploader.spool_pending_bytes(), 0)
+
+    def test_backoff_on_server_error(self):
+        session = RecordingSession([503, requests.ConnectionError("offline")])
+        uploader = self.uploader(session, backoff_min=0.05)
+        uploader.submit({"lap": 1})
+        self.assertTrue(session.wait_for(3))
+        uploader.stop()
+        self.assertEqual([body for _, body in session.bodies()], [{"lap": 1}] * 3)
+        self.assertGreaterEqual(session.times[1] - session.times[0], 0.045)
+        self.assertGreaterEqual(session.times[2] - session.times[1], 0.095)  # doubled
+        self.assertEqual((uploader.errors, uploader.spooled, uploader.uploaded), (2, 1, 1))
+        self.assertEqual(uploader.spool_pending_bytes(), 0)
+
+    def test_client_error_rejected(self):
+        session = RecordingSession([400])
+        uploader = self.uploader(session)
+        uploader.submit({"lap": 1})
+        uploader.submit({"lap": 2})
+        self.assertTrue(session.wait_for(2))
+        uploader.stop()
+        self.assertEqual([body for _, body in session.bodies()], [{"lap": 1}, {"lap": 2}])
+        self.assertEqual((uploader.rejected, uploader.uploaded, uploader.errors, uploader.spooled), (1, 1, 0, 0))
+
+    def test_consecutive_laps_batched(self):
+        gate = threading.Event()
+        session = RecordingSession(gate=gate)
+        uploader = self.uploader(session, max_batch=3)
+        uploader.submit_event("/api/sessions/start", {"sessionId": "s1"})
+        self.assertTrue(session.wait_for(1))  # worker blocked, next items taken together
+        for lap in range(1, 5):
+            uploader.submit({"lap": lap})
+        uploader.submit_event("/api/sessions/end", {"sessionId": "s1"})
+        uploader.submit({"lap": 5})
+        gate.set()
+        self.assertTrue(session.wait_for(5))
+        uploader.stop()
+        self.assertEqual(session.bodies(), [
+            ("sessions/start", {"sessionId": "s1"}),
+            ("telemetry/lap", [{"lap": 1}, {"lap": 2}, {"lap": 3}]),
+            ("telemetry/lap", {"lap": 4}),
+            ("sessions/end", {"sessionId": "s1"}),
+            ("telemetry/lap", {"lap": 5}),
+        ])
+        self.assertEqual(uploader.uploaded, 5)
+
+    def test_gzip_body(self):
+        session = RecordingSession()
+        uploader = self.uploader(session, compress=True)
+        payload = {"lap": 1, "driver": "Pilote é", "samples": [[0.5, 7500]] * 100}
+        uploader.submit(payload)
+        self.assertTrue(session.wait_for(1))
+        uploader.stop()
+        url, headers, data = session.requests[0]
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(data)), payload)
+        self.assertEqual(uploader.uploaded_bytes, len(data))
+
+    def test_offset_saved_after_chunk_sent(self):
+        self.write_spool(lap_lines(4))
+        session = RecordingSession([200, 503])
+        uploader = self.uploader(session, max_batch=2, backoff_min=60.0)
+        uploader.start()
+        self.assertTrue(session.wait_for(2))
+        uploader.stop()
+        with open(os.path.join(self.spool_dir, OFFSET_FILE), "r", encoding="utf-8") as file:
+            self.assertEqual(int(file.read()), len(lap_lines(2)))  # failed chunk kept
+        uploader.start()
+        self.assertTrue(session.wait_for(3))
+        uploader.stop()
+        self.assertEqual([[body["lap"] for body in bodies] for _, bodies in session.bodies()], [[1, 2], [3, 4], [3, 4]])
+        self.assertEqual(uploader.spool_pending_bytes(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+
+import log_sink
+from log_sink import LogSink
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLogSink(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch.object(log_sink, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_messages_without_key_not_suppressed(self):
+        sink = LogSink(repeat_interval=5.0)
+        for message in ("⏹️ Bridge arrêté.", "🚀 En attente du jeu...") * 2:
+            self.assertTrue(sink.push(message))
+        self.assertEqual(len(sink.drain()), 4)
+        self.assertEqual(sink.suppressed, 0)
+
+    def test_repeats_reported_on_next_message(self):
+        sink = LogSink(repeat_interval=5.0)
+        self.assertTrue(sink.push("error 1", "error"))
+        self.assertFalse(sink.push("error 2", "error"))
+        self.assertFalse(sink.push("error 3", "error"))
+        self.assertEqual(sink.drain(), ["error 1"])
+        self.clock.now += 1.0
+        self.assertEqual(sink.drain(), [])
+        self.clock.now += 4.0
+        self.assertTrue(sink.push("error 4", "error"))
+        self.assertEqual(sink.drain(), ["error 4 (+2 similar)"])
+
+    def test_repeats_reported_on_drain(self):
+        sink = LogSink(repeat_interval=5.0)
+        sink.push("error 1", "error")
+        sink.push("error 2", "error")
+        sink.push("error 3", "error")
+        sink.push("other 1", "other")
+        self.assertEqual(sink.drain(), ["error 1", "other 1"])
+        self.clock.now += 5.0
+        self.assertEqual(sink.drain(), ["error 3 (+1 similar)"])
+        self.assertEqual(sink.drain(), [])
+        # Window restarts after expiry
+        self.assertTrue(sink.push("error 4", "error"))
+        self.assertEqual(sink.drain(), ["error 4"])
+
+    def test_dropped_lines(self):
+        sink = LogSink(max_lines=2)
+        for index in range(5):
+            sink.push(f"line {index}")
+        self.assertEqual(sink.drain(), ["... 3 lines skipped", "line 3", "line 4"])
+        self.assertEqual(sink.stats()["dropped"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import json
+import random
+import unittest
+
+from adapter.payload_delta import DeltaDecoder, DeltaEncoder
+from adapter.telemetry_codec import TelemetryEncoder
+
+try:
+    from adapter.socket_connector import SocketConnector
+except ImportError:  # python-socketio not installed
+    SocketConnector = None
+
+
+def make_payload(vehicles=3, rpm=7500.5):
+    return {
+        "teamId": "team", "driverName": "Driver 0",
+        "telemetry": {"gear": 4, "rpm": rpm, "temps": {"oil": 105.5, "water": 90.25},
+                      "tires": {"press": [170.5, 171.5, 172.5, 173.5]}},
+        "scoring": {"track": "Le Mans", "vehicles": [
+            {"id": index, "driver": f"Driver {index}", "position": index + 1, "lap_dist": 100.5 * index}
+            for index in range(vehicles)]},
+    }
+
+
+def transport(message):
+    """Messages are sent as JSON, decoder never shares objects with encoder"""
+    return json.loads(json.dumps(message))
+
+
+class TestPayloadDelta(unittest.TestCase):
+    def test_round_trip(self):
+        rng = random.Random(1)
+        encoder = DeltaEncoder(keyframe_interval=20)
+        decoder = DeltaDecoder()
+        for step in range(100):
+            payload = make_payload(vehicles=rng.randint(2, 5), rpm=rng.random() * 9000)
+            payload["telemetry"]["gear"] = rng.randint(-1, 7)
+            payload["scoring"]["vehicles"][0]["position"] = rng.randint(1, 10)
+            message = encoder.encode(payload)
+            self.assertTrue(decoder.apply(transport(message)), step)
+            self.assertEqual(decoder.state, transport(payload), step)
+        self.assertEqual(encoder.keyframes, 5)
+        self.assertEqual(encoder.deltas, 95)
+
+    def test_unchanged_payload_is_empty_delta(self):
+        encoder = DeltaEncoder()
+        encoder.encode(make_payload())
+        message = encoder.encode(make_payload())
+        self.assertEqual(message["type"], "delta")
+        self.assertEqual(message["set"], [])
+        self.assertEqual(message["del"], [])
+
+    def test_key_removal(self):
+        encoder = DeltaEncoder()
+        decoder = DeltaDecoder()
+        decoder.apply(transport(encoder.encode(make_payload())))
+        payload = make_payload()
+        del payload["telemetry"]["temps"]["water"]
+        del payload["driverName"]
+        message = encoder.encode(payload)
+        self.assertCountEqual(message["del"], [["telemetry", "temps", "water"], ["driverName"]])
+        self.assertTrue(decoder.apply(transport(message)))
+        self.assertEqual(decoder.state, transport(payload))
+
+    def test_sequence_gap(self):
+        encoder = DeltaEncoder()
+        decoder = DeltaDecoder()
+        decoder.apply(transport(encoder.encode(make_payload(rpm=1.0))))
+        encoder.encode(make_payload(rpm=2.0))  # lost
+        message = encoder.encode(make_payload(rpm=3.0))
+        self.assertFalse(decoder.apply(transport(message)))
+        self.assertEqual(decoder.state["telemetry"]["rpm"], 1.0)
+        self.assertEqual(decoder.seq, 1)
+
+    def test_delta_before_keyframe(self):
+        encoder = DeltaEncoder()
+        encoder.encode(make_payload())
+        self.assertFalse(DeltaDecoder().apply(transport(encoder.encode(make_payload(rpm=1.0)))))
+
+    def test_request_keyframe(self):
+        encoder = DeltaEncoder()
+        encoder.encode(make_payload())
+        self.assertEqual(encoder.encode(make_payload())["type"], "delta")
+        encoder.request_keyframe()
+        self.assertEqual(encoder.encode(make_payload())["type"], "key")
+        self.assertEqual(encoder.encode(make_payload())["type"], "delta")
+
+
+class FailingClient:
+    """socketio.Client stand-in, emit fails once"""
+
+    connected = True
+
+    def __init__(self):
+        self.emitted = []
+        self.fail = False
+
+    def emit(self, event, data):
+        if self.fail:
+            self.fail = False
+            raise ConnectionError("emit failed")
+        self.emitted.append((event, data))
+
+
+@unittest.skipIf(SocketConnector is None, "python-socketio not installed")
+class TestConnectorDelta(unittest.TestCase):
+    def test_keyframe_after_send_error(self):
+        connector = SocketConnector.__new__(SocketConnector)
+        connector.sio = client = FailingClient()
+        connector.delta_mode = True
+        connector.binary_mode = False
+        connector.encoder = DeltaEncoder()
+        connector.codec = TelemetryEncoder()
+        connector.send_data(make_payload(rpm=1.0))
+        connector.send_data(make_payload(rpm=2.0))
+        client.fail = True
+        connector.send_data(make_payload(rpm=3.0))
+        connector.send_data(make_payload(rpm=4.0))
+        types = [data["type"] for _, data in client.emitted]
+        self.assertEqual(types, ["key", "delta", "key"])
+        self.assertEqual(client.emitted[-1][0], "telemetry_delta")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import ctypes
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from adapter import rf2_replay
+from adapter.rf2_replay import ReplayBuffer, ReplayPlayer, ReplayReader, ReplayRecorder, VERSION_BLOCK
+
+
+class SyntheticBuffer(ctypes.Structure):
+    _pack_ = 4
+    _fields_ = [
+        ("mVersionUpdateBegin", ctypes.c_uint),
+        ("mVersionUpdateEnd", ctypes.c_uint),
+        ("mValues", ctypes.c_double * 64),
+    ]
+
+
+BUFFERS = (
+    ReplayBuffer("$synthetic_a$", SyntheticBuffer),
+    ReplayBuffer("$synthetic_b$", SyntheticBuffer),
+)
+
+
+def make_data(version, value, version_end=None):
+    data = SyntheticBuffer()
+    data.mVersionUpdateBegin = version
+    data.mVersionUpdateEnd = version if version_end is None else version_end
+    for index in range(64):
+        data.mValues[index] = value * index
+    return bytes(data)
+
+
+class SyntheticMMap(bytearray):
+    """mmap stand-in, tears: number of copies during which a game write starts"""
+
+    tears = 0
+
+    def __getitem__(self, key):
+        data = super().__getitem__(key)
+        if self.tears and key == slice(None):
+            self.tears -= 1
+            version = VERSION_BLOCK.unpack_from(self, 0)[0] + 1  # game write while copying
+            VERSION_BLOCK.pack_into(self, 0, version, version)
+        return data
+
+    def close(self):
+        pass
+
+
+class SyntheticMMaps:
+    """platform_mmap stand-in, buffers by name"""
+
+    def __init__(self):
+        self.buffers = {}
+
+    def __call__(self, name, size, pid=""):
+        return self.buffers.setdefault(name, SyntheticMMap(size))
+
+    def write(self, buffer_id, data):
+        self.buffers[BUFFERS[buffer_id].name][:] = data
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.filename = os.path.join(temp_dir.name, "session.lmur")
+        self.mmaps = SyntheticMMaps()
+        patcher = mock.patch.object(rf2_replay, "platform_mmap", self.mmaps)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record(self, steps, keyframe_interval):
+        recorder = ReplayRecorder(self.filename, buffers=BUFFERS, keyframe_interval=keyframe_interval)
+        recorder.open()
+        for step in steps:
+            for buffer_id, data in enumerate(step):
+                self.mmaps.write(buffer_id, data)
+            recorder.capture()
+        recorder.close()
+        return recorder
+
+    def test_round_trip(self):
+        steps = [(make_data(version, version * 0.5), make_data(version // 2, version * 1.5))
+                 for version in range(1, 21)]
+        recorder = self.record(steps, keyframe_interval=1e9)
+        self.assertEqual(recorder.frames, 31)  # buffer b changes every other step
+        self.assertEqual(recorder.skipped, 9)
+        expected = []
+        last_version = [None, None]
+        for step in steps:
+            for buffer_id, data in enumerate(step):
+                version = VERSION_BLOCK.unpack_from(data, 0)[1]
+                if version != last_version[buffer_id]:
+                    last_version[buffer_id] = version
+                    expected.append((buffer_id, data))
+        reader = ReplayReader(self.filename)
+        self.assertEqual(reader.buffers, [(buf.name, ctypes.sizeof(SyntheticBuffer)) for buf in BUFFERS])
+        self.assertEqual(len(reader.index), 1)
+        frames = []
+        while (frame := reader.read_frame()) is not None:
+            frames.append(frame[1:])
+        reader.close()
+        self.assertEqual(frames, expected)
+
+        self.mmaps.buffers.clear()
+        player = ReplayPlayer(self.filename, speed=0)
+        player.open()
+        player.play()
+        self.assertEqual(player.frames, 31)
+        for buffer_id, data in enumerate(steps[-1]):
+            self.assertEqual(self.mmaps.buffers[BUFFERS[buffer_id].name], data)
+        player.close()
+
+    def test_torn_keyframe_moved_to_next_capture(self):
+        steps = [
+            (make_data(1, 1.0), make_data(1, 1.0)),
+            (make_data(2, 2.0), make_data(3, 2.0, version_end=2)),  # buffer b mid-write
+            (make_data(3, 3.0), make_data(3, 3.0)),
+        ]
+        recorder = self.record(steps, keyframe_interval=0.0)
+        self.assertEqual(recorder.skipped, 1)
+        reader = ReplayReader(self.filename)
+        self.assertEqual(len(reader.index), 2)
+        reader.seek(reader.duration)
+        frames = [reader.read_frame(), reader.read_frame()]
+        self.assertIsNone(reader.read_frame())
+        self.assertEqual([frame[1:] for frame in frames], [(0, steps[2][0]), (1, steps[2][1])])
+        reader.seek(0.0)
+        while (frame := reader.read_frame()) is not None:
+            version_begin, version_end = VERSION_BLOCK.unpack_from(frame[2], 0)
+            self.assertEqual(version_begin, version_end)
+        reader.close()
+
+    def test_write_started_during_copy(self):
+        recorder = ReplayRecorder(self.filename, buffers=BUFFERS, keyframe_interval=0.0)
+        recorder.open()
+        for buffer_id in range(2):
+            self.mmaps.write(buffer_id, make_data(1, 1.0))
+        recorder.capture()
+        self.mmaps.write(0, make_data(2, 2.0))
+        self.mmaps.write(1, make_data(2, 2.0))
+        self.mmaps.buffers[BUFFERS[1].name].tears = rf2_replay.MAX_READ_RETRY  # header copied consistent
+        self.assertEqual(recorder.capture(), 1)
+        self.assertEqual(recorder.skipped, 1)
+        self.mmaps.write(1, make_data(3, 3.0))
+        self.mmaps.buffers[BUFFERS[1].name].tears = 1  # retried
+        self.assertEqual(recorder.capture(), 2)
+        self.assertEqual(recorder.skipped, 1)
+        recorder.close()
+        reader = ReplayReader(self.filename)
+        self.assertEqual(len(reader.index), 2)  # group moved from torn capture
+        reader.seek(reader.duration)
+        self.assertEqual([reader.read_frame()[1:] for _ in range(2)], [(0, make_data(2, 2.0)), (1, make_data(4, 3.0))])
+        reader.close()
+
+    def test_xor_without_numpy(self):
+        data = make_data(1, 1.0)
+        base = make_data(2, 3.0)
+        delta = rf2_replay.xor_bytes(data, base)
+        with mock.patch.object(rf2_replay, "np", None):
+            self.assertEqual(rf2_replay.xor_bytes(data, base), delta)
+            self.assertEqual(rf2_replay.xor_bytes(delta, base), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
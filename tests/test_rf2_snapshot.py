@@ -0,0 +1,48 @@
+import unittest
+from unittest import mock
+
+from adapter import rf2_snapshot
+from adapter.rf2_data import ScoringData
+from adapter.rf2_snapshot import SNAPSHOT_MIN_VEHICLES, VehicleSnapshot
+from benchmark.synthetic import synthetic_info
+
+
+def make_scoring(num_vehicles):
+    info = synthetic_info(num_vehicles)
+    vehicles = info.rf2Scor.mVehicles
+    # Values sanitized by both paths
+    vehicles[0].mLapDist = float("nan")
+    vehicles[0].mTimeBehindNext = float("inf")
+    vehicles[0].mSector = 5
+    vehicles[0].mDriverName = "Pilote é".encode("utf-8")
+    vehicles[num_vehicles - 1].mVehicleName = b"X" * 64  # no null terminator
+    vehicles[num_vehicles - 1].mPos.x = float("-inf")
+    vehicles[num_vehicles - 1].mUnderYellow = 1
+    return ScoringData(info)
+
+
+def per_vehicle(scoring):
+    return [scoring.get_vehicle_scoring(index) for index in range(scoring.vehicle_count())]
+
+
+class TestVehicleSnapshot(unittest.TestCase):
+    def test_to_dicts_numpy(self):
+        if rf2_snapshot.np is None:
+            self.skipTest("numpy not installed")
+        scoring = make_scoring(30)
+        self.assertEqual(VehicleSnapshot().update(scoring.shmm.rf2Scor).to_dicts(), per_vehicle(scoring))
+
+    def test_to_dicts_python(self):
+        scoring = make_scoring(30)
+        with mock.patch.object(rf2_snapshot, "np", None):
+            snapshot = VehicleSnapshot()
+            self.assertEqual(snapshot.update(scoring.shmm.rf2Scor).to_dicts(), per_vehicle(scoring))
+
+    def test_vehicles_scoring(self):
+        for num_vehicles in (1, SNAPSHOT_MIN_VEHICLES - 1, min(SNAPSHOT_MIN_VEHICLES, 100), 100):
+            scoring = make_scoring(num_vehicles)
+            self.assertEqual(scoring.vehicles_scoring(), per_vehicle(scoring), num_vehicles)
+
+
+if __name__ == "__main__":
+    unittest.main()
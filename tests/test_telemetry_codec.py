@@ -0,0 +1,118 @@
+import unittest
+
+from adapter.telemetry_codec import (
+    SCHEMA_VERSION, VEHICLE_RECORD, TelemetryDecoder, TelemetryEncoder
+)
+
+
+def make_vehicle(index):
+    return {
+        "id": index, "driver": f"Driver {index}", "vehicle": "Porsche 963", "class": "Hypercar",
+        "position": index + 1, "is_player": int(index == 0), "laps": 12, "sector": 2, "status": 0,
+        "pit_state": 0, "in_pits": 0, "pit_group": f"Team {index}", "pit_stops": 1, "penalties": 0,
+        "lap_dist": 1234.5, "best_lap": 210.25, "last_lap": 211.5, "sectors_best": (70.5, 140.25),
+        "sectors_cur": (71.0, 0.0), "gap_leader": 1.5 * index, "gap_next": 1.5, "flag": 0,
+        "under_yellow": False, "x": -100.5, "z": 250.25, "stint_laps": 5,
+    }
+
+
+def make_payload(vehicles=3):
+    return {
+        "teamId": "team", "driverName": "Driver 0", "sessionTimeRemainingSeconds": 3600.0,
+        "weatherForecast": [{"rain": 0.1, "cloud": 0.5, "temp": 21.0}],
+        "telemetry": {
+            "gear": 4, "rpm": 7500.5, "speed": 250.25, "maxRpm": 9000.0, "fuel": 55.5, "fuelCapacity": 90.0,
+            "inputs": {"thr": 1.0, "brk": 0.0, "clt": 0.0, "str": -0.25},
+            "temps": {"oil": 105.5, "water": 90.25},
+            "tires": {
+                "temp": {"fl": [80.5, 81.5, 82.5], "fr": [80.0, 81.0, 82.0],
+                         "rl": [85.5, 86.5, 87.5], "rr": [85.0, 86.0, 87.0]},
+                "press": [170.5, 171.5, 172.5, 173.5], "wear": [0.5, 0.5, 0.75, 0.75],
+                "brake_wear": [0.25, 0.25, 0.5, 0.5], "type": [0, 0, 1, 2], "brake_temp": [400.5, 401.5, 350.5, 351.5],
+                "compounds": {"fl": "Medium", "fr": "Medium", "rl": "Hard", "rr": "Hard"},
+            },
+            "electric": {"charge": 0.5, "torque": 10.5, "rpm": 3000.0, "temp_motor": 60.5, "temp_water": 40.5,
+                         "state": 2},
+            "virtual_energy": 75.5, "max_virtual_energy": 100.0, "leaderLaps": 12, "leaderAvgLapTime": 212.5,
+            "position": 1, "lastLap": 0,
+        },
+        "scoring": {"track": "Le Mans", "vehicles": [make_vehicle(i) for i in range(vehicles)], "length": 13626.0},
+    }
+
+
+def normalize(value):
+    """Tuples are decoded as lists"""
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    return value
+
+
+class TestTelemetryCodec(unittest.TestCase):
+    def test_round_trip(self):
+        payload = make_payload()
+        decoded = TelemetryDecoder().decode(TelemetryEncoder().encode(payload))
+        self.assertEqual(normalize(decoded), normalize(payload))
+
+    def test_strings_sent_once_per_session(self):
+        encoder = TelemetryEncoder()
+        decoder = TelemetryDecoder()
+        first = encoder.encode(make_payload())
+        second = encoder.encode(make_payload())
+        self.assertLess(len(second), len(first))
+        decoder.decode(first)
+        self.assertEqual(normalize(decoder.decode(second)), normalize(make_payload()))
+
+    def test_reset_string_table(self):
+        encoder = TelemetryEncoder()
+        encoder.encode(make_payload())
+        encoder.reset()
+        # New decoder (server resync) must decode packet after reset
+        decoded = TelemetryDecoder().decode(encoder.encode(make_payload()))
+        self.assertEqual(decoded["scoring"]["vehicles"][1]["driver"], "Driver 1")
+
+    def test_float32_precision(self):
+        payload = make_payload(1)
+        payload["telemetry"]["rpm"] = 7500.123
+        decoded = TelemetryDecoder().decode(TelemetryEncoder().encode(payload))
+        self.assertAlmostEqual(decoded["telemetry"]["rpm"], 7500.123, places=2)
+
+    def test_unsupported_version(self):
+        packet = bytearray(TelemetryEncoder().encode(make_payload(1)))
+        packet[4] = SCHEMA_VERSION + 1
+        with self.assertRaises(ValueError):
+            TelemetryDecoder().decode(bytes(packet))
+
+    def test_keys_outside_schema(self):
+        payload = make_payload()
+        payload["telemetry"]["turbo"] = 1.5
+        payload["telemetry"]["tires"]["temp_inner"] = {"fl": [70.5, 71.5, 72.5]}
+        payload["telemetry"]["electric"]["mode"] = "boost"
+        payload["scoring"]["vehicles"][1]["classPosition"] = 2
+        decoded = TelemetryDecoder().decode(TelemetryEncoder().encode(payload))
+        self.assertEqual(normalize(decoded), normalize(payload))
+
+    def test_record_fallback(self):
+        # None & float for int fields are packed by the slow path, as zero & truncated int
+        vehicle = make_vehicle(1)
+        fast, _ = VEHICLE_RECORD.pack(vehicle, lambda text: 0)
+        vehicle["laps"] = 12.0
+        vehicle["gap_next"] = None
+        slow, extra = VEHICLE_RECORD.pack(vehicle, lambda text: 0)
+        self.assertEqual(extra, {})
+        values = VEHICLE_RECORD.packer.unpack(slow)
+        expected = list(VEHICLE_RECORD.packer.unpack(fast))
+        expected[22] = 0.0  # gap_next (after 2 sector pairs)
+        self.assertEqual(list(values), expected)
+
+    def test_stats(self):
+        encoder = TelemetryEncoder()
+        packet = encoder.encode(make_payload(60))
+        self.assertEqual(encoder.messages, 1)
+        self.assertEqual(encoder.bytes_last, len(packet))
+        self.assertGreater(encoder.encode_time_last, 0)
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)